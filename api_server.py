@@ -0,0 +1,472 @@
+"""JSON HTTP API for Thrivya scores and reports, without Streamlit.
+
+Endpoints (all bodies and responses are JSON):
+
+    GET  /v1/health                 liveness and the question bank digest
+    GET  /v1/questions              id, pillar, category and text of every question
+    POST /v1/score                  {"responses": {"C1": "Agree", "C2": 3, ...}}
+    POST /v1/score/batch            {"items": [{"id": "...", "responses": {...}}, ...]}
+    POST /v1/reports                {"org_info": {...}, "responses": {...}} -> 202 {"report_id", "status"}
+    GET  /v1/reports/<report_id>    {"status": "queued|running|done|failed", "text"?, "error"?}
+
+Scoring uses the same question bank, ``ScoringEngine`` and score
+interpretation as the app; a batch is scored as one N×Q matrix. Unknown
+question IDs and invalid answers are rejected with 422 and listed under
+``rejected``. Report IDs
+are report-cache keys, so identical requests share one generation and reports
+already produced by the app are returned at once.
+
+``--workers`` processes each bind the port with SO_REUSEPORT and the kernel
+spreads connections across them. Processes share state only through SQLite:
+the report cache, the chat API rate limiter and in-flight leases (the same
+files the app uses by default) and a small report job table.
+
+    COHERE_API_KEY=... python api_server.py --port 8080 --workers 4
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from cohere_client import COHERE_CHAT_URL, CohereClient
+from culture_model import get_score_interpretation, pillar_map
+from question_bank import QuestionBankError, QuestionBankSource, SurveyResponses
+from rate_limit import RateLimiter, SingleFlight, coalesced
+from report_cache import ReportCache, report_cache_key
+from report_prompt import DEFAULT_MAX_PROMPT_TOKENS, REPORT_MODEL, REPORT_TEMPERATURE, build_report_prompt
+from sqlite_store import SQLiteStore
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_BATCH_ITEMS = 10000
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class ApiError(ValueError):
+    """Request that the API answers with an error status"""
+
+    def __init__(self, status, message, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+
+class ReportJobStore(SQLiteStore):
+    """Report job status shared by every worker process
+
+    The worker that claimed a job refreshes ``updated_at`` while the job waits
+    and runs, so one left untouched for ``stale_after`` seconds belonged to a
+    worker that has died.
+    """
+
+    def __init__(self, path, stale_after=300.0):
+        super().__init__(path)
+        self.stale_after = stale_after
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS api_report_jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def claim(self, job_id):
+        """Mark a job queued unless a live one exists; True if the caller should start it"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT status, updated_at FROM api_report_jobs WHERE id = ?", (job_id,)).fetchone()
+            if row and row[0] in (QUEUED, RUNNING) and time.time() - row[1] < self.stale_after:
+                return False
+            conn.execute("INSERT OR REPLACE INTO api_report_jobs VALUES (?, ?, NULL, ?)", (job_id, QUEUED, time.time()))
+        return True
+
+    def set(self, job_id, status, error=None):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO api_report_jobs VALUES (?, ?, ?, ?)", (job_id, status, error, time.time()))
+
+    def touch(self, job_ids):
+        """Refresh the heartbeat of jobs still queued or running, so they are not taken for crashed"""
+        if not job_ids:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE api_report_jobs SET updated_at = ? WHERE status IN (?, ?) "
+                f"AND id IN ({', '.join('?' * len(job_ids))})",
+                (time.time(), QUEUED, RUNNING, *job_ids)
+            )
+
+    def get(self, job_id):
+        """(status, error), with jobs of crashed workers reported as failed, or None"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT status, error, updated_at FROM api_report_jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        status, error, updated_at = row
+        if status in (QUEUED, RUNNING) and time.time() - updated_at >= self.stale_after:
+            return FAILED, "generation was interrupted; submit the report again"
+        return status, error
+
+
+class ThrivyaApi:
+    """Request handling shared by the HTTP handler threads of one worker process"""
+
+    def __init__(self, questions_path, cache, jobs, client=None, limiter=None, flights=None,
+                 max_prompt_tokens=DEFAULT_MAX_PROMPT_TOKENS, report_workers=8):
+        self.source = QuestionBankSource(questions_path)
+        self.cache = cache
+        self.jobs = jobs
+        self.client = client
+        self.limiter = limiter
+        self.flights = flights
+        self.max_prompt_tokens = max_prompt_tokens
+        self.breaker = CircuitBreaker()
+        self.executor = ThreadPoolExecutor(max_workers=report_workers, thread_name_prefix="api-report")
+        self._engine = (None, None)
+        # Jobs claimed by this process; kept fresh while they wait in the executor or generate
+        self._active = set()
+        self._active_lock = threading.Lock()
+        threading.Thread(target=self._heartbeat, name="api-report-heartbeat", daemon=True).start()
+
+    def _heartbeat(self):
+        while True:
+            time.sleep(self.jobs.stale_after / 3)
+            with self._active_lock:
+                active = list(self._active)
+            try:
+                self.jobs.touch(active)
+            except sqlite3.Error:
+                pass
+
+    def engine(self, bank):
+        """Scoring engine for the current bank, rebuilt when the bank changes"""
+        digest, engine = self._engine
+        if digest != bank.digest:
+            from scoring import ScoringEngine
+            engine = ScoringEngine(list(bank.questions))
+            self._engine = (bank.digest, engine)
+        return engine
+
+    def bank(self):
+        try:
+            return self.source.current()
+        except QuestionBankError as e:
+            raise ApiError(503, f"question bank unavailable: {e}") from e
+
+    @staticmethod
+    def responses(bank, payload):
+        answers = payload.get("responses") if isinstance(payload, dict) else None
+        if not isinstance(answers, dict):
+            raise ApiError(400, "responses must be an object of question ID to answer label or code 0-4")
+        from bulk_import import encode_answer
+        responses = SurveyResponses(bank)
+        rejected = {}
+        for question_id, answer in answers.items():
+            if question_id not in bank.question_index:
+                rejected[question_id] = "unknown question"
+                continue
+            try:
+                code = encode_answer(answer)
+            except ValueError as e:
+                rejected[question_id] = str(e)
+                continue
+            if code is not None:
+                responses.set(question_id, code)
+        if rejected:
+            raise ApiError(422, f"invalid answers for {', '.join(sorted(rejected))}", rejected=rejected)
+        if not len(responses):
+            raise ApiError(422, "no valid answers")
+        return responses
+
+    @staticmethod
+    def _result(engine, result, row, answered):
+        avg_scores, overall_score, pillar_scores = engine.summarize(result, row)
+        return {
+            "scores": avg_scores,
+            "overall": overall_score,
+            "pillars": pillar_scores,
+            "interpretation": {
+                name: get_score_interpretation(score)[0]
+                for name, score in [("overall", overall_score)] + list(avg_scores.items())
+            },
+            "answered": answered,
+        }
+
+    def score(self, payload):
+        bank = self.bank()
+        engine = self.engine(bank)
+        responses = self.responses(bank, payload)
+        return self._result(engine, engine.score(engine.encode_codes(responses.codes)), 0, len(responses))
+
+    def score_batch(self, payload):
+        import numpy as np
+        items = payload.get("items") if isinstance(payload, dict) else None
+        if not isinstance(items, list) or not items:
+            raise ApiError(400, "items must be a non-empty list")
+        if len(items) > MAX_BATCH_ITEMS:
+            raise ApiError(413, f"at most {MAX_BATCH_ITEMS} items per batch")
+        bank = self.bank()
+        engine = self.engine(bank)
+        rows, results = [], []
+        for position, item in enumerate(items):
+            try:
+                responses = self.responses(bank, item)
+            except ApiError as e:
+                results.append({"id": item.get("id") if isinstance(item, dict) else None, "error": str(e), **e.details})
+                continue
+            results.append({"id": item.get("id"), "answered": len(responses)})
+            rows.append((position, responses.codes))
+        if rows:
+            matrix = np.frombuffer(b"".join(codes.tobytes() for _, codes in rows), dtype=np.int8)
+            scored = engine.score(matrix.reshape(len(rows), engine.n_questions))
+            for row, (position, _) in enumerate(rows):
+                results[position].update(self._result(engine, scored, row, results[position]["answered"]))
+        return {"results": results}
+
+    def questions(self):
+        bank = self.bank()
+        return {
+            "digest": bank.digest,
+            "questions": [
+                {"id": q['id'], "pillar": q['pillar'], "category": pillar_map[q['pillar']], "question": q['question']}
+                for q in bank.questions
+            ],
+        }
+
+    def submit_report(self, payload):
+        if self.client is None:
+            raise ApiError(503, "report generation is not configured (no API key)")
+        bank = self.bank()
+        engine = self.engine(bank)
+        responses = self.responses(bank, payload)
+        org = payload.get("org_info") or {}
+        if not isinstance(org, dict):
+            raise ApiError(400, "org_info must be an object")
+        avg_scores, overall_score, pillar_scores = engine.summarize(engine.score(engine.encode_codes(responses.codes)))
+        answers = [(q['pillar'], q['question'], responses.code(q['id'])) for q in bank.questions if q['id'] in responses]
+        prompt = build_report_prompt(org, avg_scores, overall_score, pillar_scores, answers, self.max_prompt_tokens)
+        report_id = report_cache_key(prompt, REPORT_MODEL, REPORT_TEMPERATURE)
+        if self.cache.get(report_id):
+            return 200, {"report_id": report_id, "status": DONE}
+        if self.jobs.claim(report_id):
+            with self._active_lock:
+                self._active.add(report_id)
+            self.executor.submit(self._generate, report_id, prompt)
+        status, _ = self.jobs.get(report_id) or (QUEUED, None)
+        return 202, {"report_id": report_id, "status": status}
+
+    def _generate(self, report_id, prompt):
+        self.jobs.set(report_id, RUNNING)
+
+        def produce():
+            if not self.breaker.allow():
+                raise CircuitOpenError("the chat API is failing; try again shortly")
+            if self.limiter is not None:
+                self.limiter.acquire(report_id)
+            yield self.breaker.call(self.client.chat, prompt, REPORT_MODEL, REPORT_TEMPERATURE)
+
+        try:
+            for _ in coalesced(self.flights, self.cache, report_id, produce):
+                pass
+        except Exception as e:
+            self.jobs.set(report_id, FAILED, f"{type(e).__name__}: {e}")
+            return
+        finally:
+            with self._active_lock:
+                self._active.discard(report_id)
+        self.jobs.set(report_id, DONE)
+
+    def report(self, report_id):
+        # Status polls for a submitted report; the submission already counted the lookup
+        cached = self.cache.get(report_id, count=False)
+        if cached:
+            return {"report_id": report_id, "status": DONE, "text": cached.text, "created_at": cached.created_at}
+        job = self.jobs.get(report_id)
+        if job is None:
+            raise ApiError(404, "unknown report")
+        status, error = job
+        if status == DONE:
+            status, error = FAILED, "report expired from the cache; submit it again"
+        body = {"report_id": report_id, "status": status}
+        if error:
+            body["error"] = error
+        return body
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; with Nagle on, keep-alive clients wait for delayed ACKs
+    disable_nagle_algorithm = True
+    api = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            # The unread body would be taken for the next request, so drop the connection
+            self.close_connection = True
+            if length < 0:
+                raise ApiError(400, "invalid Content-Length header")
+            raise ApiError(413, "request body too large")
+        return self.rfile.read(length)
+
+    def _body(self):
+        data = self._read_body()
+        try:
+            return json.loads(data or b"{}")
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise ApiError(400, f"invalid JSON body: {e}") from e
+
+    def _not_found(self):
+        # Drain the body so the kept-alive connection stays in sync
+        self._read_body()
+        return 404, {"error": "not found"}
+
+    def _handle(self, route):
+        try:
+            result = route()
+            status, body = result if isinstance(result, tuple) else (200, result)
+        except ApiError as e:
+            status, body = e.status, {"error": str(e), **e.details}
+        except Exception as e:
+            status, body = 500, {"error": f"{type(e).__name__}: {e}"}
+        self._send(status, body)
+
+    def do_GET(self):
+        path = self.path.split("?")[0].rstrip("/")
+        report = re.fullmatch(r"/v1/reports/([0-9a-f]{64})", path)
+        if path == "/v1/health":
+            self._handle(lambda: {"status": "ok", "questions_digest": self.api.bank().digest, "pid": os.getpid()})
+        elif path == "/v1/questions":
+            self._handle(self.api.questions)
+        elif report:
+            self._handle(lambda: self.api.report(report.group(1)))
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        routes = {
+            "/v1/score": self.api.score,
+            "/v1/score/batch": self.api.score_batch,
+            "/v1/reports": self.api.submit_report,
+        }
+        route = routes.get(self.path.split("?")[0].rstrip("/"))
+        if route is None:
+            self._handle(self._not_found)
+            return
+        self._handle(lambda: route(self._body()))
+
+
+class ReusePortHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def server_bind(self):
+        if hasattr(socket, "SO_REUSEPORT"):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+def make_server(host, port, api):
+    """HTTP server (not yet serving) bound with SO_REUSEPORT where available"""
+    handler = type("ConfiguredApiHandler", (ApiHandler,), {"api": api})
+    return ReusePortHTTPServer((host, port), handler)
+
+
+def build_api(args):
+    client = limiter = flights = None
+    if args.api_key:
+        client = CohereClient(args.api_key, args.api_url, max_retries=args.max_retries, pool_size=args.report_workers)
+        if args.requests_per_minute:
+            limiter = RateLimiter(args.rate_limit_path, args.requests_per_minute / 60, args.burst)
+        flights = SingleFlight(args.rate_limit_path, lease_seconds=240)
+    return ThrivyaApi(
+        args.questions,
+        ReportCache(args.cache),
+        ReportJobStore(args.jobs_db),
+        client, limiter, flights,
+        max_prompt_tokens=args.max_prompt_tokens,
+        report_workers=args.report_workers
+    )
+
+
+def serve(args):
+    server = make_server(args.host, args.port, build_api(args))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Thrivya scoring and reports as a JSON HTTP API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="server processes")
+    parser.add_argument("--questions", default="culture_questions.json", help="question bank JSON file")
+    parser.add_argument("--api-key", default=os.environ.get("COHERE_API_KEY"), help="default: $COHERE_API_KEY")
+    parser.add_argument("--api-url", default=COHERE_CHAT_URL, help="chat endpoint")
+    parser.add_argument("--max-retries", type=int, default=3, help="retries per chat request on 429/5xx")
+    parser.add_argument("--cache", default=".thrivya_cache/reports.sqlite3", help="report cache shared with the app")
+    parser.add_argument("--jobs-db", default=".thrivya_cache/thrivya.sqlite3", help="report job status database")
+    parser.add_argument("--rate-limit-path", default=".thrivya_cache/ratelimit.sqlite3",
+                        help="rate limiter and in-flight leases shared with the app")
+    parser.add_argument("--requests-per-minute", type=float, default=100, help="chat API rate limit, 0 to disable")
+    parser.add_argument("--burst", type=float, default=10, help="chat API burst size")
+    parser.add_argument("--report-workers", type=int, default=8, help="concurrent generations per process")
+    parser.add_argument("--max-prompt-tokens", type=int, default=DEFAULT_MAX_PROMPT_TOKENS,
+                        help="estimated input token budget per prompt")
+    args = parser.parse_args(argv)
+
+    try:
+        QuestionBankSource(args.questions).current()
+    except QuestionBankError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    workers = max(1, args.workers)
+    if workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+        print("SO_REUSEPORT is not available here; running one worker", file=sys.stderr)
+        workers = 1
+    print(f"Thrivya API on http://{args.host}:{args.port} with {workers} worker(s)"
+          f"{'' if args.api_key else ', reports disabled (no API key)'}")
+    if workers == 1:
+        serve(args)
+        return 0
+
+    processes = [multiprocessing.Process(target=serve, args=(args,), daemon=True) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""Headless Culture Intelligence Reports for many business units.
+
+Reads a JSONL file with one business unit per line::
+
+    {"unit_id": "emea-sales", "org_info": {"name": "...", "industry": "..."},
+     "responses": {"C1": "Agree", "C2": 3, ...}}
+
+Each unit is scored with the same engine as the app and its report prompt is
+built with ``build_report_prompt``. Reports are then generated with at most
+``--concurrency`` chat requests in flight. For every unit the output directory
+gets ``<unit>-<hash>.md`` (and/or ``.html``) plus ``<unit>-<hash>.scores.json``,
+where the hash tells apart IDs that sanitize to the same name. Finished
+units are appended to ``checkpoint.jsonl`` only after their files are written,
+so an interrupted run started again with the same arguments skips them.
+
+    python batch_reports.py units.jsonl reports/ --concurrency 8
+"""
+import argparse
+import asyncio
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from cohere_client import COHERE_CHAT_URL, CohereAPIError, CohereClient
+from question_bank import QuestionBankError, SurveyResponses, load_question_bank
+from report_cache import ReportCache, report_cache_key
+from report_prompt import DEFAULT_MAX_PROMPT_TOKENS, REPORT_MODEL, REPORT_TEMPERATURE, build_report_prompt
+from scoring import ScoringEngine
+
+CHECKPOINT_FILE = "checkpoint.jsonl"
+DEFAULT_CONCURRENCY = 4
+
+
+class BatchInputError(ValueError):
+    """A unit in the input file cannot be scored"""
+
+
+def unit_filename(unit_id):
+    """File-system safe stem for a unit ID, unique per ID
+
+    The readable part alone would map IDs such as "emea/sales" and "emea sales"
+    to the same file, so a short hash of the ID is always appended.
+    """
+    readable = re.sub(r"[^\w.-]+", "_", str(unit_id)).strip("._")[:80] or "unit"
+    digest = hashlib.sha256(json.dumps(unit_id).encode("utf-8")).hexdigest()[:10]
+    return f"{readable}-{digest}"
+
+
+def read_units(path):
+    """Yield (line_number, unit) for each non-blank line of a JSONL file"""
+    with open(path, encoding="utf-8-sig") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                unit = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise BatchInputError(f"line {line_number}: {e}") from e
+            if not isinstance(unit, dict) or "unit_id" not in unit:
+                raise BatchInputError(f"line {line_number}: expected an object with a unit_id")
+            yield line_number, unit
+
+
+def read_checkpoint(out_dir):
+    """IDs of units already written by an earlier run"""
+    path = Path(out_dir) / CHECKPOINT_FILE
+    if not path.exists():
+        return set()
+    done = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line from an interrupted run
+            if entry.get("status") == "done":
+                done.add(entry["unit_id"])
+    return done
+
+
+def markdown_to_html(text, title):
+    """Minimal HTML rendering of the report's headings, bullets and bold text"""
+    body = []
+    in_list = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        is_item = stripped[:2] in ("- ", "* ", "• ")
+        # Strip only the list marker: a bare lstrip would also eat the "**" that opens bold text
+        text_only = re.sub(r"^[-*•]\s+", "", stripped) if is_item else stripped
+        content = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", html.escape(text_only))
+        if in_list and not is_item:
+            body.append("</ul>")
+            in_list = False
+        if not stripped:
+            continue
+        heading = re.match(r"(#{1,6})\s", stripped)
+        if heading:
+            level = len(heading.group(1))
+            body.append(f"<h{level}>{content.lstrip('#').strip()}</h{level}>")
+        elif is_item:
+            if not in_list:
+                body.append("<ul>")
+                in_list = True
+            body.append(f"<li>{content}</li>")
+        else:
+            body.append(f"<p>{content}</p>")
+    if in_list:
+        body.append("</ul>")
+    return (
+        f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title></head>\n"
+        f"<body>\n" + "\n".join(body) + "\n</body></html>\n"
+    )
+
+
+def _write_atomic(path, text):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class BatchRun:
+    """Scores, generates and writes reports for the units of one input file"""
+
+    def __init__(self, engine, bank, client, out_dir, formats=("md",), concurrency=DEFAULT_CONCURRENCY,
+                 cache=None, model=REPORT_MODEL, temperature=REPORT_TEMPERATURE,
+                 max_prompt_tokens=DEFAULT_MAX_PROMPT_TOKENS):
+        self.engine = engine
+        self.bank = bank
+        self.client = client
+        self.out_dir = Path(out_dir)
+        self.formats = formats
+        self.concurrency = concurrency
+        self.cache = cache
+        self.model = model
+        self.temperature = temperature
+        self.max_prompt_tokens = max_prompt_tokens
+        self.done = 0
+        self.skipped = 0
+        self.failures = []
+        self._checkpoint = None
+
+    def score(self, unit):
+        """(avg_scores, overall_score, pillar_scores, answered, answers) for one unit"""
+        answers = unit.get("responses")
+        if not isinstance(answers, dict):
+            raise BatchInputError("responses must be an object of question ID to answer")
+        responses = SurveyResponses.from_dict(self.bank, answers)
+        if not len(responses):
+            raise BatchInputError("no valid answers")
+        result = self.engine.score(self.engine.encode_codes(responses.codes))
+        answers = [(q['pillar'], q['question'], responses.code(q['id'])) for q in self.bank.questions if q['id'] in responses]
+        return self.engine.summarize(result) + (len(responses), answers)
+
+    def generate(self, prompt):
+        """Report text for a prompt, from the report cache when possible"""
+        key = report_cache_key(prompt, self.model, self.temperature)
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached:
+            return cached.text
+        text = self.client.chat(prompt, self.model, self.temperature)
+        if self.cache is not None:
+            self.cache.put(key, text)
+        return text
+
+    def write(self, unit, text, avg_scores, overall_score, pillar_scores, answered):
+        stem = unit_filename(unit["unit_id"])
+        org = unit.get("org_info") or {}
+        if "md" in self.formats:
+            _write_atomic(self.out_dir / f"{stem}.md", text)
+        if "html" in self.formats:
+            title = f"Culture Intelligence Report - {org.get('name') or unit['unit_id']}"
+            _write_atomic(self.out_dir / f"{stem}.html", markdown_to_html(text, title))
+        _write_atomic(self.out_dir / f"{stem}.scores.json", json.dumps({
+            "unit_id": unit["unit_id"],
+            "org_info": org,
+            "scores": avg_scores,
+            "overall": overall_score,
+            "pillars": pillar_scores,
+            "responses": answered,
+            "model": self.model,
+            "generated_at": datetime.now(timezone.utc).isoformat()
+        }, indent=2))
+
+    def record(self, unit_id, status, error=None):
+        entry = {"unit_id": unit_id, "status": status, "at": time.time()}
+        if error:
+            entry["error"] = error
+        self._checkpoint.write(json.dumps(entry) + "\n")
+        self._checkpoint.flush()
+
+    async def process(self, semaphore, unit):
+        unit_id = unit["unit_id"]
+        try:
+            avg_scores, overall_score, pillar_scores, answered, answers = self.score(unit)
+            prompt = build_report_prompt(
+                unit.get("org_info") or {}, avg_scores, overall_score, pillar_scores, answers, self.max_prompt_tokens
+            )
+            async with semaphore:
+                text = await asyncio.to_thread(self.generate, prompt)
+            await asyncio.to_thread(self.write, unit, text, avg_scores, overall_score, pillar_scores, answered)
+        except Exception as e:
+            # One bad unit or exhausted retries must not stop the rest of the batch
+            error = str(e) if isinstance(e, (BatchInputError, CohereAPIError)) else f"{type(e).__name__}: {e}"
+            self.failures.append({"unit_id": unit_id, "error": error})
+            self.record(unit_id, "failed", error)
+            return
+        self.done += 1
+        self.record(unit_id, "done")
+
+    async def run(self, units):
+        """Process every unit not already in the checkpoint"""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        finished = read_checkpoint(self.out_dir)
+        pending = []
+        seen = set()
+        for _, unit in units:
+            if unit["unit_id"] in seen:
+                raise BatchInputError(f"duplicate unit_id {unit['unit_id']!r}")
+            seen.add(unit["unit_id"])
+            if unit["unit_id"] in finished:
+                self.skipped += 1
+            else:
+                pending.append(unit)
+
+        # One worker thread per request slot, plus one for file writes
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=self.concurrency + 1))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        with open(self.out_dir / CHECKPOINT_FILE, "a", encoding="utf-8") as self._checkpoint:
+            await asyncio.gather(*(self.process(semaphore, unit) for unit in pending))
+        return len(pending)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Culture Intelligence Reports for a file of business units.")
+    parser.add_argument("units", help="JSONL file with unit_id, org_info and responses per line")
+    parser.add_argument("out_dir", help="directory for reports, scores and the checkpoint")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="chat requests in flight")
+    parser.add_argument("--format", choices=["md", "html", "both"], default="md", help="report file format")
+    parser.add_argument("--questions", default="culture_questions.json", help="question bank JSON file")
+    parser.add_argument("--api-key", default=os.environ.get("COHERE_API_KEY"), help="default: $COHERE_API_KEY")
+    parser.add_argument("--api-url", default=COHERE_CHAT_URL, help="chat endpoint")
+    parser.add_argument("--cache", help="report cache to read and fill, e.g. .thrivya_cache/reports.sqlite3")
+    parser.add_argument("--max-retries", type=int, default=5, help="retries per request on 429/5xx")
+    parser.add_argument("--max-prompt-tokens", type=int, default=DEFAULT_MAX_PROMPT_TOKENS,
+                        help="estimated input token budget per prompt")
+    args = parser.parse_args(argv)
+
+    if not args.api_key:
+        print("error: no API key; pass --api-key or set COHERE_API_KEY", file=sys.stderr)
+        return 2
+    try:
+        bank = load_question_bank(args.questions)
+        units = list(read_units(args.units))
+    except (QuestionBankError, BatchInputError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    concurrency = max(1, args.concurrency)
+    client = CohereClient(args.api_key, args.api_url, max_retries=args.max_retries, pool_size=concurrency)
+    batch = BatchRun(
+        ScoringEngine(list(bank.questions)), bank, client, args.out_dir,
+        formats=("md", "html") if args.format == "both" else (args.format,),
+        concurrency=concurrency,
+        cache=ReportCache(args.cache) if args.cache else None,
+        max_prompt_tokens=args.max_prompt_tokens
+    )
+    started = time.perf_counter()
+    try:
+        attempted = asyncio.run(batch.run(units))
+    except BatchInputError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        client.close()
+    elapsed = time.perf_counter() - started
+    json.dump({
+        "units": len(units),
+        "attempted": attempted,
+        "done": batch.done,
+        "skipped": batch.skipped,
+        "failed": len(batch.failures),
+        "failures": batch.failures[:100],
+        "elapsed_seconds": round(elapsed, 2),
+        "reports_per_minute": round(batch.done / elapsed * 60, 1) if elapsed else None
+    }, sys.stdout, indent=2)
+    print()
+    return 1 if batch.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
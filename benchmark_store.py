@@ -0,0 +1,172 @@
+"""Completed assessments and the industry benchmarks derived from them.
+
+Every completed assessment is persisted once per session. At the same time it
+is folded into running aggregates kept per (dimension, value, category), e.g.
+("industry", "Technology", "Culture"). Each aggregate holds a count, sum, sum of
+squares and a fixed-bin histogram that serves as a quantile sketch. Recording
+an assessment touches a constant number of aggregate rows, and reading a
+benchmark is a handful of primary-key lookups, so neither depends on how many
+assessments have been stored.
+"""
+import json
+import math
+import time
+from collections import namedtuple
+
+from sqlite_store import SQLiteStore
+
+BENCHMARK_CATEGORIES = ["Culture", "Wellness", "Growth", "Overall"]
+HISTOGRAM_BINS = 40  # 0.1-point bins over the 0-4 score range
+ALL_ORGANIZATIONS = "*"
+
+# org_info field backing each benchmark dimension, most specific first
+BENCHMARK_DIMENSIONS = [
+    ("industry", "industry"),
+    ("size", "size"),
+    ("work_model", "remote_work"),
+    ("all", None),
+]
+
+DIMENSION_LABELS = {
+    "industry": "{value} industry",
+    "size": "{value} organizations",
+    "work_model": "{value} organizations",
+    "all": "All organizations",
+}
+
+Benchmark = namedtuple("Benchmark", ["dimension", "value", "count", "means", "stddevs", "medians", "label"])
+
+
+def _histogram_bin(score):
+    return min(HISTOGRAM_BINS - 1, max(0, int(score * HISTOGRAM_BINS / 4)))
+
+
+def histogram_quantile(histogram, q):
+    """Approximate quantile from bin counts, interpolating within the bin"""
+    total = sum(histogram)
+    if not total:
+        return None
+    target = q * total
+    seen = 0
+    width = 4 / HISTOGRAM_BINS
+    for index, count in enumerate(histogram):
+        if count and seen + count >= target:
+            return round((index + (target - seen) / count) * width, 3)
+        seen += count
+    return 4.0
+
+
+class BenchmarkStore(SQLiteStore):
+    """SQLite store of completed assessments with O(1) benchmark aggregates"""
+
+    def __init__(self, path, min_count=5):
+        super().__init__(path)
+        self.min_count = min_count
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS assessments (
+                    id TEXT PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    org_info TEXT NOT NULL,
+                    scores TEXT NOT NULL,
+                    pillar_scores TEXT NOT NULL,
+                    responses TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS benchmark_stats (
+                    dimension TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    total REAL NOT NULL,
+                    total_sq REAL NOT NULL,
+                    histogram TEXT NOT NULL,
+                    PRIMARY KEY (dimension, value, category)
+                )
+            """)
+            conn.execute("CREATE TABLE IF NOT EXISTS benchmark_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO benchmark_meta VALUES ('version', 0)")
+
+    @staticmethod
+    def _dimension_values(org_info):
+        for dimension, field in BENCHMARK_DIMENSIONS:
+            value = ALL_ORGANIZATIONS if field is None else org_info.get(field)
+            if value:
+                yield dimension, value
+
+    def _apply(self, conn, org_info, scores, sign):
+        for dimension, value in self._dimension_values(org_info):
+            for category in BENCHMARK_CATEGORIES:
+                score = scores[category]
+                row = conn.execute(
+                    "SELECT count, total, total_sq, histogram FROM benchmark_stats "
+                    "WHERE dimension = ? AND value = ? AND category = ?",
+                    (dimension, value, category)
+                ).fetchone()
+                count, total, total_sq, histogram = row if row else (0, 0.0, 0.0, json.dumps([0] * HISTOGRAM_BINS))
+                histogram = json.loads(histogram)
+                histogram[_histogram_bin(score)] = max(0, histogram[_histogram_bin(score)] + sign)
+                conn.execute(
+                    "INSERT OR REPLACE INTO benchmark_stats VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (dimension, value, category, max(0, count + sign), total + sign * score,
+                     total_sq + sign * score * score, json.dumps(histogram))
+                )
+
+    def record_assessment(self, assessment_id, org_info, avg_scores, overall_score, pillar_scores, responses):
+        """Persist a completed assessment and fold it into the benchmarks
+
+        Recording the same ID again replaces the earlier submission, backing its
+        contribution out of the aggregates first.
+        """
+        scores = dict(avg_scores, Overall=overall_score)
+        with self._connect() as conn:
+            previous = conn.execute("SELECT org_info, scores FROM assessments WHERE id = ?", (assessment_id,)).fetchone()
+            if previous:
+                self._apply(conn, json.loads(previous[0]), json.loads(previous[1]), -1)
+            conn.execute(
+                "INSERT OR REPLACE INTO assessments VALUES (?, ?, ?, ?, ?, ?)",
+                (assessment_id, time.time(), json.dumps(org_info), json.dumps(scores),
+                 json.dumps(pillar_scores), json.dumps(responses))
+            )
+            self._apply(conn, org_info, scores, 1)
+            conn.execute("UPDATE benchmark_meta SET value = value + 1 WHERE name = 'version'")
+
+    def remove_assessment(self, assessment_id):
+        """Delete an assessment and back its contribution out of the benchmarks; False if unknown"""
+        with self._connect() as conn:
+            previous = conn.execute("SELECT org_info, scores FROM assessments WHERE id = ?", (assessment_id,)).fetchone()
+            if not previous:
+                return False
+            self._apply(conn, json.loads(previous[0]), json.loads(previous[1]), -1)
+            conn.execute("DELETE FROM assessments WHERE id = ?", (assessment_id,))
+            conn.execute("UPDATE benchmark_meta SET value = value + 1 WHERE name = 'version'")
+        return True
+
+    def version(self):
+        """Counter that changes whenever any benchmark changes"""
+        with self._connect() as conn:
+            return conn.execute("SELECT value FROM benchmark_meta WHERE name = 'version'").fetchone()[0]
+
+    def lookup(self, org_info):
+        """Most specific benchmark with at least min_count assessments, or None"""
+        with self._connect() as conn:
+            for dimension, value in self._dimension_values(org_info):
+                rows = conn.execute(
+                    "SELECT category, count, total, total_sq, histogram FROM benchmark_stats "
+                    "WHERE dimension = ? AND value = ?",
+                    (dimension, value)
+                ).fetchall()
+                stats = {row[0]: row[1:] for row in rows}
+                count = min((stats[c][0] for c in BENCHMARK_CATEGORIES if c in stats), default=0)
+                if len(stats) < len(BENCHMARK_CATEGORIES) or count < self.min_count:
+                    continue
+                means, stddevs, medians = {}, {}, {}
+                for category, (n, total, total_sq, histogram) in stats.items():
+                    mean = total / n
+                    means[category] = round(mean, 2)
+                    stddevs[category] = round(math.sqrt(max(0.0, total_sq / n - mean * mean)), 2)
+                    medians[category] = histogram_quantile(json.loads(histogram), 0.5)
+                label = DIMENSION_LABELS[dimension].format(value=value)
+                return Benchmark(dimension, value, count, means, stddevs, medians, label)
+        return None
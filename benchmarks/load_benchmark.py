@@ -0,0 +1,315 @@
+"""End-to-end load benchmark for thrivya_app.py with a regression baseline.
+
+Drives complete intro → details → culture → wellness → growth → results
+sessions headlessly with Streamlit's AppTest, against ``mock_cohere`` running
+with the given latency and error rate. ``--concurrency`` sessions run at the
+same time, each in its own worker interpreter (AppTest replaces ``__main__`` and
+keeps global runtime state, so sessions cannot share a process); like several
+server processes, they share the report cache, rate limiter and session store
+on disk.
+
+Reported per run:
+
+* rerun latency per page (p50/p95/max), timed from the click to the finished
+  rerun, and time from reaching the results page to the finished AI report
+* memory retained per session (RSS growth of a warmed-up worker)
+* completed sessions per minute, and the share of sessions that raised or
+  ended without an AI report
+
+p95 latencies, memory and throughput are compared with ``load_baseline.json``
+(within ``--tolerance``); a regression, or any session raising, fails the run.
+
+    python benchmarks/load_benchmark.py --sessions 16 --concurrency 4
+    python benchmarks/load_benchmark.py --error-rate 0.2 --no-compare
+    python benchmarks/load_benchmark.py --update-baseline
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).with_name("load_baseline.json")
+PAGES = ("intro", "details", "culture", "wellness", "growth", "results")
+MAX_STEPS = 200
+
+_worker = {}
+
+
+def rss_kb():
+    """Resident set size of this process in KiB"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # peak, not current, outside Linux
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def init_worker(settings):
+    """Import the test harness and render the intro page once, so sessions measure warm reruns"""
+    from streamlit.testing.v1 import AppTest
+    _worker["settings"] = settings
+    at = new_app(AppTest, settings)
+    at.run()
+    del at
+    _worker["AppTest"] = AppTest
+
+
+def new_app(app_test, settings):
+    at = app_test.from_file(str(ROOT / "thrivya_app.py"), default_timeout=120)
+    for key, value in settings.items():
+        at.secrets[key] = value
+    return at
+
+
+def report_state(at):
+    """'ai', 'failed' or None (still generating) for the current results page"""
+    if any("AI-Generated Culture Intelligence Report" in m.value for m in at.markdown):
+        return "ai"
+    if at.error:
+        return "failed"
+    return None
+
+
+def run_session(index, seed, report_timeout, poll_seconds):
+    """Complete one survey; returns its timings, outcome and retained memory"""
+    rng = random.Random(seed + index)
+    rss_before = rss_kb()
+    at = new_app(_worker["AppTest"], _worker["settings"])
+    pages = {page: [] for page in PAGES}
+    exceptions = []
+
+    def timed(action):
+        started = time.perf_counter()
+        action()
+        pages[at.session_state.page].append((time.perf_counter() - started) * 1000)
+        exceptions.extend(e.value for e in at.exception)
+
+    started = time.perf_counter()
+    timed(at.run)
+    timed(lambda: at.button[0].click().run())
+    at.text_input[0].input(f"Load Test Org {index}")
+    timed(lambda: at.button[-1].click().run())
+    for _ in range(MAX_STEPS):
+        if exceptions or at.session_state.page == "results":
+            break
+        for slider in at.slider:
+            slider.set_value(rng.randint(0, 4))
+        timed(lambda: at.button[-1].click().run())
+
+    report = "not reached" if at.session_state.page != "results" else None
+    fallback_shown = False
+    reached_results = time.perf_counter()
+    while report is None and not exceptions:
+        report = report_state(at)
+        fallback_shown = fallback_shown or any("rule-based analysis" in i.value for i in at.info)
+        if report is None:
+            if time.perf_counter() - reached_results > report_timeout:
+                report = "timeout"
+                break
+            time.sleep(poll_seconds)
+            at.run()
+            exceptions.extend(e.value for e in at.exception)
+    finished = time.perf_counter()
+
+    return {
+        "pages": pages,
+        "report": "exception" if exceptions else report,
+        "report_seconds": finished - reached_results if report == "ai" else None,
+        "fallback_shown": fallback_shown,
+        "exceptions": exceptions[:3],
+        "session_seconds": finished - started,
+        "memory_kb": rss_kb() - rss_before,
+    }
+
+
+def worker_main(config):
+    """Run this worker's share of sessions, printing one JSON result per line"""
+    init_worker(config["settings"])
+    for index in config["indices"]:
+        result = run_session(index, config["seed"], config["report_timeout"], config["poll"])
+        print(json.dumps(result), flush=True)
+    return 0
+
+
+def run_workers(configs):
+    """Start one worker interpreter per config; returns all session results"""
+    procs = [
+        subprocess.Popen(
+            [sys.executable, __file__, "--worker", json.dumps(config)],
+            cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        for config in configs
+    ]
+    results = []
+    for proc in procs:
+        out, err = proc.communicate()
+        if proc.returncode:
+            raise RuntimeError(f"worker exited with {proc.returncode}:\n{err[-2000:]}")
+        results.extend(json.loads(line) for line in out.splitlines() if line.startswith("{"))
+    return results
+
+
+def summarize(sessions, elapsed):
+    pages = {}
+    for page in PAGES:
+        samples = [ms for session in sessions for ms in session["pages"][page]]
+        if samples:
+            pages[page] = {
+                "p50_ms": round(percentile(samples, 0.5), 1),
+                "p95_ms": round(percentile(samples, 0.95), 1),
+                "max_ms": round(max(samples), 1),
+                "reruns": len(samples),
+            }
+    outcomes = Counter(session["report"] for session in sessions)
+    report_seconds = [s["report_seconds"] for s in sessions if s["report_seconds"] is not None]
+    return {
+        "pages": pages,
+        "report_p50_s": round(percentile(report_seconds, 0.5), 2) if report_seconds else None,
+        "report_p95_s": round(percentile(report_seconds, 0.95), 2) if report_seconds else None,
+        "reports": dict(outcomes),
+        "fallback_shown": sum(s["fallback_shown"] for s in sessions),
+        "error_rate": round(1 - outcomes["ai"] / len(sessions), 3),
+        "exception_sessions": sum(1 for s in sessions if s["exceptions"]),
+        "memory_per_session_mb": round(statistics.median(s["memory_kb"] for s in sessions) / 1024, 2),
+        "sessions_per_minute": round(len(sessions) / elapsed * 60, 1),
+        "elapsed_s": round(elapsed, 1),
+    }
+
+
+def compare(summary, baseline, tolerance):
+    """Names of metrics that regressed beyond tolerance"""
+    failures = []
+    checks = [(f"{page} p95_ms", summary["pages"].get(page, {}).get("p95_ms"),
+               baseline["pages"].get(page, {}).get("p95_ms"), True) for page in PAGES]
+    checks += [
+        ("report_p95_s", summary["report_p95_s"], baseline.get("report_p95_s"), True),
+        ("memory_per_session_mb", summary["memory_per_session_mb"], baseline.get("memory_per_session_mb"), True),
+        ("sessions_per_minute", summary["sessions_per_minute"], baseline.get("sessions_per_minute"), False),
+    ]
+    for name, value, reference, lower_is_better in checks:
+        if value is None or not reference:
+            continue
+        limit = reference * (1 + tolerance) if lower_is_better else reference * (1 - tolerance)
+        regressed = value > limit if lower_is_better else value < limit
+        status = "REGRESSION" if regressed else "ok"
+        print(f"{name:24} {value:10.1f}   baseline {reference:10.1f}   {status}")
+        if regressed:
+            failures.append(name)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the Thrivya survey flow against a mock chat API.")
+    parser.add_argument("--sessions", type=int, default=8, help="sessions to complete")
+    parser.add_argument("--concurrency", type=int, default=4, help="sessions running at the same time")
+    parser.add_argument("--survey-mode", choices=["stepped", "form"], default="stepped")
+    parser.add_argument("--first-token-delay", type=float, default=0.3, help="mock seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.005, help="mock seconds between streamed tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of mock requests that fail")
+    parser.add_argument("--report-timeout", type=float, default=60, help="seconds to wait for each AI report")
+    parser.add_argument("--poll", type=float, default=0.25, help="seconds between results-page reruns")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random survey answers")
+    parser.add_argument("--setting", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra app secret, e.g. report_mode=sectioned")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="JSON baseline to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative regression")
+    parser.add_argument("--no-compare", action="store_true", help="only report, don't check the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--json", help="also write the full summary to this file")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.worker:
+        return worker_main(json.loads(args.worker))
+
+    sys.path.insert(0, str(ROOT))
+    import mock_cohere
+
+    server = mock_cohere.make_server(
+        port=0, first_token_delay=args.first_token_delay, token_delay=args.token_delay, error_rate=args.error_rate
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state_dir = tempfile.mkdtemp(prefix="thrivya-load-")
+    settings = {
+        "cohere_api_key": "load-test",
+        "cohere_api_url": f"http://127.0.0.1:{server.server_address[1]}/v1/chat",
+        "questions_path": str(ROOT / "culture_questions.json"),
+        "report_cache_path": os.path.join(state_dir, "reports.sqlite3"),
+        "rate_limit_path": os.path.join(state_dir, "ratelimit.sqlite3"),
+        "thrivya_db_path": os.path.join(state_dir, "thrivya.sqlite3"),
+        "survey_mode": args.survey_mode,
+    }
+    for item in args.setting:
+        key, _, value = item.partition("=")
+        settings[key] = {"true": True, "false": False}.get(value, value)
+
+    sessions = max(1, args.sessions)
+    concurrency = max(1, min(args.concurrency, sessions))
+    print(f"{sessions} sessions, {concurrency} concurrent, {args.survey_mode} survey, "
+          f"mock first token {args.first_token_delay}s, error rate {args.error_rate:.0%}")
+    started = time.perf_counter()
+    try:
+        results = run_workers([
+            {"settings": settings, "indices": list(range(worker, sessions, concurrency)), "seed": args.seed,
+             "report_timeout": args.report_timeout, "poll": args.poll}
+            for worker in range(concurrency)
+        ])
+    finally:
+        server.shutdown()
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(results, elapsed)
+    summary["params"] = {
+        "sessions": sessions, "concurrency": concurrency, "survey_mode": args.survey_mode,
+        "first_token_delay": args.first_token_delay, "token_delay": args.token_delay, "error_rate": args.error_rate,
+    }
+    print(f"{'page':10} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'reruns':>7}")
+    for page, stats in summary["pages"].items():
+        print(f"{page:10} {stats['p50_ms']:9.1f} {stats['p95_ms']:9.1f} {stats['max_ms']:9.1f} {stats['reruns']:7}")
+    print(f"report time p50/p95      {summary['report_p50_s']} / {summary['report_p95_s']} s")
+    print(f"report outcomes          {summary['reports']} (fallback shown in {summary['fallback_shown']}, "
+          f"error rate {summary['error_rate']:.0%})")
+    print(f"memory per session       {summary['memory_per_session_mb']} MB")
+    print(f"throughput               {summary['sessions_per_minute']} sessions/min over {summary['elapsed_s']} s")
+    for session in results:
+        for error in session["exceptions"]:
+            print(f"exception: {error}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, indent=2) + "\n")
+    if args.update_baseline:
+        Path(args.baseline).write_text(json.dumps(summary, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    failures = ["exceptions"] if summary["exception_sessions"] else []
+    if not args.no_compare:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if baseline.get("params") != summary["params"]:
+            print("note: baseline was recorded with different parameters; comparison is approximate")
+        failures += compare(summary, baseline, args.tolerance)
+    if failures:
+        print(f"FAIL: {', '.join(failures)}")
+        return 1
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
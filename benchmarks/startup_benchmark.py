@@ -0,0 +1,80 @@
+"""Cold-start benchmark for thrivya_app.py with a regression budget.
+
+Each sample runs in a fresh interpreter so nothing is warm: it imports the
+Streamlit test harness, renders the intro page once (cold), then once more
+(warm rerun), and records which heavy libraries the intro page pulled in.
+The medians are compared with ``startup_budget.json``; any metric over budget,
+or any library the intro page must not import, fails the run.
+
+    python benchmarks/startup_benchmark.py --samples 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_PATH = Path(__file__).with_name("startup_budget.json")
+
+SAMPLE_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+harness_ready = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=60)
+at.run()
+first_render = time.perf_counter()
+at.run()
+rerun = time.perf_counter()
+assert not at.exception, at.exception
+print(json.dumps({
+    "harness_import_ms": (harness_ready - started) * 1000,
+    "intro_first_render_ms": (first_render - harness_ready) * 1000,
+    "intro_rerun_ms": (rerun - first_render) * 1000,
+    "loaded_modules": sorted(m for m in sys.modules if "." not in m)
+}))
+"""
+
+
+def run_sample():
+    output = subprocess.run(
+        [sys.executable, "-c", SAMPLE_SCRIPT, str(ROOT / "thrivya_app.py")],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold start of the Thrivya app against a budget.")
+    parser.add_argument("--samples", type=int, default=5, help="fresh-interpreter runs to take the median of")
+    parser.add_argument("--budget", default=str(BUDGET_PATH), help="JSON file of metric budgets")
+    args = parser.parse_args(argv)
+
+    budget = json.loads(Path(args.budget).read_text())
+    samples = [run_sample() for _ in range(args.samples)]
+    failures = []
+    for metric in ("harness_import_ms", "intro_first_render_ms", "intro_rerun_ms"):
+        median = statistics.median(sample[metric] for sample in samples)
+        limit = budget.get(metric)
+        status = "ok" if limit is None or median <= limit else "OVER BUDGET"
+        print(f"{metric:24} {median:8.1f} ms   budget {limit if limit is not None else '-':>6}   {status}")
+        if status != "ok":
+            failures.append(metric)
+
+    loaded = set(samples[0]["loaded_modules"])
+    forbidden = sorted(loaded & set(budget.get("intro_forbidden_modules", [])))
+    print(f"{'intro_forbidden_modules':24} {', '.join(forbidden) or 'none loaded'}")
+    if forbidden:
+        failures.append("intro_forbidden_modules")
+
+    if failures:
+        print(f"FAIL: {', '.join(failures)}")
+        return 1
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""Streaming bulk import of survey responses from CSV or JSONL exports.
+
+Files are read in fixed-size chunks: each chunk is validated against the
+question bank and ``SLIDER_LEVELS``, packed into an int8 code matrix and folded
+into a ``ScoreAccumulator``, so memory use does not depend on file size.
+
+CSV files have one row per respondent and one column per question ID; extra
+columns such as ``respondent_id`` are ignored. JSONL files have one object per
+line, either ``{"responses": {"C1": "Agree", ...}}`` or the answers at top
+level. Answers may be level labels (case-insensitive) or codes 0-4.
+
+    python bulk_import.py survey_export.csv --chunk-size 5000
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from culture_model import SLIDER_LEVELS
+from question_bank import QuestionBankError, load_question_bank
+from scoring import UNANSWERED, ScoreAccumulator, ScoringEngine
+
+DEFAULT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+RESERVED_COLUMNS = {"respondent_id", "submitted_at", "org", "org_code"}
+
+_LEVEL_CODES = {level.lower(): code for code, level in enumerate(SLIDER_LEVELS)}
+_LEVEL_CODES.update({str(code): code for code in range(len(SLIDER_LEVELS))})
+
+RowError = namedtuple("RowError", ["row", "message"])
+
+
+class ImportFormatError(ValueError):
+    """The file cannot be imported at all (bad header, unknown format)"""
+
+
+def encode_answer(value):
+    """Code for one answer cell; None when blank, ValueError when invalid"""
+    if value is None:
+        return None
+    if isinstance(value, int) and not isinstance(value, bool):
+        value = str(value)
+    text = str(value).strip().lower()
+    if not text:
+        return None
+    if text not in _LEVEL_CODES:
+        raise ValueError(f"invalid answer {value!r}")
+    return _LEVEL_CODES[text]
+
+
+class ImportReport:
+    """Running totals for one import: accepted rows, rejections and scores"""
+
+    def __init__(self, engine):
+        self.accumulator = ScoreAccumulator(engine)
+        self.rows_read = 0
+        self.rows_rejected = 0
+        self.errors = []
+
+    def reject(self, row, message):
+        self.rows_rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(RowError(row, message))
+
+    def summary(self):
+        summary = self.accumulator.summary()
+        summary.update({
+            "rows_read": self.rows_read,
+            "rows_rejected": self.rows_rejected,
+            "errors": [error._asdict() for error in self.errors]
+        })
+        return summary
+
+
+def _iter_csv_rows(text_stream, engine):
+    reader = csv.DictReader(text_stream)
+    if not reader.fieldnames:
+        raise ImportFormatError("CSV file has no header row")
+    columns = [name.strip() for name in reader.fieldnames]
+    unknown = [c for c in columns if c not in engine.question_index and c.lower() not in RESERVED_COLUMNS]
+    if unknown:
+        raise ImportFormatError(f"Unknown question columns: {', '.join(unknown[:10])}")
+    if not any(c in engine.question_index for c in columns):
+        raise ImportFormatError("CSV header does not contain any question IDs")
+    for raw in reader:
+        yield {key.strip(): value for key, value in raw.items() if key is not None}
+
+
+def _iter_jsonl_rows(text_stream):
+    for line in text_stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield e
+            continue
+        if not isinstance(record, dict):
+            yield ValueError("line is not a JSON object")
+            continue
+        yield record.get("responses", record)
+
+
+def iter_code_chunks(text_stream, fmt, engine, report, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield validated int8 code matrices of at most chunk_size rows"""
+    if fmt == "csv":
+        rows = _iter_csv_rows(text_stream, engine)
+    elif fmt == "jsonl":
+        rows = _iter_jsonl_rows(text_stream)
+    else:
+        raise ImportFormatError(f"Unsupported format {fmt!r}; expected csv or jsonl")
+
+    chunk = np.full((chunk_size, engine.n_questions), UNANSWERED, dtype=np.int8)
+    filled = 0
+    for row_number, row in enumerate(rows, start=1):
+        report.rows_read += 1
+        if isinstance(row, Exception):
+            report.reject(row_number, str(row))
+            continue
+        codes = chunk[filled]
+        codes.fill(UNANSWERED)
+        try:
+            for key, value in row.items():
+                index = engine.question_index.get(key)
+                if index is None:
+                    if fmt == "jsonl" and key.lower() not in RESERVED_COLUMNS:
+                        raise ValueError(f"unknown question {key!r}")
+                    continue
+                code = encode_answer(value)
+                if code is not None:
+                    codes[index] = code
+        except ValueError as e:
+            report.reject(row_number, str(e))
+            continue
+        if (codes == UNANSWERED).all():
+            report.reject(row_number, "no answers")
+            continue
+        filled += 1
+        if filled == chunk_size:
+            yield chunk
+            chunk = np.full((chunk_size, engine.n_questions), UNANSWERED, dtype=np.int8)
+            filled = 0
+    if filled:
+        yield chunk[:filled]
+
+
+def detect_format(filename):
+    """Import format implied by a file name"""
+    suffix = Path(filename).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    raise ImportFormatError(f"Cannot tell the format of {filename!r}; use a .csv or .jsonl file")
+
+
+def import_responses(stream, fmt, engine, chunk_size=DEFAULT_CHUNK_SIZE, on_chunk=None):
+    """Score every respondent in a binary or text stream and return an ImportReport
+
+    ``on_chunk(codes, result)`` is called after each chunk is scored, for callers
+    that want to keep the per-respondent results (e.g. to persist them).
+    """
+    if isinstance(stream, io.TextIOBase):
+        text_stream = stream
+    else:
+        text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    report = ImportReport(engine)
+    for codes in iter_code_chunks(text_stream, fmt, engine, report, chunk_size):
+        result = report.accumulator.add(codes)
+        if on_chunk is not None:
+            on_chunk(codes, result)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV or JSONL export of Thrivya survey responses.")
+    parser.add_argument("path", help="CSV or JSONL file of responses")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="file format (default: from extension)")
+    parser.add_argument("--questions", default="culture_questions.json", help="question bank JSON file")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows scored per batch")
+    args = parser.parse_args(argv)
+
+    try:
+        engine = ScoringEngine(list(load_question_bank(args.questions).questions))
+        fmt = args.format or detect_format(args.path)
+        with open(args.path, "rb") as stream:
+            report = import_responses(stream, fmt, engine, args.chunk_size)
+    except (QuestionBankError, ImportFormatError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    json.dump(report.summary(), sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
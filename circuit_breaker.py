@@ -0,0 +1,123 @@
+"""Circuit breaker for the report generation API.
+
+The breaker keeps a sliding window of recent call outcomes. A call counts as
+bad when it raises or is slower than ``slow_call_seconds`` (time to the first
+streamed chunk, or the whole call when not streaming). Once the share of bad
+calls in the window reaches ``failure_rate`` the circuit opens. While it is
+open, callers of ``wait`` block instead of piling more requests onto a failing
+provider. After ``open_seconds`` a single probe call is let through: success
+closes the circuit and releases every waiter, failure opens it again.
+"""
+import threading
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """The circuit stayed open for longer than the caller was willing to wait"""
+
+
+class CircuitBreaker:
+    """Failure-rate and latency based breaker shared by every session in a process"""
+
+    def __init__(self, window=20, min_calls=4, failure_rate=0.5, slow_call_seconds=60.0, open_seconds=30.0,
+                 clock=time.monotonic):
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._outcomes = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = None
+        self._probe_started = None
+        self._changed = threading.Condition()
+
+    @property
+    def state(self):
+        with self._changed:
+            return self._state
+
+    def stats(self):
+        """State, window size and share of bad calls in the window"""
+        with self._changed:
+            calls = len(self._outcomes)
+            bad = calls - sum(self._outcomes)
+            return {"state": self._state, "calls": calls, "failure_rate": bad / calls if calls else 0.0}
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probe_started = None
+
+    def allow(self):
+        """True if a call may go ahead now; in half-open state only one probe at a time"""
+        with self._changed:
+            now = self._clock()
+            if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+                self._state = HALF_OPEN
+            if self._state == CLOSED:
+                return True
+            # A probe that never reported back (e.g. served from cache) stops blocking after open_seconds
+            if self._state == HALF_OPEN and (
+                self._probe_started is None or now - self._probe_started >= self.open_seconds
+            ):
+                self._probe_started = now
+                return True
+            return False
+
+    def wait(self, timeout):
+        """Block until allow() succeeds; raises CircuitOpenError after timeout seconds"""
+        deadline = self._clock() + timeout
+        while not self.allow():
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                raise CircuitOpenError(f"circuit open for more than {timeout:g}s")
+            with self._changed:
+                self._changed.wait(min(remaining, self.open_seconds / 4))
+
+    def record(self, ok, seconds):
+        """Add one call outcome to the window, opening or closing the circuit as needed"""
+        good = ok and seconds <= self.slow_call_seconds
+        with self._changed:
+            if self._state == HALF_OPEN:
+                if good:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    self._changed.notify_all()
+                else:
+                    self._open()
+                return
+            self._outcomes.append(good)
+            calls = len(self._outcomes)
+            if self._state == CLOSED and calls >= self.min_calls and (calls - sum(self._outcomes)) / calls >= self.failure_rate:
+                self._open()
+
+    def call(self, fn, *args, **kwargs):
+        """Run fn and record its outcome and duration"""
+        started = self._clock()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record(False, self._clock() - started)
+            raise
+        self.record(True, self._clock() - started)
+        return result
+
+    def stream(self, chunks):
+        """Pass chunks through, recording the time to the first one and any failure"""
+        started = self._clock()
+        first_chunk = None
+        try:
+            for chunk in chunks:
+                if first_chunk is None:
+                    first_chunk = self._clock() - started
+                yield chunk
+        except Exception:
+            self.record(False, self._clock() - started)
+            raise
+        self.record(True, first_chunk if first_chunk is not None else self._clock() - started)
@@ -0,0 +1,154 @@
+"""Pooled, retrying client for the Cohere /v1/chat endpoint used to write culture reports.
+
+One ``CohereClient`` is meant to be shared by the whole server process: it owns
+a ``requests.Session`` whose connection pool keeps TLS connections to the API
+alive between reports. Rate-limited (429) and transient 5xx responses, as well
+as failures to connect, are retried with jittered exponential backoff that
+honours ``Retry-After``. Every attempt is recorded with its latency.
+"""
+import json
+import random
+import threading
+import time
+from collections import deque, namedtuple
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+COHERE_CHAT_URL = "https://api.cohere.ai/v1/chat"
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+Attempt = namedtuple("Attempt", ["started_at", "latency", "status_code", "error"])
+
+
+class CohereAPIError(Exception):
+    """Non-200 response or failed generation reported by the chat API"""
+
+    def __init__(self, status_code, text):
+        super().__init__(f"{status_code} - {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+def iter_stream_events(lines):
+    """Decode the newline-delimited JSON events of a streamed chat response"""
+    for line in lines:
+        if not line:
+            continue
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        yield json.loads(line)
+
+
+def parse_retry_after(value):
+    """Seconds to wait according to a Retry-After header, or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CohereClient:
+    """Shared chat API client with connection pooling, retries and attempt timing"""
+
+    def __init__(self, api_key, url=COHERE_CHAT_URL, connect_timeout=5, read_timeout=180,
+                 max_retries=3, backoff_base=1.0, backoff_max=20.0, max_retry_after=60.0,
+                 pool_size=16, history=500, on_attempt=None):
+        self.url = url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        })
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._attempts = deque(maxlen=history)
+        self.on_attempt = on_attempt
+        self._lock = threading.Lock()
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _record(self, started_at, status_code=None, error=None):
+        attempt = Attempt(started_at, time.perf_counter() - started_at, status_code, error)
+        with self._lock:
+            self._attempts.append(attempt)
+        if self.on_attempt is not None:
+            self.on_attempt(attempt)
+
+    def _post(self, payload, stream):
+        """POST with retries; returns the first non-retryable response"""
+        for attempt in range(self.max_retries + 1):
+            started_at = time.perf_counter()
+            last_attempt = attempt == self.max_retries
+            try:
+                response = self.session.post(self.url, json=payload, timeout=self.timeout, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.ConnectTimeout) as e:
+                self._record(started_at, error=type(e).__name__)
+                if last_attempt:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+            except requests.exceptions.RequestException as e:
+                self._record(started_at, error=type(e).__name__)
+                raise
+            self._record(started_at, status_code=response.status_code)
+            if response.status_code not in RETRY_STATUSES or last_attempt:
+                return response
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if delay is not None and delay > self.max_retry_after:
+                return response
+            response.close()
+            time.sleep(delay if delay is not None else self._backoff(attempt))
+
+    def _payload(self, message, model, temperature, max_tokens, stream):
+        return {
+            "model": model,
+            "message": message,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": stream
+        }
+
+    def chat(self, message, model, temperature, max_tokens=4096):
+        """Send one non-streamed chat request and return the generated text"""
+        response = self._post(self._payload(message, model, temperature, max_tokens, stream=False), stream=False)
+        if response.status_code != 200:
+            raise CohereAPIError(response.status_code, response.text)
+        return response.json().get("text", "No AI response returned.")
+
+    def stream_chat(self, message, model, temperature, max_tokens=4096):
+        """Yield text fragments as the chat API generates them"""
+        response = self._post(self._payload(message, model, temperature, max_tokens, stream=True), stream=True)
+        with response:
+            if response.status_code != 200:
+                raise CohereAPIError(response.status_code, response.text)
+            for event in iter_stream_events(response.iter_lines()):
+                event_type = event.get("event_type")
+                if event_type == "text-generation":
+                    yield event.get("text", "")
+                elif event_type == "stream-end":
+                    if event.get("finish_reason") not in ("COMPLETE", "MAX_TOKENS"):
+                        raise CohereAPIError(200, f"Generation ended with {event.get('finish_reason')}")
+                    return
+
+    def recent_attempts(self):
+        """Most recent HTTP attempts, oldest first"""
+        with self._lock:
+            return list(self._attempts)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,30 @@
+"""Assessment vocabulary shared by the Streamlit app and the offline tools."""
+
+# --- Pillar Mapping ---
+pillar_map = {
+    "Leadership & Vision": "Culture",
+    "Inclusivity & Belonging": "Culture",
+    "Recognition & Motivation": "Culture",
+    "Compensation & Benefits": "Culture", # NEW ADDITION
+    "Well-being & Work-Life": "Wellness",
+    "Feedback & Communication": "Wellness",
+    "Learning & Growth": "Growth",
+    "Team Dynamics & Trust": "Growth",
+    "Autonomy & Empowerment": "Growth"
+}
+
+CATEGORIES = ["Culture", "Wellness", "Growth"]
+
+# --- Response Scale ---
+SLIDER_LEVELS = ["Strongly Disagree", "Disagree", "Neutral", "Agree", "Strongly Agree"]
+LEVEL_SCORE = {lvl: i for i, lvl in enumerate(SLIDER_LEVELS)}
+
+
+def get_score_interpretation(score):
+    """Enhanced score interpretation with detailed insights"""
+    if score >= 3.5:
+        return "Excellent", "score-excellent", "🌟"
+    elif score >= 2.5:
+        return "Good", "score-good", "👍"
+    else:
+        return "Needs Improvement", "score-needs-improvement", "⚠️"
@@ -0,0 +1,252 @@
+"""In-process metrics with Prometheus text exposition.
+
+Counters and fixed-bucket histograms are kept per label combination, behind
+one lock, and cost a dict lookup and a bisect per observation. Quantiles
+(p50/p95/p99) are interpolated from the buckets, the same way Prometheus'
+``histogram_quantile`` does. Metrics can be scraped from a small local HTTP
+endpoint, written to a file periodically, or both.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Seconds, from 1 ms up to the chat API read timeout
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+SIZE_BUCKETS = (500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Family:
+    def __init__(self, name, help_text, labelnames):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(_Family):
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self.values = {}
+
+    def add(self, key, value):
+        self.values[key] = self.values.get(key, 0) + value
+
+    def lines(self):
+        for key, value in sorted(self.values.items()):
+            yield f"{self.name}{_label_text(self.labelnames, key)} {_format(value)}"
+
+
+class Histogram(_Family):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+        self.series = {}  # key -> [bucket counts..., +Inf count, sum]
+
+    def add(self, key, value):
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def quantile(self, key, q):
+        """Quantile interpolated within its bucket, or None without observations"""
+        series = self.series.get(key)
+        counts = series[:-1] if series else ()
+        total = sum(counts)
+        if not total:
+            return None
+        target = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= target:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (target - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def lines(self):
+        for key, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = _label_text(self.labelnames, key, f'le="{bound}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            count = cumulative + series[len(self.buckets)]
+            labels = _label_text(self.labelnames, key, 'le="+Inf"')
+            yield f"{self.name}_bucket{labels} {count}"
+            yield f"{self.name}_sum{_label_text(self.labelnames, key)} {_format(series[-1])}"
+            yield f"{self.name}_count{_label_text(self.labelnames, key)} {count}"
+
+
+class Gauge(_Family):
+    """Value read from a callback at export time: ``collect() -> {label values tuple: value}``"""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labelnames, collect):
+        super().__init__(name, help_text, labelnames)
+        self.collect = collect
+
+    def lines(self):
+        for key, value in sorted(self.collect().items()):
+            yield f"{self.name}{_label_text(self.labelnames, key)} {_format(value)}"
+
+
+class MetricsRegistry:
+    """Named metric families; observations are thread-safe"""
+
+    def __init__(self):
+        self._families = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.exporter_errors = []
+
+    def _register(self, family):
+        self._families[family.name] = family
+        return family
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def gauge(self, name, help_text, labelnames, collect):
+        return self._register(Gauge(name, help_text, labelnames, collect))
+
+    def inc(self, name, value=1, **labels):
+        family = self._families[name]
+        key = family._key(labels)
+        with self._lock:
+            family.add(key, value)
+
+    def observe(self, name, value, **labels):
+        self.inc(name, value, **labels)
+
+    def timer(self, name, **labels):
+        """Context manager observing the elapsed seconds of its block"""
+        return _Timer(self, name, labels)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        out = []
+        with self._lock:
+            for family in self._families.values():
+                if isinstance(family, Gauge):
+                    continue
+                out.append(f"# HELP {family.name} {family.help}")
+                out.append(f"# TYPE {family.name} {family.kind}")
+                out.extend(family.lines())
+        # Gauge callbacks may take other locks, so they run outside ours
+        for family in self._families.values():
+            if isinstance(family, Gauge):
+                out.append(f"# HELP {family.name} {family.help}")
+                out.append(f"# TYPE {family.name} {family.kind}")
+                out.extend(family.lines())
+        return "\n".join(out) + "\n"
+
+    def summary(self):
+        """One row per histogram series: name, labels, count, mean and quantiles"""
+        rows = []
+        with self._lock:
+            for family in self._families.values():
+                if not isinstance(family, Histogram):
+                    continue
+                for key, series in sorted(family.series.items()):
+                    count = sum(series[:-1])
+                    row = {
+                        "metric": family.name,
+                        "labels": ", ".join(f"{n}={v}" for n, v in zip(family.labelnames, key)),
+                        "count": count,
+                        "mean": series[-1] / count if count else None,
+                    }
+                    row.update({f"p{int(q * 100)}": family.quantile(key, q) for q in QUANTILES})
+                    rows.append(row)
+        return rows
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "labels", "started")
+
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+def start_http_exporter(registry, port, host="127.0.0.1"):
+    """Serve /metrics from a daemon thread; returns the server"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def start_file_exporter(registry, path, interval=15.0):
+    """Rewrite path with the current metrics every interval seconds (atomically)"""
+    path = str(path).format(pid=os.getpid())
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def write_loop():
+        while True:
+            try:
+                tmp = f"{path}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(registry.render())
+                os.replace(tmp, path)
+            except OSError as e:
+                registry.exporter_errors = [f"{path}: {e}"]
+            time.sleep(interval)
+
+    threading.Thread(target=write_loop, name="metrics-file", daemon=True).start()
+    return path
@@ -0,0 +1,138 @@
+"""Local stand-in for the Cohere /v1/chat endpoint.
+
+Serves canned culture reports in the same shapes as the real API: a single JSON
+body for ordinary requests and newline-delimited JSON events when the request
+sets ``"stream": true``. A share of requests can be failed on purpose
+(``--error-rate``) to exercise retries, the circuit breaker and the fallback.
+Point the app at it with the ``cohere_api_url`` secret:
+
+    python mock_cohere.py --port 8765
+    # .streamlit/secrets.toml
+    cohere_api_key = "local-test"
+    cohere_api_url = "http://127.0.0.1:8765/v1/chat"
+"""
+import argparse
+import json
+import random
+import re
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def build_mock_report(message):
+    """Canned Markdown report with one section per heading in the prompt"""
+    headings = re.findall(r"^##\s+(.+)$", message, flags=re.MULTILINE) or ["Culture Recommendations"]
+    sections = []
+    for heading in headings:
+        sections.append(
+            f"## {heading.strip()}\n"
+            f"- Review the {heading.strip().lower()} findings with the leadership team.\n"
+            "- Agree on one owner and a 30-day checkpoint for each action.\n"
+            "- Track progress with a short monthly pulse survey.\n"
+        )
+    return "\n".join(sections)
+
+
+class MockCohereHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    first_token_delay = 0.3
+    token_delay = 0.01
+    error_rate = 0.0
+    error_status = 503
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_chunk(self, event):
+        data = (json.dumps(event) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/chat":
+            self._send_json(404, {"message": "not found"})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"message": "invalid JSON body"})
+            return
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            self._send_json(401, {"message": "missing bearer token"})
+            return
+
+        if self.error_rate and random.random() < self.error_rate:
+            self._send_json(self.error_status, {"message": "mock upstream failure"})
+            return
+
+        text = build_mock_report(request.get("message", ""))
+        generation_id = str(uuid.uuid4())
+        if not request.get("stream"):
+            time.sleep(self.first_token_delay + self.token_delay * len(text.split()))
+            self._send_json(200, {"text": text, "generation_id": generation_id, "finish_reason": "COMPLETE"})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/stream+json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._send_chunk({"is_finished": False, "event_type": "stream-start", "generation_id": generation_id})
+        time.sleep(self.first_token_delay)
+        for token in re.findall(r"\S+\s*", text):
+            self._send_chunk({"is_finished": False, "event_type": "text-generation", "text": token})
+            time.sleep(self.token_delay)
+        self._send_chunk({
+            "is_finished": True,
+            "event_type": "stream-end",
+            "finish_reason": "COMPLETE",
+            "response": {"text": text, "generation_id": generation_id}
+        })
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def make_server(host="127.0.0.1", port=8765, first_token_delay=0.3, token_delay=0.01, error_rate=0.0,
+                error_status=503):
+    """Build (but do not start) a mock server with the given timing and failure profile"""
+    handler = type("ConfiguredMockCohereHandler", (MockCohereHandler,), {
+        "first_token_delay": first_token_delay,
+        "token_delay": token_delay,
+        "error_rate": error_rate,
+        "error_status": error_status
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Cohere chat API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--first-token-delay", type=float, default=0.3, help="seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds between streamed tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of the injected errors")
+    args = parser.parse_args()
+
+    server = make_server(
+        args.host, args.port, args.first_token_delay, args.token_delay, args.error_rate, args.error_status
+    )
+    print(f"Mock Cohere chat API listening on http://{args.host}:{args.port}/v1/chat")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""Organization-wide results pooled across many respondents.
+
+An organization survey is opened under a short invite code. Everyone who
+follows the invite link answers the same question bank, and each completed
+response is stored as one int8 code row (a respondent who submits again
+replaces their earlier row).
+
+Every write also updates the survey's running aggregate for the question bank
+digest: the respondent count, per-pillar respondent counts and a per-question
+count of each answer level. Pillar, category and question averages and the
+score distributions all follow from those counts through the scoring engine's
+membership matrices, so a write touches a single aggregate row and reading the
+averages never scans the responses.
+
+Confidence intervals come from a bootstrap over respondents. Each process keeps
+the survey's code matrix, extended with only the rows added since the last
+read, and recomputes intervals only when the aggregate's revision changes. The
+resamples are drawn together as a B×N matrix of draw counts, so the
+resampled pooled averages for every pillar and category are matrix products.
+
+Nothing is reported for a group smaller than ``min_group_size`` respondents,
+and pillars answered by fewer respondents than that are withheld.
+"""
+import json
+import secrets
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from culture_model import SLIDER_LEVELS
+from sqlite_store import SQLiteStore
+
+BOOTSTRAP_CHUNK_CELLS = 1 << 21  # resample weights held in memory at once
+
+OrgResults = namedtuple("OrgResults", [
+    "respondents", "visible", "avg_scores", "overall_score", "pillar_scores",
+    "intervals", "pillar_respondents", "level_counts", "question_means", "confidence"
+])
+
+
+def new_survey_code():
+    """Short, URL-safe, unguessable invite code for one organization survey"""
+    return secrets.token_urlsafe(6)
+
+
+def bootstrap_intervals(result, samples=1000, confidence=0.95, seed=0):
+    """Percentile intervals of pooled pillar, category and overall averages
+
+    ``result`` is a per-respondent ``ScoreResult``; respondents are resampled
+    with replacement. Returns ``(pillar_bounds, category_bounds, overall_bounds)``
+    with lower bounds in row 0 and upper bounds in row 1.
+    """
+    n = result.overall.shape[0]
+    rng = np.random.default_rng(seed)
+    chunk = max(1, BOOTSTRAP_CHUNK_CELLS // n)
+    pillar_means, category_means = [], []
+    for start in range(0, samples, chunk):
+        size = min(chunk, samples - start)
+        # Row b counts how often each respondent was drawn in resample b
+        draws = rng.integers(0, n, (size, n)) + np.arange(size)[:, None] * n
+        weights = np.bincount(draws.ravel(), minlength=size * n).reshape(size, n).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pillar_means.append((weights @ result.pillar_sums) / (weights @ result.pillar_counts))
+            category_means.append((weights @ result.category_sums) / (weights @ result.category_counts))
+    pillar_means = np.concatenate(pillar_means)
+    category_means = np.concatenate(category_means)
+    overall = np.nan_to_num(category_means).mean(axis=1)
+    tail = (1 - confidence) / 2
+    quantiles = [tail, 1 - tail]
+    return (
+        np.nanquantile(pillar_means, quantiles, axis=0),
+        np.nanquantile(category_means, quantiles, axis=0),
+        np.quantile(overall, quantiles)
+    )
+
+
+class OrgSurveyStore(SQLiteStore):
+    """SQLite store of organization surveys, their responses and running aggregates"""
+
+    def __init__(self, path, min_group_size=5, bootstrap_samples=1000, confidence=0.95):
+        super().__init__(path)
+        self.min_group_size = min_group_size
+        self.bootstrap_samples = bootstrap_samples
+        self.confidence = confidence
+        self._matrices = {}  # (code, digest) -> (last row id, code matrix)
+        self._intervals = {}  # (code, digest) -> (revision, intervals)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS org_surveys (
+                    code TEXT PRIMARY KEY,
+                    org_info TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS org_responses (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    code TEXT NOT NULL,
+                    respondent TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    codes BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    UNIQUE (code, respondent)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS org_responses_digest ON org_responses (code, digest, id)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS org_aggregates (
+                    code TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    respondents INTEGER NOT NULL,
+                    revision INTEGER NOT NULL,
+                    pillar_respondents TEXT NOT NULL,
+                    level_counts TEXT NOT NULL,
+                    PRIMARY KEY (code, digest)
+                )
+            """)
+
+    def create_survey(self, org_info):
+        """Open a survey for an organization and return its invite code"""
+        code = new_survey_code()
+        with self._connect() as conn:
+            conn.execute("INSERT INTO org_surveys VALUES (?, ?, ?)", (code, json.dumps(org_info), time.time()))
+        return code
+
+    def survey(self, code):
+        """Organization profile the survey was opened with, or None for an unknown code"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT org_info FROM org_surveys WHERE code = ?", (code,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _apply(self, conn, code, digest, engine, row, sign):
+        aggregate = conn.execute(
+            "SELECT respondents, revision, pillar_respondents, level_counts FROM org_aggregates "
+            "WHERE code = ? AND digest = ?",
+            (code, digest)
+        ).fetchone()
+        if aggregate:
+            respondents, revision = aggregate[0], aggregate[1]
+            pillar_respondents = np.array(json.loads(aggregate[2]), dtype=np.int64)
+            level_counts = np.array(json.loads(aggregate[3]), dtype=np.int64)
+        else:
+            respondents, revision = 0, 0
+            pillar_respondents = np.zeros(len(engine.pillars), dtype=np.int64)
+            level_counts = np.zeros((engine.n_questions, len(SLIDER_LEVELS)), dtype=np.int64)
+        answered = np.flatnonzero(row >= 0)
+        level_counts[answered, row[answered]] += sign
+        pillar_respondents[np.unique(engine.question_pillar[answered])] += sign
+        conn.execute(
+            "INSERT OR REPLACE INTO org_aggregates VALUES (?, ?, ?, ?, ?, ?)",
+            (code, digest, respondents + sign, revision + 1,
+             json.dumps(pillar_respondents.tolist()), json.dumps(level_counts.tolist()))
+        )
+
+    def add_response(self, code, respondent, digest, engine, codes):
+        """Store one respondent's answer codes and fold them into the aggregate
+
+        A respondent already in the survey has their earlier response backed out
+        of its aggregate first. Responses to an older question bank can't be
+        scored any more and are simply replaced.
+        """
+        row = np.frombuffer(bytes(codes), dtype=np.int8)
+        if len(row) != engine.n_questions:
+            raise ValueError(f"expected {engine.n_questions} answer codes, got {len(row)}")
+        with self._connect() as conn:
+            previous = conn.execute(
+                "SELECT id, digest, codes FROM org_responses WHERE code = ? AND respondent = ?", (code, respondent)
+            ).fetchone()
+            if previous:
+                conn.execute("DELETE FROM org_responses WHERE id = ?", (previous[0],))
+                if previous[1] == digest:
+                    self._apply(conn, code, digest, engine, np.frombuffer(previous[2], dtype=np.int8), -1)
+            conn.execute(
+                "INSERT INTO org_responses (code, respondent, digest, codes, created_at) VALUES (?, ?, ?, ?, ?)",
+                (code, respondent, digest, row.tobytes(), time.time())
+            )
+            self._apply(conn, code, digest, engine, row, 1)
+
+    def _code_matrix(self, conn, code, digest, respondents):
+        """N×Q code matrix of a survey, reading only rows added since the last call"""
+        key = (code, digest)
+        with self._lock:
+            last_id, matrix = self._matrices.get(key, (0, None))
+        rows = conn.execute(
+            "SELECT id, codes FROM org_responses WHERE code = ? AND digest = ? AND id > ? ORDER BY id",
+            (code, digest, last_id)
+        ).fetchall()
+        if rows:
+            added = np.frombuffer(b"".join(codes for _, codes in rows), dtype=np.int8).reshape(len(rows), -1)
+            matrix = added if matrix is None else np.concatenate([matrix, added])
+            last_id = rows[-1][0]
+        if matrix is None or len(matrix) != respondents:
+            # A respondent replaced their answers: the old row is gone, so reload everything
+            rows = conn.execute(
+                "SELECT id, codes FROM org_responses WHERE code = ? AND digest = ? ORDER BY id", (code, digest)
+            ).fetchall()
+            matrix = np.frombuffer(b"".join(codes for _, codes in rows), dtype=np.int8).reshape(len(rows), -1)
+            last_id = rows[-1][0] if rows else 0
+        with self._lock:
+            self._matrices[key] = (last_id, matrix)
+        return matrix
+
+    def _bootstrap(self, conn, code, digest, engine, respondents, revision):
+        key = (code, digest)
+        with self._lock:
+            cached = self._intervals.get(key)
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+        result = engine.score(self._code_matrix(conn, code, digest, respondents))
+        # Seeded by revision so every process and rerun shows the same bounds
+        bounds = bootstrap_intervals(result, self.bootstrap_samples, self.confidence, seed=revision)
+        with self._lock:
+            self._intervals[key] = (revision, bounds)
+        return bounds
+
+    def results(self, code, digest, engine):
+        """Pooled averages, intervals and distributions for a survey, or None before any response
+
+        Below ``min_group_size`` respondents only the respondent count is
+        returned (``visible`` is False).
+        """
+        with self._connect() as conn:
+            aggregate = conn.execute(
+                "SELECT respondents, revision, pillar_respondents, level_counts FROM org_aggregates "
+                "WHERE code = ? AND digest = ?",
+                (code, digest)
+            ).fetchone()
+            if not aggregate or not aggregate[0]:
+                return None
+            respondents, revision = aggregate[0], aggregate[1]
+            if respondents < self.min_group_size:
+                return OrgResults(respondents, False, {}, None, {}, {}, {}, {}, {}, self.confidence)
+            pillar_bounds, category_bounds, overall_bounds = self._bootstrap(
+                conn, code, digest, engine, respondents, revision
+            )
+
+        pillar_respondents = np.array(json.loads(aggregate[2]))
+        level_counts = np.array(json.loads(aggregate[3]), dtype=np.float64)
+        question_counts = level_counts.sum(axis=1)
+        question_sums = level_counts @ np.arange(len(SLIDER_LEVELS))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            question_means = question_sums / question_counts
+            pillar_means = (question_sums @ engine.pillar_matrix) / (question_counts @ engine.pillar_matrix)
+            category_means = (question_sums @ engine.category_matrix) / (question_counts @ engine.category_matrix)
+        category_means = np.nan_to_num(category_means)
+
+        def bounds(values, i):
+            return (round(float(values[0, i]), 2), round(float(values[1, i]), 2))
+
+        avg_scores = {category: round(float(category_means[i]), 2) for i, category in enumerate(engine.categories)}
+        overall_score = round(sum(avg_scores.values()) / len(avg_scores), 2)
+        intervals = {category: bounds(category_bounds, i) for i, category in enumerate(engine.categories)}
+        intervals["Overall"] = (round(float(overall_bounds[0]), 2), round(float(overall_bounds[1]), 2))
+        visible = [i for i, count in enumerate(pillar_respondents) if count >= self.min_group_size]
+        pillar_scores, pillar_levels = {}, {}
+        for i in visible:
+            pillar = engine.pillars[i]
+            pillar_scores[pillar] = round(float(pillar_means[i]), 2)
+            intervals[pillar] = bounds(pillar_bounds, i)
+            pillar_levels[pillar] = [int(count) for count in level_counts[engine.question_pillar == i].sum(axis=0)]
+        visible_questions = np.isin(engine.question_pillar, visible) & (question_counts > 0)
+        return OrgResults(
+            respondents, True, avg_scores, overall_score, pillar_scores, intervals,
+            {engine.pillars[i]: int(pillar_respondents[i]) for i in visible},
+            pillar_levels,
+            {qid: round(float(question_means[i]), 1)
+             for i, qid in enumerate(engine.question_ids) if visible_questions[i]},
+            self.confidence
+        )
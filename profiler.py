@@ -0,0 +1,156 @@
+"""Opt-in profiling of single script reruns.
+
+``RerunProfiler.profile(page, session)`` wraps a block in one of two profilers:
+
+* ``sample`` (default): a background thread records the stack of the profiled
+  thread every ``interval`` seconds and writes them as collapsed stacks
+  (``frame;frame;frame count`` per line), the input format of flamegraph.pl,
+  speedscope and inferno. Overhead is bounded by the sampling rate.
+* ``cprofile``: deterministic ``cProfile`` stats in the ``pstats`` format read
+  by snakeviz, gprof2dot and flameprof. Exact call counts, higher overhead.
+
+Each profile goes to its own file named after the time, page and session.
+After every write the oldest files are deleted until the directory is back
+under ``max_bytes``.
+"""
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+MODES = ("sample", "cprofile")
+SUFFIXES = {"sample": ".folded", "cprofile": ".prof"}
+
+
+class ProfilerConfigError(ValueError):
+    """Unknown profiling mode"""
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})"
+
+
+class StackSampler:
+    """Collects collapsed stacks of one thread from a daemon sampling thread"""
+
+    def __init__(self, thread_id, interval=0.005, root_file=None):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.root_file = root_file
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rerun-sampler", daemon=True)
+
+    def _stack(self, frame):
+        frames = []
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+        frames.reverse()
+        if self.root_file:
+            # Drop the Streamlit runner frames above the app script
+            for index, candidate in enumerate(frames):
+                if candidate.f_code.co_filename == self.root_file:
+                    frames = frames[index:]
+                    break
+        return ";".join(_frame_label(f) for f in frames)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[self._stack(frame)] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class RerunProfiler:
+    """Writes one profile file per profiled block into a size-capped directory"""
+
+    def __init__(self, directory, max_bytes=50 * 1024 * 1024, interval=0.005, root_file=None):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.root_file = root_file
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, mode, page, session):
+        tag = "-".join(re.sub(r"[^A-Za-z0-9_]+", "_", str(part)) for part in (page, session))
+        stamp = time.strftime("%Y%m%dT%H%M%S") + f"{time.time() % 1:.3f}"[1:]
+        return self.directory / f"{stamp}-{tag}{SUFFIXES[mode]}"
+
+    @contextmanager
+    def profile(self, page, session, mode="sample"):
+        """Profile the block; the file is written even if the block raises (e.g. st.rerun)"""
+        if mode not in MODES:
+            raise ProfilerConfigError(f"unknown profiling mode {mode!r}; expected one of {', '.join(MODES)}")
+        path = self._path(mode, page, session)
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield path
+            finally:
+                profiler.disable()
+                self._write(path, profiler.dump_stats)
+        else:
+            sampler = StackSampler(threading.get_ident(), self.interval, self.root_file)
+            sampler.start()
+            try:
+                yield path
+            finally:
+                sampler.stop()
+                self._write(path, lambda tmp: Path(tmp).write_text(sampler.folded(), encoding="utf-8"))
+
+    def _write(self, path, dump):
+        tmp = path.with_name(path.name + ".tmp")
+        dump(tmp)
+        os.replace(tmp, path)
+        self.rotate(keep=path)
+
+    def _files(self):
+        """(mtime, size, path) of every profile in the directory"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(tuple(SUFFIXES.values())):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # rotated away by another process
+                files.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        return files
+
+    def rotate(self, keep=None):
+        """Delete the oldest profiles (never ``keep``) until the directory fits in max_bytes"""
+        with self._lock:
+            files = self._files()
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def recent(self, limit=20):
+        """(path, size) of the newest profiles, newest first"""
+        return [(path, size) for _, size, path in sorted(self._files(), reverse=True)[:limit]]
@@ -0,0 +1,125 @@
+"""Pulse-survey history with daily, weekly and monthly rollups.
+
+Every completed assessment in an organization survey is a pulse entry with a
+timestamp and its category, overall and pillar scores. Recording an entry
+also adds it to three rollup rows, one per granularity, keyed by the start
+date (UTC) of the day, ISO week or month it falls in. Each rollup row holds
+per-score counts and totals, so its averages are a division away.
+
+Writing touches the entry plus three rollup rows, and a trend reads the latest
+``limit`` rollup rows of one granularity by primary key. Neither depends on
+how many pulses an organization has run.
+"""
+import json
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from sqlite_store import SQLiteStore
+
+GRANULARITIES = ("day", "week", "month")
+
+PulsePeriod = namedtuple("PulsePeriod", ["period", "count", "means"])
+
+
+class PulseConfigError(ValueError):
+    """Unknown rollup granularity"""
+
+
+def period_start(timestamp, granularity):
+    """ISO date of the UTC day, week (Monday) or month containing timestamp"""
+    day = datetime.fromtimestamp(timestamp, timezone.utc).date()
+    if granularity == "day":
+        return day.isoformat()
+    if granularity == "week":
+        return (day - timedelta(days=day.weekday())).isoformat()
+    if granularity == "month":
+        return day.replace(day=1).isoformat()
+    raise PulseConfigError(f"unknown granularity {granularity!r}; expected one of {', '.join(GRANULARITIES)}")
+
+
+class PulseStore(SQLiteStore):
+    """SQLite store of pulse entries and their incrementally maintained rollups"""
+
+    def __init__(self, path, min_count=1):
+        super().__init__(path)
+        self.min_count = min_count
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pulse_entries (
+                    id TEXT PRIMARY KEY,
+                    org_key TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    scores TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pulse_rollups (
+                    org_key TEXT NOT NULL,
+                    granularity TEXT NOT NULL,
+                    period TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    counts TEXT NOT NULL,
+                    totals TEXT NOT NULL,
+                    PRIMARY KEY (org_key, granularity, period)
+                )
+            """)
+
+    def _apply(self, conn, org_key, created_at, scores, sign):
+        for granularity in GRANULARITIES:
+            period = period_start(created_at, granularity)
+            row = conn.execute(
+                "SELECT count, counts, totals FROM pulse_rollups WHERE org_key = ? AND granularity = ? AND period = ?",
+                (org_key, granularity, period)
+            ).fetchone()
+            count, counts, totals = (row[0], json.loads(row[1]), json.loads(row[2])) if row else (0, {}, {})
+            for name, score in scores.items():
+                counts[name] = counts.get(name, 0) + sign
+                totals[name] = totals.get(name, 0.0) + sign * score
+                if counts[name] <= 0:
+                    del counts[name], totals[name]
+            conn.execute(
+                "INSERT OR REPLACE INTO pulse_rollups VALUES (?, ?, ?, ?, ?, ?)",
+                (org_key, granularity, period, max(0, count + sign), json.dumps(counts), json.dumps(totals))
+            )
+
+    def record(self, entry_id, org_key, scores, created_at):
+        """Store a pulse entry and add it to its day, week and month rollups
+
+        ``scores`` maps score names (categories, "Overall", pillars) to values.
+        Recording the same ID again replaces the earlier entry, backing it out
+        of its rollups first; the original timestamp is kept.
+        """
+        with self._connect() as conn:
+            previous = conn.execute(
+                "SELECT org_key, created_at, scores FROM pulse_entries WHERE id = ?", (entry_id,)
+            ).fetchone()
+            if previous:
+                self._apply(conn, previous[0], previous[1], json.loads(previous[2]), -1)
+                created_at = previous[1]
+            conn.execute(
+                "INSERT OR REPLACE INTO pulse_entries VALUES (?, ?, ?, ?)",
+                (entry_id, org_key, created_at, json.dumps(scores))
+            )
+            self._apply(conn, org_key, created_at, scores, 1)
+
+    def trend(self, org_key, granularity, limit=12):
+        """Latest ``limit`` periods with at least min_count entries, oldest first
+
+        Periods below min_count are skipped rather than shown, so a trend never
+        reveals a small group's scores.
+        """
+        if granularity not in GRANULARITIES:
+            raise PulseConfigError(f"unknown granularity {granularity!r}; expected one of {', '.join(GRANULARITIES)}")
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT period, count, counts, totals FROM pulse_rollups "
+                "WHERE org_key = ? AND granularity = ? AND count >= ? ORDER BY period DESC LIMIT ?",
+                (org_key, granularity, self.min_count, limit)
+            ).fetchall()
+        periods = []
+        for period, count, counts, totals in reversed(rows):
+            counts, totals = json.loads(counts), json.loads(totals)
+            periods.append(PulsePeriod(period, count, {
+                name: round(totals[name] / counts[name], 2) for name in totals
+            }))
+        return periods
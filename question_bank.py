@@ -0,0 +1,232 @@
+"""Compiled question bank with validation and hot reload.
+
+``culture_questions.json`` is parsed once into an immutable ``QuestionBank``
+holding every index the app needs: ID→position, category→positions and the
+pillar→category lookup. Option lists are interned, so questions that share an
+answer scale share a single tuple. ``QuestionBankSource`` checks the file's
+mtime every few seconds. When the content hash changes it compiles a new bank
+and swaps it in with a single reference assignment; a file that fails
+validation is reported and the previous bank keeps serving.
+
+``SurveyResponses`` holds one respondent's answers positionally against a bank,
+one signed byte per question.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from array import array
+from pathlib import Path
+
+from culture_model import CATEGORIES, LEVEL_SCORE, SLIDER_LEVELS, pillar_map
+
+REQUIRED_FIELDS = ("id", "pillar", "question")
+UNANSWERED = -1
+
+
+class QuestionBankError(ValueError):
+    """The question bank file is missing, malformed or inconsistent"""
+
+
+class QuestionBank:
+    """Validated questions plus precomputed position lookups"""
+
+    def __init__(self, questions, digest=None):
+        if not isinstance(questions, list) or not questions:
+            raise QuestionBankError("Question bank must be a non-empty JSON list")
+        interned_options = {tuple(SLIDER_LEVELS): tuple(SLIDER_LEVELS)}
+        compiled = []
+        question_index = {}
+        for position, q in enumerate(questions):
+            if not isinstance(q, dict):
+                raise QuestionBankError(f"Question #{position + 1} is not a JSON object")
+            missing = [field for field in REQUIRED_FIELDS if not q.get(field)]
+            if missing:
+                raise QuestionBankError(f"Question #{position + 1} is missing {', '.join(missing)}")
+            if q['id'] in question_index:
+                raise QuestionBankError(f"Duplicate question ID {q['id']!r}")
+            if q['pillar'] not in pillar_map:
+                raise QuestionBankError(f"Question {q['id']} has unknown pillar {q['pillar']!r}")
+            options = tuple(q.get('options') or SLIDER_LEVELS)
+            unknown = [option for option in options if option not in SLIDER_LEVELS]
+            if unknown:
+                raise QuestionBankError(f"Question {q['id']} has unknown options {unknown}")
+            question_index[q['id']] = position
+            compiled.append(dict(q, options=interned_options.setdefault(options, options)))
+
+        self.digest = digest
+        self.questions = tuple(compiled)
+        self.question_ids = tuple(q['id'] for q in compiled)
+        self.question_index = question_index
+        self.pillar_category = {q['pillar']: pillar_map[q['pillar']] for q in compiled}
+        self.question_category = array("b", (CATEGORIES.index(pillar_map[q['pillar']]) for q in compiled))
+        self.category_indices = {
+            category: array("H", (i for i, q in enumerate(compiled) if pillar_map[q['pillar']] == category))
+            for category in CATEGORIES
+        }
+        self.by_category = {
+            category: tuple(compiled[i] for i in indices) for category, indices in self.category_indices.items()
+        }
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __getitem__(self, question_id):
+        return self.questions[self.question_index[question_id]]
+
+    def category_of(self, question_id):
+        """Category of one question"""
+        return CATEGORIES[self.question_category[self.question_index[question_id]]]
+
+
+def compile_question_bank(data):
+    """QuestionBank for raw JSON bytes; the digest identifies the content"""
+    digest = hashlib.sha256(data).hexdigest()
+    try:
+        questions = json.loads(data)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise QuestionBankError(f"Invalid JSON in question bank: {e}") from e
+    return QuestionBank(questions, digest)
+
+
+def load_question_bank(path):
+    """Read and compile a question bank file"""
+    try:
+        data = Path(path).read_bytes()
+    except OSError as e:
+        raise QuestionBankError(f"Cannot read question bank {path}: {e}") from e
+    return compile_question_bank(data)
+
+
+class QuestionBankSource:
+    """The current QuestionBank for a file, recompiled when the file changes"""
+
+    def __init__(self, path, check_interval=2.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._signature = self._stat()
+        self._bank = load_question_bank(self.path)
+        self._checked_at = time.monotonic()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def current(self):
+        """Latest valid bank; stats the file at most once per check_interval"""
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.reload()
+        return self._bank
+
+    def reload(self):
+        """Recompile if the file changed; returns True when a new bank was swapped in"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            signature = self._stat()
+            if signature is None or signature == self._signature:
+                return False
+            try:
+                data = self.path.read_bytes()
+                if hashlib.sha256(data).hexdigest() == self._bank.digest:
+                    self._signature = signature
+                    return False
+                bank = compile_question_bank(data)
+            except OSError as e:
+                self.last_error = str(e)
+                return False
+            except QuestionBankError as e:
+                # Keep serving the last good bank until the file changes again
+                self._signature = signature
+                self.last_error = str(e)
+                return False
+            self._signature = signature
+            self._bank = bank
+            self.last_error = None
+            return True
+
+
+class SurveyResponses:
+    """One respondent's answers as level codes in question-bank order
+
+    Answers live in an ``array('b')`` with one byte per question (the index in
+    ``SLIDER_LEVELS``, or -1 when unanswered); labels are only produced for
+    display, the report prompt and storage.
+    """
+
+    __slots__ = ("question_ids", "question_index", "codes", "answered")
+
+    def __init__(self, bank):
+        self.question_ids = bank.question_ids
+        self.question_index = bank.question_index
+        self.codes = array("b", [UNANSWERED]) * len(bank)
+        self.answered = 0
+
+    @classmethod
+    def from_dict(cls, bank, answers):
+        """Responses from {question_id: label or code}; unknown IDs are dropped"""
+        responses = cls(bank)
+        for question_id, answer in answers.items():
+            if question_id in bank.question_index:
+                code = answer if isinstance(answer, int) else LEVEL_SCORE.get(answer)
+                if code is not None and 0 <= code < len(SLIDER_LEVELS):
+                    responses.set(question_id, code)
+        return responses
+
+    def __len__(self):
+        return self.answered
+
+    def __contains__(self, question_id):
+        return self.code(question_id) != UNANSWERED
+
+    def __eq__(self, other):
+        if not isinstance(other, SurveyResponses):
+            return NotImplemented
+        return self.question_ids == other.question_ids and self.codes == other.codes
+
+    def code(self, question_id):
+        """Answer code for a question, -1 when unanswered"""
+        index = self.question_index.get(question_id)
+        return UNANSWERED if index is None else self.codes[index]
+
+    def label(self, question_id):
+        """Answer label for a question, None when unanswered"""
+        code = self.code(question_id)
+        return None if code == UNANSWERED else SLIDER_LEVELS[code]
+
+    def set(self, question_id, code):
+        index = self.question_index[question_id]
+        if self.codes[index] == UNANSWERED:
+            self.answered += 1
+        self.codes[index] = code
+
+    def level_counts(self):
+        """How many answers fall on each level of SLIDER_LEVELS"""
+        return [self.codes.count(code) for code in range(len(SLIDER_LEVELS))]
+
+    def unanswered(self):
+        """IDs of the questions without an answer"""
+        return [qid for qid, code in zip(self.question_ids, self.codes) if code == UNANSWERED]
+
+    def to_dict(self):
+        """{question_id: label} for every answered question"""
+        return {qid: SLIDER_LEVELS[code] for qid, code in zip(self.question_ids, self.codes) if code != UNANSWERED}
+
+    def copy(self):
+        responses = SurveyResponses.__new__(SurveyResponses)
+        responses.question_ids = self.question_ids
+        responses.question_index = self.question_index
+        responses.codes = array("b", self.codes)
+        responses.answered = self.answered
+        return responses
+
+    def rebase(self, bank):
+        """The same answers laid out for another version of the question bank"""
+        if bank.question_ids == self.question_ids:
+            return self
+        return SurveyResponses.from_dict(bank, self.to_dict())
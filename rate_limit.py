@@ -0,0 +1,204 @@
+"""Cross-process rate limiting and request coalescing for the chat API.
+
+Every Streamlit server process on a host shares one SQLite file:
+
+* ``RateLimiter`` is a token bucket. Callers queue for tokens in arrival order,
+  and only the head of the queue may take one, so a burst from one session
+  cannot starve the others. The queue lives in the database, which lets any
+  process show a session its position.
+* ``SingleFlight`` hands out a lease per prompt hash. The first caller makes
+  the request; concurrent callers for the same key wait for the lease to be
+  released and then read the result from the shared report cache.
+"""
+import os
+import threading
+import time
+import uuid
+
+from sqlite_store import SQLiteStore
+
+
+class RateLimitTimeout(TimeoutError):
+    """No token became available before the caller's deadline"""
+
+
+class _SQLiteState(SQLiteStore):
+    """Schema created under the write lock; writes use BEGIN IMMEDIATE for atomic read-modify-write"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        with self._transaction() as conn:
+            self._create(conn)
+
+    def _create(self, conn):
+        raise NotImplementedError
+
+
+class RateLimiter(_SQLiteState):
+    """Token bucket of ``rate`` requests per second with bursts of up to ``burst``"""
+
+    def __init__(self, path, rate, burst, name="cohere", poll_interval=0.25, stale_after=15.0):
+        self.rate = rate
+        self.burst = max(1.0, float(burst))
+        self.name = name
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        super().__init__(path)
+
+    def _create(self, conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_buckets (
+                name TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_waiters (
+                ticket INTEGER PRIMARY KEY AUTOINCREMENT,
+                bucket TEXT NOT NULL,
+                owner TEXT NOT NULL,
+                heartbeat REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS rate_waiters_owner ON rate_waiters (bucket, owner)")
+
+    def _take_token(self, conn, now):
+        """Refill the bucket, take a token if one is available; returns seconds to wait otherwise"""
+        row = conn.execute("SELECT tokens, updated_at FROM rate_buckets WHERE name = ?", (self.name,)).fetchone()
+        tokens, updated_at = row if row else (self.burst, now)
+        tokens = min(self.burst, tokens + max(0.0, now - updated_at) * self.rate)
+        wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+        if not wait:
+            tokens -= 1
+        conn.execute("INSERT OR REPLACE INTO rate_buckets VALUES (?, ?, ?)", (self.name, tokens, now))
+        return wait
+
+    def acquire(self, owner="", timeout=None):
+        """Block until this caller reaches the head of the queue and a token is free
+
+        ``owner`` labels the waiter (e.g. the report cache key) so that
+        ``queue_position`` can find it.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._transaction() as conn:
+            ticket = conn.execute(
+                "INSERT INTO rate_waiters (bucket, owner, heartbeat) VALUES (?, ?, ?)",
+                (self.name, owner, time.time())
+            ).lastrowid
+        try:
+            while True:
+                with self._transaction() as conn:
+                    now = time.time()
+                    # Waiters of crashed processes stop heartbeating and drop out of the queue
+                    conn.execute(
+                        "DELETE FROM rate_waiters WHERE bucket = ? AND heartbeat < ?", (self.name, now - self.stale_after)
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO rate_waiters VALUES (?, ?, ?, ?)", (ticket, self.name, owner, now)
+                    )
+                    ahead = conn.execute(
+                        "SELECT COUNT(*) FROM rate_waiters WHERE bucket = ? AND ticket < ?", (self.name, ticket)
+                    ).fetchone()[0]
+                    if ahead:
+                        # Can't be served before the callers ahead of us, at one per 1/rate seconds
+                        wait = min(self.poll_interval, ahead / self.rate)
+                    else:
+                        wait = self._take_token(conn, now)
+                    if not wait:
+                        conn.execute("DELETE FROM rate_waiters WHERE ticket = ?", (ticket,))
+                        ticket = None
+                        return
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    raise RateLimitTimeout(f"no {self.name} request slot within {timeout}s")
+                time.sleep(min(wait, self.stale_after / 3))
+        finally:
+            if ticket is not None:
+                with self._transaction() as conn:
+                    conn.execute("DELETE FROM rate_waiters WHERE ticket = ?", (ticket,))
+
+    def queue_position(self, owner):
+        """1-based queue position of owner's earliest waiting request, 0 if not waiting"""
+        with self._connect() as conn:
+            live = time.time() - self.stale_after
+            ticket = conn.execute(
+                "SELECT MIN(ticket) FROM rate_waiters WHERE bucket = ? AND owner = ? AND heartbeat >= ?",
+                (self.name, owner, live)
+            ).fetchone()[0]
+            if ticket is None:
+                return 0
+            ahead = conn.execute(
+                "SELECT COUNT(*) FROM rate_waiters WHERE bucket = ? AND ticket < ? AND heartbeat >= ?",
+                (self.name, ticket, live)
+            ).fetchone()[0]
+        return ahead + 1
+
+
+class SingleFlight(_SQLiteState):
+    """Per-key leases so that only one process at a time generates a given report"""
+
+    def __init__(self, path, lease_seconds=300.0):
+        self.lease_seconds = lease_seconds
+        super().__init__(path)
+
+    def _create(self, conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS inflight_requests (
+                key TEXT PRIMARY KEY,
+                holder TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+
+    def claim(self, key):
+        """Lease token if key was free (or its lease expired), otherwise None"""
+        holder = f"{os.getpid()}:{threading.get_ident()}:{uuid.uuid4().hex}"
+        with self._transaction() as conn:
+            now = time.time()
+            row = conn.execute("SELECT expires_at FROM inflight_requests WHERE key = ?", (key,)).fetchone()
+            if row and row[0] > now:
+                return None
+            conn.execute(
+                "INSERT OR REPLACE INTO inflight_requests VALUES (?, ?, ?)", (key, holder, now + self.lease_seconds)
+            )
+        return holder
+
+    def refresh(self, key, holder):
+        """Extend a lease that is still held"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE inflight_requests SET expires_at = ? WHERE key = ? AND holder = ?",
+                (time.time() + self.lease_seconds, key, holder)
+            )
+
+    def release(self, key, holder):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM inflight_requests WHERE key = ? AND holder = ?", (key, holder))
+
+
+def coalesced(flights, cache, key, produce, poll_interval=0.5):
+    """Yield the text chunks of ``produce()``, or the cached result of an identical in-flight request
+
+    The holder stores the full text in ``cache`` before releasing its lease, so
+    a waiter that claims the lease afterwards finds the report there.
+    """
+    holder = flights.claim(key)
+    while holder is None:
+        time.sleep(poll_interval)
+        holder = flights.claim(key)
+    try:
+        cached = cache.get(key, count=False)
+        if cached:
+            yield cached.text
+            return
+        chunks = []
+        refreshed_at = time.monotonic()
+        for chunk in produce():
+            chunks.append(chunk)
+            if time.monotonic() - refreshed_at > flights.lease_seconds / 3:
+                flights.refresh(key, holder)
+                refreshed_at = time.monotonic()
+            yield chunk
+        cache.put(key, "".join(chunks))
+    finally:
+        flights.release(key, holder)
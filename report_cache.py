@@ -0,0 +1,112 @@
+"""Persistent, content-addressed cache for AI-generated culture reports.
+
+Reports are keyed on a hash of the normalized prompt plus the model settings and
+stored in a local SQLite file, so every session and every server process shares
+the same entries and they survive restarts. The cache is bounded by total size
+(least-recently-used entries are evicted first) and entries expire after a TTL.
+"""
+import hashlib
+import json
+import time
+from collections import namedtuple
+
+from sqlite_store import SQLiteStore
+
+CachedReport = namedtuple("CachedReport", ["text", "created_at"])
+
+
+def normalize_prompt(prompt):
+    """Collapse whitespace so cosmetic prompt differences share a cache entry"""
+    lines = (" ".join(line.split()) for line in prompt.strip().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def report_cache_key(prompt, model, temperature):
+    """Content hash identifying one generation request"""
+    payload = json.dumps(
+        {
+            "prompt": normalize_prompt(prompt),
+            "model": model,
+            "temperature": round(float(temperature), 3),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReportCache(SQLiteStore):
+    """SQLite-backed report store with a size cap, LRU eviction and TTL expiry"""
+
+    def __init__(self, path, max_bytes=50 * 1024 * 1024, ttl_seconds=7 * 24 * 3600):
+        super().__init__(path)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS reports (
+                    key TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS reports_last_access ON reports (last_access)")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO cache_stats VALUES ('hits', 0), ('misses', 0)")
+
+    def get(self, key, count=True):
+        """Return the cached report for key, or None on a miss
+
+        Internal lookups (lease holders re-checking, cached sections) pass
+        ``count=False`` so the hit/miss counters only reflect report requests.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT text, created_at FROM reports WHERE key = ?", (key,)).fetchone()
+            if row and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM reports WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                if count:
+                    conn.execute("UPDATE cache_stats SET value = value + 1 WHERE name = 'misses'")
+                return None
+            conn.execute("UPDATE reports SET last_access = ? WHERE key = ?", (now, key))
+            if count:
+                conn.execute("UPDATE cache_stats SET value = value + 1 WHERE name = 'hits'")
+            return CachedReport(row[0], row[1])
+
+    def put(self, key, text):
+        """Store a finished report and evict old entries beyond the size cap"""
+        now = time.time()
+        size = len(text.encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO reports (key, text, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, text, size, now, now),
+            )
+            if self.ttl_seconds:
+                conn.execute("DELETE FROM reports WHERE created_at < ?", (now - self.ttl_seconds,))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM reports").fetchone()[0]
+            if total > self.max_bytes:
+                rows = conn.execute("SELECT key, size FROM reports ORDER BY last_access").fetchall()
+                for old_key, old_size in rows:
+                    if total <= self.max_bytes or old_key == key:
+                        break
+                    conn.execute("DELETE FROM reports WHERE key = ?", (old_key,))
+                    total -= old_size
+
+    def stats(self):
+        """Hit/miss counters and current footprint, shared across processes"""
+        with self._connect() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM cache_stats").fetchall())
+            entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM reports").fetchone()
+        lookups = counters.get("hits", 0) + counters.get("misses", 0)
+        return {
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+            "hit_rate": counters.get("hits", 0) / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": total,
+        }
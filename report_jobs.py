@@ -0,0 +1,136 @@
+"""Background report generation so Streamlit reruns never block on the LLM.
+
+Jobs run on a bounded thread pool owned by the server process. Each job is
+identified by an opaque ID that sessions keep in ``st.session_state`` and poll
+for progress; the text generated so far is visible while a job is running.
+Jobs are deduplicated on their content key, so a session that reruns (or a
+second session asking for the same report) attaches to the existing job
+instead of starting a new one.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class ReportJob:
+    """Mutable job record; read it through ReportJobQueue.get"""
+
+    def __init__(self, key):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.status = QUEUED
+        self.chunks = []
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def text(self):
+        return "".join(self.chunks)
+
+
+class JobSnapshot:
+    """Consistent, read-only copy of a job's state"""
+
+    def __init__(self, job, position):
+        self.id = job.id
+        self.key = job.key
+        self.status = job.status
+        self.text = job.text
+        self.error = job.error
+        self.created_at = job.created_at
+        self.started_at = job.started_at
+        self.finished_at = job.finished_at
+        self.queue_position = position
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+
+class ReportJobQueue:
+    """Bounded worker pool running report generations in the background"""
+
+    def __init__(self, max_workers=8, max_finished=512):
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-job")
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._by_key = {}
+
+    def submit(self, key, produce, on_done=None):
+        """Start generating the report for key unless a live job already exists
+
+        ``produce`` is a zero-argument callable returning an iterable of text
+        chunks; ``on_done`` receives the full text once generation succeeds.
+        Returns the ID of the new or existing job.
+        """
+        with self._lock:
+            existing = self._jobs.get(self._by_key.get(key))
+            if existing is not None and existing.status != FAILED:
+                return existing.id
+            job = ReportJob(key)
+            self._jobs[job.id] = job
+            self._by_key[key] = job.id
+            self._prune()
+        self._executor.submit(self._run, job, produce, on_done)
+        return job.id
+
+    def get(self, job_id):
+        """Snapshot of a job, or None if it is unknown or has been pruned"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            position = 0
+            if job.status == QUEUED:
+                for other in self._jobs.values():
+                    if other is job:
+                        break
+                    if other.status == QUEUED:
+                        position += 1
+            return JobSnapshot(job, position + 1 if job.status == QUEUED else 0)
+
+    def stats(self):
+        """Number of jobs currently in each state"""
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def _run(self, job, produce, on_done):
+        with self._lock:
+            job.status = RUNNING
+            job.started_at = time.time()
+        try:
+            for chunk in produce():
+                with self._lock:
+                    job.chunks.append(chunk)
+            text = job.text
+            if on_done is not None:
+                on_done(text)
+        except Exception as e:
+            with self._lock:
+                job.status = FAILED
+                job.error = e
+                job.finished_at = time.time()
+            return
+        with self._lock:
+            job.status = DONE
+            job.finished_at = time.time()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in (DONE, FAILED)]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            job = self._jobs.pop(job_id)
+            if self._by_key.get(job.key) == job_id:
+                del self._by_key[job.key]
@@ -0,0 +1,142 @@
+"""Reuse of finished reports for organizations with near-identical results.
+
+Every generated report is stored with the organization's profile and a
+quantized score vector. The profile holds the categorical ``org_info`` fields
+(industry, size band, work model, culture focus and challenges) and must match
+exactly, because those fields shape the whole report. The vector holds the
+category averages and pillar averages in 0.1-point steps as int8 codes.
+
+A lookup loads the vectors of one profile into a numpy matrix, kept per
+process until the profile gains rows, and finds the stored report with the
+smallest largest per-score difference (Chebyshev distance). If that distance is
+within ``max_distance`` points, the report is served after light adaptation:
+the stored organization's name and location are replaced with the current one,
+and a note says it was adapted.
+"""
+import json
+import threading
+import time
+from array import array
+from collections import namedtuple
+
+from sqlite_store import SQLiteStore
+
+QUANTUM = 0.1  # score points per vector step
+
+LibraryMatch = namedtuple("LibraryMatch", ["text", "distance", "org_name", "location", "created_at"])
+
+
+def profile_key(org):
+    """Categorical org_info fields that must match for a report to be reused"""
+    return json.dumps([
+        org.get("industry") or "",
+        org.get("size") or "",
+        org.get("remote_work") or "",
+        sorted(org.get("culture_focus") or []),
+        sorted(org.get("current_challenges") or []),
+    ], ensure_ascii=False)
+
+
+def feature_vector(avg_scores, pillar_scores):
+    """Category then pillar averages, in name order, as int8 codes of QUANTUM points"""
+    values = [avg_scores[name] for name in sorted(avg_scores)] + [pillar_scores[name] for name in sorted(pillar_scores)]
+    return array("b", (round(value / QUANTUM) for value in values))
+
+
+def adapt_report(match, org, max_distance):
+    """Stored report text rewritten for the current organization"""
+    text = match.text
+    for old, new in ((match.org_name, org.get("name")), (match.location, org.get("location"))):
+        if old and new and old != new:
+            text = text.replace(old, new)
+    note = (
+        f"_Adapted from a report for an organization with the same profile and scores within "
+        f"{max_distance:g} points of yours._"
+    )
+    return f"{note}\n\n{text}"
+
+
+class ReportLibrary(SQLiteStore):
+    """SQLite store of generated reports with a per-profile nearest-neighbour index"""
+
+    def __init__(self, path, max_distance=0.1, max_entries=5000):
+        super().__init__(path)
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        self._index = {}  # profile -> (max id, row ids, vector matrix)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS report_library (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    report_key TEXT UNIQUE NOT NULL,
+                    profile TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    org_name TEXT NOT NULL,
+                    location TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS report_library_profile ON report_library (profile, id)")
+
+    def add(self, report_key, org, avg_scores, pillar_scores, text):
+        """Store a finished report; a report_key already in the library is ignored"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO report_library "
+                "(report_key, profile, vector, org_name, location, text, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (report_key, profile_key(org), feature_vector(avg_scores, pillar_scores).tobytes(),
+                 org.get("name") or "", org.get("location") or "", text, time.time())
+            )
+            # Oldest reports go first once the library is full
+            conn.execute(
+                "DELETE FROM report_library WHERE id <= (SELECT MAX(id) FROM report_library) - ?", (self.max_entries,)
+            )
+
+    def _vectors(self, conn, profile, length):
+        """Row IDs and vector matrix of a profile, reloaded only when it has new rows"""
+        import numpy as np
+        max_id = conn.execute("SELECT MAX(id) FROM report_library WHERE profile = ?", (profile,)).fetchone()[0]
+        with self._lock:
+            cached = self._index.get(profile)
+            if cached is not None and cached[0] == max_id:
+                return cached[1], cached[2]
+        rows = conn.execute(
+            "SELECT id, vector FROM report_library WHERE profile = ? ORDER BY id", (profile,)
+        ).fetchall()
+        # Vectors from an older question bank with other pillars can't be compared
+        rows = [(row_id, vector) for row_id, vector in rows if len(vector) == length]
+        ids = np.array([row_id for row_id, _ in rows], dtype=np.int64)
+        matrix = np.frombuffer(b"".join(vector for _, vector in rows), dtype=np.int8).reshape(len(rows), length)
+        with self._lock:
+            self._index[profile] = (max_id, ids, matrix)
+        return ids, matrix
+
+    def nearest(self, org, avg_scores, pillar_scores):
+        """Closest stored report within max_distance, or None"""
+        import numpy as np
+        vector = feature_vector(avg_scores, pillar_scores)
+        query = np.frombuffer(vector.tobytes(), dtype=np.int8).astype(np.int16)
+        with self._connect() as conn:
+            ids, matrix = self._vectors(conn, profile_key(org), len(vector))
+            if not len(ids):
+                return None
+            distances = np.abs(matrix.astype(np.int16) - query).max(axis=1)
+            best = int(distances.argmin())
+            if distances[best] > round(self.max_distance / QUANTUM):
+                return None
+            row = conn.execute(
+                "SELECT text, org_name, location, created_at FROM report_library WHERE id = ?", (int(ids[best]),)
+            ).fetchone()
+        if row is None:
+            return None  # pruned since the index was loaded
+        text, org_name, location, created_at = row
+        return LibraryMatch(text, round(int(distances[best]) * QUANTUM, 2), org_name, location, created_at)
+
+    def stats(self):
+        with self._connect() as conn:
+            entries, profiles = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT profile) FROM report_library"
+            ).fetchone()
+        return {"entries": entries, "profiles": profiles}
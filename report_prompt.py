@@ -0,0 +1,197 @@
+"""Prompt construction for the AI-generated Culture Intelligence Report.
+
+The report can be requested either as one long generation (``build_report_prompt``)
+or as independent sections that are generated concurrently and stitched back
+together in order (``build_section_prompts``). Both share the same consultant
+persona, organization profile, scores and per-question answers.
+
+The static text is assembled once at import; a prompt only fills in the
+organization's values. Prompts are kept within an estimated input token budget:
+the answers of the strongest pillars lose their question text first, then
+whole pillars of answers go (strongest first), then the optional report
+sections. The persona, profile, scores and core sections are always sent.
+"""
+from functools import lru_cache
+
+from culture_model import SLIDER_LEVELS, get_score_interpretation, pillar_map
+
+REPORT_MODEL = "command-r-plus-08-2024"
+REPORT_TEMPERATURE = 0.7
+DEFAULT_MAX_PROMPT_TOKENS = 1400
+
+# (title, template, optional); optional sections are dropped, last first, to meet the budget
+REPORT_SECTIONS = [
+    ("Strategic Action Plan", """## STRATEGIC ACTION PLAN
+**Immediate Actions (0-30 days):** 3-5 high-impact, low-cost quick wins, with specific steps and responsible parties.
+**Short-term Initiatives (30-90 days):** 3-5 projects with timelines, resource needs and success metrics, aimed at the lowest-scoring pillars and weakest answers.
+**Long-term Strategy (90-365 days):** 2-3 transformational initiatives with change management considerations for sustainable culture change.
+""", False),
+    ("Recommended Tools & Resources", """## RECOMMENDED TOOLS & RESOURCES
+**HR Tech Stack:** specific platforms for the identified challenges (engagement, feedback, learning management).
+**Templates & Frameworks:** implementation templates, measurement frameworks and KPIs, industry best practices.
+**Training & Development:** specific training and leadership development programs, internal and external.
+""", True),
+    ("Success Metrics & KPIs", """## SUCCESS METRICS & KPIs
+**Culture Metrics:** measurable KPIs per pillar with baselines, targets, measurement frequency and methods.
+**ROI Indicators:** links to business outcomes (engagement, retention, productivity) and a cost-benefit framework.
+""", False),
+    ("Industry-Specific Considerations", """## INDUSTRY-SPECIFIC CONSIDERATIONS
+{industry}-specific insights: common culture challenges, industry benchmarks and best practices, regulatory/compliance considerations if applicable.
+""", False),
+    ("Risk Mitigation", """## RISK MITIGATION
+**Change Management Risks:** likely resistance points, mitigation strategies and communication plans.
+**Implementation Risks:** resource constraints, phased implementation and contingency plans.
+""", True),
+]
+
+PERSONA = """You are a senior Culture & People Analytics Consultant with 15+ years of experience transforming workplace culture at Fortune 500 companies and startups across industries.
+
+Based on the culture intelligence data below, provide a detailed strategic analysis and action plan. Ground recommendations in the specific pillar scores and answers.
+"""
+
+PROFILE_TEMPLATE = """
+## ORGANIZATION PROFILE
+🏢 {name} | Industry: {industry} | Size: {size} | Location: {location} | Years active: {years_active} | Work model: {remote_work}
+🎯 Cultural priorities: {focus}
+⚠️ Current challenges: {challenges}
+
+## CULTURE INTELLIGENCE SCORES (0-4)
+📊 Overall: {overall}
+{categories}
+"""
+
+ANSWERS_HEADER = (
+    "\n## ANSWERS BY PILLAR (pillar average: [answer] question; "
+    + ", ".join(f"{code}={level}" for code, level in enumerate(SLIDER_LEVELS))
+    + ")\n"
+)
+
+REPORT_STYLE = """
+FORMAT: Clear headings, bullet points, actionable language. Recommendations specific, measurable and time-bound. Relevant emojis for readability.
+TONE: Professional yet accessible, data-driven but human-centered, optimistic but realistic.
+"""
+
+SECTION_INSTRUCTIONS = """
+Write ONLY the report section below. Other sections are written separately, so add no introduction, score summary, conclusion or other section.
+
+"""
+
+
+def estimate_tokens(text):
+    """Conservative token estimate: about four UTF-8 bytes per token (emoji count extra)"""
+    return (len(text.encode("utf-8")) + 3) // 4
+
+
+def _scored(score):
+    return f"{score} ({get_score_interpretation(score)[0]})"
+
+
+def build_report_context(org, avg_scores, overall_score, pillar_scores=None):
+    """Consultant persona, organization profile and scores"""
+    categories = []
+    for category, score in avg_scores.items():
+        pillars = [
+            f"{pillar} {value}" for pillar, value in (pillar_scores or {}).items() if pillar_map.get(pillar) == category
+        ]
+        categories.append(f"- {category}: {_scored(score)}" + (f" · pillars: {', '.join(pillars)}" if pillars else ""))
+    return PERSONA + PROFILE_TEMPLATE.format(
+        name=org.get('name', 'N/A'),
+        industry=org.get('industry', 'N/A'),
+        size=org.get('size', 'N/A'),
+        location=org.get('location', 'N/A'),
+        years_active=org.get('years_active', 'N/A'),
+        remote_work=org.get('remote_work', 'N/A'),
+        focus=', '.join(org.get('culture_focus', [])) or 'None stated',
+        challenges=', '.join(org.get('current_challenges', [])) or 'None stated',
+        overall=_scored(overall_score),
+        categories="\n".join(categories)
+    )
+
+
+def _answer_lines(answers, pillar_scores, compact_pillars, dropped_pillars):
+    """One line per pillar, weakest first; compact pillars keep only their answer codes"""
+    by_pillar = {}
+    for pillar, question, code in answers:
+        by_pillar.setdefault(pillar, []).append((question, code))
+    order = sorted(by_pillar, key=lambda p: (pillar_scores.get(p, 0), p))
+    lines = []
+    for pillar in order:
+        if pillar in dropped_pillars:
+            continue
+        if pillar in compact_pillars:
+            items = " ".join(f"[{code}]" for _, code in by_pillar[pillar])
+        else:
+            items = " ".join(f"[{code}] {question}" for question, code in by_pillar[pillar])
+        lines.append(f"- {pillar} {pillar_scores.get(pillar, '')}: {items}")
+    return lines
+
+
+@lru_cache(maxsize=64)
+def _sections_text(industry, dropped_sections, section_title=None):
+    """Report section instructions, formatted once per industry and section choice"""
+    return "\n".join(
+        template.format(industry=industry)
+        for title, template, _ in REPORT_SECTIONS
+        if title not in dropped_sections and (section_title is None or title == section_title)
+    )
+
+
+def _fit_to_budget(build, answers, pillar_scores, max_tokens, sections=True):
+    """Apply the trimming steps in priority order until build(...) fits max_tokens"""
+    pillar_scores = pillar_scores or {}
+    strongest_first = sorted({p for p, _, _ in answers}, key=lambda p: (-pillar_scores.get(p, 0), p))
+    steps = [("compact", p) for p in strongest_first] + [("drop", p) for p in strongest_first]
+    if sections:
+        steps += [("section", title) for title, _, optional in reversed(REPORT_SECTIONS) if optional]
+    compact, dropped, dropped_sections = set(), set(), set()
+    prompt = build(compact, dropped, dropped_sections)
+    for kind, name in steps:
+        if not max_tokens or estimate_tokens(prompt) <= max_tokens:
+            break
+        {"compact": compact, "drop": dropped, "section": dropped_sections}[kind].add(name)
+        prompt = build(compact, dropped, dropped_sections)
+    return prompt
+
+
+def _answers_text(answers, pillar_scores, compact, dropped):
+    lines = _answer_lines(answers, pillar_scores or {}, compact, dropped)
+    return ANSWERS_HEADER + "\n".join(lines) + "\n" if lines else ""
+
+
+def build_report_prompt(org, avg_scores, overall_score, pillar_scores=None, answers=(),
+                        max_tokens=DEFAULT_MAX_PROMPT_TOKENS):
+    """Single prompt asking for the whole report in one generation
+
+    ``answers`` is an iterable of (pillar, question text, answer code 0-4).
+    """
+    answers = list(answers)
+    context = build_report_context(org, avg_scores, overall_score, pillar_scores)
+    industry = org.get('industry', 'industry')
+
+    def build(compact, dropped, dropped_sections):
+        return (
+            context + _answers_text(answers, pillar_scores, compact, dropped) + "\n"
+            + _sections_text(industry, frozenset(dropped_sections)) + REPORT_STYLE
+        )
+
+    return _fit_to_budget(build, answers, pillar_scores, max_tokens)
+
+
+def build_section_prompts(org, avg_scores, overall_score, pillar_scores=None, answers=(),
+                          max_tokens=DEFAULT_MAX_PROMPT_TOKENS):
+    """One (title, prompt) pair per report section, in report order; each fits max_tokens on its own"""
+    answers = list(answers)
+    context = build_report_context(org, avg_scores, overall_score, pillar_scores)
+    industry = org.get('industry', 'industry')
+    prompts = []
+    for title, _, _ in REPORT_SECTIONS:
+        section = _sections_text(industry, frozenset(), title)
+
+        def build(compact, dropped, dropped_sections, section=section):
+            return (
+                context + _answers_text(answers, pillar_scores, compact, dropped)
+                + SECTION_INSTRUCTIONS + section + REPORT_STYLE
+            )
+
+        prompts.append((title, _fit_to_budget(build, answers, pillar_scores, max_tokens, sections=False)))
+    return prompts
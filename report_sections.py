@@ -0,0 +1,37 @@
+"""Concurrent, section-by-section report generation.
+
+A long single generation is bounded by the model's output speed, so wall time
+grows with report length. Splitting the report into independent section prompts
+lets the sections be written in parallel; they are still emitted strictly in
+report order, each one as soon as it and every section before it are finished.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+SECTION_SEPARATOR = "\n\n"
+
+
+def generate_sectioned_report(section_prompts, generate, max_concurrency=3, cache=None, cache_key=None):
+    """Generate sections concurrently and yield their text in report order
+
+    ``section_prompts`` is a list of (title, prompt) pairs and ``generate(prompt)``
+    returns the text for one section. When a ReportCache and a ``cache_key(prompt)``
+    function are given, finished sections are reused across reports.
+    """
+    def run(prompt, key):
+        text = generate(prompt)
+        if cache is not None:
+            cache.put(key, text)
+        return text
+
+    pool = ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="report-section")
+    try:
+        sections = []
+        for _, prompt in section_prompts:
+            key = cache_key(prompt) if cache is not None else None
+            cached = cache.get(key, count=False) if cache is not None else None
+            sections.append(cached.text if cached else pool.submit(run, prompt, key))
+        for index, section in enumerate(sections):
+            text = section if isinstance(section, str) else section.result()
+            yield (SECTION_SEPARATOR if index else "") + text.strip()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
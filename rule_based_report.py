@@ -0,0 +1,181 @@
+"""Deterministic culture recommendations that need no language model.
+
+Shown when no API key is configured and whenever the AI report is
+unavailable or slower than its latency budget. Pillars are ranked by score;
+pillars tied to one of the organization's stated challenges move up. The
+report then combines a fixed playbook per pillar with actions for the chosen
+focus areas and challenges, so the same inputs always give the same report.
+"""
+from culture_model import get_score_interpretation, pillar_map
+
+CHALLENGE_WEIGHT = 0.5  # score points a related challenge adds to a pillar's priority
+
+PILLAR_PLAYBOOK = {
+    "Leadership & Vision": {
+        "actions": [
+            "Run a leadership town hall that restates the mission and links it to this quarter's goals",
+            "Have every leader share one decision per month and the values behind it",
+            "Add values-based behaviours to leadership performance reviews",
+        ],
+        "kpi": "Share of employees who can state the mission and top priorities (pulse survey)",
+    },
+    "Inclusivity & Belonging": {
+        "actions": [
+            "Audit hiring, promotion and pay outcomes by demographic group",
+            "Set up or fund employee resource groups with an executive sponsor each",
+            "Train managers on inclusive meetings and equitable work allocation",
+        ],
+        "kpi": "Belonging index and representation at each level, tracked quarterly",
+    },
+    "Recognition & Motivation": {
+        "actions": [
+            "Launch a lightweight peer-to-peer recognition channel",
+            "Ask managers to give specific recognition in every 1:1",
+            "Tie a share of rewards to visible, values-aligned contributions",
+        ],
+        "kpi": "Recognition frequency per employee per month",
+    },
+    "Compensation & Benefits": {
+        "actions": [
+            "Benchmark salaries against the market and publish pay ranges internally",
+            "Explain how pay decisions are made and when they are reviewed",
+            "Survey employees on which benefits they value and re-balance the package",
+        ],
+        "kpi": "Compa-ratio spread and pay-fairness perception score",
+    },
+    "Well-being & Work-Life": {
+        "actions": [
+            "Agree team norms for after-hours messages and meeting-free focus time",
+            "Track workload and overtime, and rebalance teams that are consistently stretched",
+            "Promote mental health resources and train managers to spot burnout early",
+        ],
+        "kpi": "Average weekly hours, overtime and sick-leave trends",
+    },
+    "Feedback & Communication": {
+        "actions": [
+            "Make regular 1:1s with a simple feedback template standard",
+            "Close the loop on every survey by sharing results and the actions taken",
+            "Open an anonymous channel for upward feedback with a response commitment",
+        ],
+        "kpi": "1:1 completion rate and share of survey actions closed",
+    },
+    "Learning & Growth": {
+        "actions": [
+            "Agree an individual development plan with every employee",
+            "Set a per-person learning budget and protected learning time",
+            "Publish career paths and fill open roles internally first",
+        ],
+        "kpi": "Internal mobility rate and learning hours per employee",
+    },
+    "Team Dynamics & Trust": {
+        "actions": [
+            "Hold quarterly team retrospectives on how the team works together",
+            "Clarify roles and decision rights with a simple responsibility matrix",
+            "Give managers training in psychological safety and conflict resolution",
+        ],
+        "kpi": "Team trust score and cross-team collaboration ratings",
+    },
+    "Autonomy & Empowerment": {
+        "actions": [
+            "Push day-to-day decisions to the people closest to the work",
+            "Replace approval steps with clear guardrails where the risk is low",
+            "Set goals as outcomes and let teams choose how to reach them",
+        ],
+        "kpi": "Decision cycle time and perceived autonomy score",
+    },
+}
+
+FOCUS_ACTIONS = {
+    "Transparency": "Publish company goals, progress and key decisions in one shared place",
+    "Flexibility": "Write down flexible-working guidelines so they apply evenly across teams",
+    "Diversity & Inclusion": "Set measurable diversity goals and report progress every quarter",
+    "Employee Wellbeing": "Build a wellbeing calendar with resources for mental, physical and financial health",
+    "Recognition & Rewards": "Define what great work looks like and recognise it publicly and consistently",
+    "Innovation": "Set aside time and a small budget for experiments, and share what was learned",
+    "Collaboration": "Start cross-functional projects with shared goals and joint retrospectives",
+    "Work-Life Balance": "Protect focus time and discourage messages outside working hours",
+    "Career Development": "Run a yearly career conversation separate from performance reviews",
+    "Performance Excellence": "Use clear, outcome-based goals with regular check-ins instead of annual reviews",
+    "Competitive Compensation": "Review pay against the market every year and fix gaps proactively",
+    "Benefits Package": "Offer flexible benefits that employees can tailor to their life stage",
+}
+
+CHALLENGE_ACTIONS = {
+    "High Turnover": ("Run stay and exit interviews and fix the top three reasons people leave", "Recognition & Motivation"),
+    "Low Engagement": ("Run a short pulse survey and act visibly on one theme within 30 days", "Feedback & Communication"),
+    "Poor Communication": ("Set a predictable communication rhythm: weekly updates, monthly all-hands", "Feedback & Communication"),
+    "Lack of Growth Opportunities": ("Post internal openings first and support stretch assignments", "Learning & Growth"),
+    "Burnout": ("Review workloads team by team and remove low-value work and meetings", "Well-being & Work-Life"),
+    "Remote Work Challenges": ("Agree core collaboration hours and written-first ways of working", "Team Dynamics & Trust"),
+    "Diversity Issues": ("Use structured interviews and diverse panels for every hire", "Inclusivity & Belonging"),
+    "Leadership Gaps": ("Start a leadership development programme for first-line managers", "Leadership & Vision"),
+    "Feedback Culture": ("Train everyone in giving and receiving feedback, starting with leaders", "Feedback & Communication"),
+    "Change Management": ("Name change owners and explain the why, what and when for every major change", "Leadership & Vision"),
+    "Compensation Dissatisfaction": ("Share pay ranges and the criteria for raises and promotions", "Compensation & Benefits"),
+    "Benefits Gaps": ("Compare benefits with peers and close the gaps employees rate most important", "Compensation & Benefits"),
+}
+
+
+def rank_pillars(pillar_scores, challenges=()):
+    """Pillars ordered from most to least urgent, with related challenges weighing in"""
+    boosted = {CHALLENGE_ACTIONS[c][1] for c in challenges if c in CHALLENGE_ACTIONS}
+    order = list(PILLAR_PLAYBOOK)
+    return sorted(
+        pillar_scores,
+        key=lambda p: (pillar_scores[p] - (CHALLENGE_WEIGHT if p in boosted else 0), order.index(p) if p in order else len(order))
+    )
+
+
+def build_rule_based_report(org, avg_scores, overall_score, pillar_scores, priorities=3):
+    """Markdown recommendations derived only from scores and the organization profile"""
+    focus = [f for f in org.get('culture_focus', []) if f in FOCUS_ACTIONS]
+    challenges = [c for c in org.get('current_challenges', []) if c in CHALLENGE_ACTIONS]
+    ranked = [p for p in rank_pillars(pillar_scores, challenges) if p in PILLAR_PLAYBOOK]
+    urgent = ranked[:priorities]
+    strengths = [p for p in reversed(ranked) if pillar_scores[p] >= 2.5][:2]
+    weakest = min(avg_scores.items(), key=lambda item: item[1])
+    strongest = max(avg_scores.items(), key=lambda item: item[1])
+
+    lines = [
+        "## EXECUTIVE SUMMARY",
+        f"- **Overall score:** {overall_score}/4.0 ({get_score_interpretation(overall_score)[0]})",
+        f"- **Strongest area:** {strongest[0]} ({strongest[1]}/4.0)",
+        f"- **Priority area:** {weakest[0]} ({weakest[1]}/4.0)",
+        "",
+        "## PRIORITY FOCUS AREAS",
+    ]
+    for pillar in urgent:
+        related = [c for c in challenges if CHALLENGE_ACTIONS[c][1] == pillar]
+        note = f" · linked to: {', '.join(related)}" if related else ""
+        lines.append(
+            f"**{pillar}** ({pillar_map[pillar]}) — {pillar_scores[pillar]}/4.0, "
+            f"{get_score_interpretation(pillar_scores[pillar])[0]}{note}"
+        )
+        lines.extend(f"- {action}" for action in PILLAR_PLAYBOOK[pillar]["actions"])
+        lines.append("")
+
+    if strengths:
+        lines.append("## STRENGTHS TO BUILD ON")
+        lines.extend(
+            f"- **{pillar}** ({pillar_scores[pillar]}/4.0): use it to support change in {urgent[0] if urgent else weakest[0]}"
+            for pillar in strengths
+        )
+        lines.append("")
+
+    if focus or challenges:
+        lines.append("## YOUR PRIORITIES AND CHALLENGES")
+        lines.extend(f"- **{item}:** {FOCUS_ACTIONS[item]}" for item in focus)
+        lines.extend(f"- **{item}:** {CHALLENGE_ACTIONS[item][0]}" for item in challenges)
+        lines.append("")
+
+    if urgent:
+        lines.extend([
+            "## 30-60-90 DAY PLAN",
+            f"- **First 30 days:** {PILLAR_PLAYBOOK[urgent[0]]['actions'][0]}",
+            f"- **Days 30-60:** {PILLAR_PLAYBOOK[urgent[min(1, len(urgent) - 1)]]['actions'][0]}",
+            f"- **Days 60-90:** {PILLAR_PLAYBOOK[urgent[0]]['actions'][1]}, then re-run this assessment to measure progress",
+            "",
+            "## SUCCESS METRICS",
+        ])
+        lines.extend(f"- **{pillar}:** {PILLAR_PLAYBOOK[pillar]['kpi']}" for pillar in urgent)
+    return "\n".join(lines).strip() + "\n"
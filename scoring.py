@@ -0,0 +1,159 @@
+"""Vectorized scoring engine for one or many survey respondents.
+
+Responses are held as an N×Q matrix of int8 codes (the index of the answer in
+``SLIDER_LEVELS``, or ``UNANSWERED``), one row per respondent and one column per
+question in question-bank order. Question→pillar and question→category
+membership is precomputed as 0/1 matrices, so per-pillar and per-category sums
+and counts for every respondent come out of two matrix products.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from culture_model import CATEGORIES, LEVEL_SCORE, pillar_map
+from question_bank import UNANSWERED
+
+ScoreResult = namedtuple("ScoreResult", [
+    "pillar_sums", "pillar_counts", "pillar_means",
+    "category_sums", "category_counts", "category_means",
+    "overall"
+])
+
+
+class ScoringEngine:
+    """Precomputed question→pillar/category indices for a question bank"""
+
+    def __init__(self, questions):
+        self.question_ids = [q['id'] for q in questions]
+        self.question_index = {qid: i for i, qid in enumerate(self.question_ids)}
+        self.pillars = list(dict.fromkeys(q['pillar'] for q in questions))
+        self.categories = list(CATEGORIES)
+        self.question_pillar = np.array([self.pillars.index(q['pillar']) for q in questions], dtype=np.intp)
+        self.question_category = np.array(
+            [self.categories.index(pillar_map[q['pillar']]) for q in questions], dtype=np.intp
+        )
+        n_questions = len(questions)
+        self.pillar_matrix = np.zeros((n_questions, len(self.pillars)))
+        self.pillar_matrix[np.arange(n_questions), self.question_pillar] = 1
+        self.category_matrix = np.zeros((n_questions, len(self.categories)))
+        self.category_matrix[np.arange(n_questions), self.question_category] = 1
+
+    @property
+    def n_questions(self):
+        return len(self.question_ids)
+
+    def encode(self, responses):
+        """Code one respondent's {question_id: label} answers as an int8 row"""
+        row = np.full(self.n_questions, UNANSWERED, dtype=np.int8)
+        for qid, label in responses.items():
+            index = self.question_index.get(qid)
+            if index is not None and label in LEVEL_SCORE:
+                row[index] = LEVEL_SCORE[label]
+        return row
+
+    def encode_codes(self, codes):
+        """Zero-copy int8 row for an array('b') of codes in question-bank order"""
+        if len(codes) != self.n_questions:
+            raise ValueError(f"expected {self.n_questions} answer codes, got {len(codes)}")
+        return np.frombuffer(codes, dtype=np.int8)
+
+    def score(self, codes):
+        """Per-respondent pillar, category and overall scores for an N×Q code matrix
+
+        Means are NaN where a respondent answered nothing in a pillar; category
+        means are 0 in that case so that the overall score (the mean of the three
+        category means) matches the single-respondent report.
+        """
+        codes = np.atleast_2d(np.asarray(codes))
+        answered = codes >= 0
+        values = np.where(answered, codes, 0).astype(np.float64)
+        answered = answered.astype(np.float64)
+
+        pillar_sums = values @ self.pillar_matrix
+        pillar_counts = answered @ self.pillar_matrix
+        category_sums = values @ self.category_matrix
+        category_counts = answered @ self.category_matrix
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pillar_means = pillar_sums / pillar_counts
+            category_means = np.where(category_counts > 0, category_sums / category_counts, 0.0)
+        return ScoreResult(
+            pillar_sums, pillar_counts, pillar_means,
+            category_sums, category_counts, category_means,
+            category_means.mean(axis=1)
+        )
+
+    def summarize(self, result, row=0):
+        """Rounded report figures for one respondent
+
+        Returns ``(avg_scores, overall_score, pillar_scores)``: category averages,
+        the overall score and averages for every pillar with at least one answer.
+        """
+        avg_scores = {
+            category: round(float(result.category_means[row, i]), 2)
+            for i, category in enumerate(self.categories)
+        }
+        overall_score = round(sum(avg_scores.values()) / len(avg_scores), 2)
+        pillar_scores = {
+            pillar: round(float(result.pillar_means[row, i]), 2)
+            for i, pillar in enumerate(self.pillars)
+            if result.pillar_counts[row, i]
+        }
+        return avg_scores, overall_score, pillar_scores
+
+    def aggregate(self, result):
+        """Pooled pillar, category and overall averages across all respondents"""
+        accumulator = ScoreAccumulator(self)
+        accumulator.add_result(result)
+        return accumulator.summary()
+
+
+class ScoreAccumulator:
+    """Running pooled totals over successive batches of respondents
+
+    Only per-pillar and per-category sums and counts are kept, so memory stays
+    constant however many batches are added.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.respondents = 0
+        self.pillar_sums = np.zeros(len(engine.pillars))
+        self.pillar_counts = np.zeros(len(engine.pillars))
+        self.category_sums = np.zeros(len(engine.categories))
+        self.category_counts = np.zeros(len(engine.categories))
+        self.respondent_overall_sum = 0.0
+
+    def add(self, codes):
+        """Score an N×Q code matrix and fold it into the totals"""
+        result = self.engine.score(codes)
+        self.add_result(result)
+        return result
+
+    def add_result(self, result):
+        self.respondents += result.overall.shape[0]
+        self.pillar_sums += result.pillar_sums.sum(axis=0)
+        self.pillar_counts += result.pillar_counts.sum(axis=0)
+        self.category_sums += result.category_sums.sum(axis=0)
+        self.category_counts += result.category_counts.sum(axis=0)
+        self.respondent_overall_sum += float(result.overall.sum())
+
+    def summary(self):
+        """Pooled averages; pillars or categories without answers are None"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pillar_means = self.pillar_sums / self.pillar_counts
+            category_means = self.category_sums / self.category_counts
+        pillars = {
+            pillar: (None if np.isnan(mean) else float(mean))
+            for pillar, mean in zip(self.engine.pillars, pillar_means)
+        }
+        categories = {
+            category: (None if np.isnan(mean) else float(mean))
+            for category, mean in zip(self.engine.categories, category_means)
+        }
+        return {
+            "respondents": self.respondents,
+            "pillars": pillars,
+            "categories": categories,
+            "overall": float(np.nan_to_num(category_means).mean()),
+            "mean_respondent_overall": self.respondent_overall_sum / self.respondents if self.respondents else None
+        }
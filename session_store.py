@@ -0,0 +1,109 @@
+"""Durable survey sessions with debounced, batched writes.
+
+Survey progress (organization profile, answers, current page) is saved under a
+resume token so that a server restart, a redeploy or a dropped websocket does
+not lose an assessment. Saves are only queued on the calling thread; a single
+writer thread coalesces them per token and commits everything pending in one
+SQLite transaction every ``flush_interval`` seconds.
+"""
+import atexit
+import json
+import secrets
+import sqlite3
+import threading
+import time
+
+from sqlite_store import SQLiteStore
+
+
+def new_resume_token():
+    """Short, URL-safe, unguessable token identifying one survey session"""
+    return secrets.token_urlsafe(9)
+
+
+class SessionStore(SQLiteStore):
+    """SQLite (WAL) store of in-progress and completed survey sessions"""
+
+    def __init__(self, path, flush_interval=0.5, retention_days=30):
+        super().__init__(path)
+        self.flush_interval = flush_interval
+        self.retention_seconds = retention_days * 24 * 3600
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS survey_sessions (
+                    token TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS survey_sessions_updated ON survey_sessions (updated_at)")
+        self._pending = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, name="session-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def save(self, token, state):
+        """Queue state for token; only the latest state per token is written"""
+        payload = json.dumps(state)
+        with self._lock:
+            self._pending[token] = (payload, time.time())
+        self._wakeup.set()
+
+    def load(self, token):
+        """Saved state for token (including unflushed saves), or None"""
+        with self._lock:
+            pending = self._pending.get(token) or self._in_flight.get(token)
+        if pending:
+            return json.loads(pending[0])
+        with self._connect() as conn:
+            row = conn.execute("SELECT state FROM survey_sessions WHERE token = ?", (token,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def flush(self):
+        """Write every queued save in a single transaction"""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            self._in_flight = batch
+        if not batch:
+            return 0
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO survey_sessions (token, state, updated_at) VALUES (?, ?, ?)",
+                    [(token, payload, saved_at) for token, (payload, saved_at) in batch.items()]
+                )
+        except sqlite3.Error:
+            with self._lock:
+                for token, item in batch.items():
+                    self._pending.setdefault(token, item)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight = {}
+        return len(batch)
+
+    def prune(self):
+        """Delete sessions untouched for longer than the retention period"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM survey_sessions WHERE updated_at < ?", (time.time() - self.retention_seconds,)
+            )
+            return cursor.rowcount
+
+    def _write_loop(self):
+        last_prune = 0.0
+        while True:
+            self._wakeup.wait()
+            time.sleep(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+                if time.time() - last_prune > 3600:
+                    self.prune()
+                    last_prune = time.time()
+            except sqlite3.Error:
+                time.sleep(self.flush_interval)
+                self._wakeup.set()
@@ -0,0 +1,47 @@
+"""Connection handling shared by the SQLite-backed stores.
+
+Every store opens a short-lived connection per operation, so one store object
+can be used from any thread and several server processes can share the same
+database file. Databases run in WAL mode so readers never wait for a writer,
+and a busy database is retried for up to ``BUSY_TIMEOUT`` seconds.
+"""
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+BUSY_TIMEOUT = 30
+
+
+class SQLiteStore:
+    """Base class for stores kept in one SQLite file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+
+    @contextmanager
+    def _connect(self):
+        """Connection committed when the block succeeds and rolled back when it raises"""
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Connection holding the write lock (BEGIN IMMEDIATE) for an atomic read-modify-write"""
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
@@ -0,0 +1,81 @@
+"""Survey respondents are recorded once: across resumes and when they open a team survey"""
+import sqlite3
+from pathlib import Path
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from org_survey import OrgSurveyStore
+
+APP = str(Path(__file__).resolve().parent.parent / "thrivya_app.py")
+MAX_STEPS = 200
+
+
+@pytest.fixture(autouse=True)
+def fresh_resources():
+    # Cached stores outlive an AppTest within the process and would keep another test's database
+    st.cache_resource.clear()
+
+
+def new_app(db_path, **query):
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.secrets["thrivya_db_path"] = str(db_path)
+    at.secrets["cohere_api_key"] = ""
+    for key, value in query.items():
+        at.query_params[key] = value
+    return at
+
+
+def complete_survey(at):
+    at.run()
+    at.button[0].click().run()
+    at.text_input[0].input("Resume Test Org")
+    at.button[-1].click().run()
+    for _ in range(MAX_STEPS):
+        if at.exception or at.session_state.page == "results":
+            break
+        for slider in at.slider:
+            slider.set_value(3)
+        at.button[-1].click().run()
+    assert not at.exception, at.exception
+    assert at.session_state.page == "results"
+    return at.session_state.session_token
+
+
+def test_resuming_org_survey_keeps_one_respondent(tmp_path):
+    db_path = tmp_path / "thrivya.sqlite3"
+    code = OrgSurveyStore(db_path).create_survey({"name": "Resume Test Org"})
+    token = complete_survey(new_app(db_path, org=code))
+
+    for _ in range(2):
+        at = new_app(db_path, resume=token)
+        at.run()
+        assert not at.exception, at.exception
+        assert at.session_state.page == "results"
+
+    with sqlite3.connect(db_path) as conn:
+        respondents = conn.execute("SELECT respondents FROM org_aggregates WHERE code = ?", (code,)).fetchone()
+        pulses = conn.execute("SELECT COUNT(*) FROM pulse_entries").fetchone()
+        assessments = conn.execute("SELECT COUNT(*) FROM assessments").fetchone()
+    assert respondents == (1,)
+    assert pulses == (1,)
+    # Team survey respondents only reach the industry benchmark through their pooled org row
+    assert assessments == (0,)
+
+
+def test_team_survey_creator_leaves_the_individual_benchmark(tmp_path):
+    db_path = tmp_path / "thrivya.sqlite3"
+    at = new_app(db_path)
+    complete_survey(at)
+    next(button for button in at.button if "Create a Team Survey Link" in button.label).click().run()
+    assert not at.exception, at.exception
+    code = at.session_state.org_code
+
+    with sqlite3.connect(db_path) as conn:
+        respondents = conn.execute("SELECT respondents FROM org_aggregates WHERE code = ?", (code,)).fetchone()
+        assessments = conn.execute("SELECT COUNT(*) FROM assessments").fetchone()
+        benchmark_counts = conn.execute("SELECT SUM(count) FROM benchmark_stats").fetchone()
+    assert respondents == (1,)
+    assert assessments == (0,)
+    assert benchmark_counts == (0,)
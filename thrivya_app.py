@@ -1,13 +1,26 @@
 import streamlit as st
-import json
-import requests
-import plotly.graph_objects as go
-import plotly.express as px
+import re
 from pathlib import Path
-import pandas as pd
 from datetime import datetime, timedelta
-import numpy as np
+import os
+import time
 import uuid
+import hmac
+from report_cache import ReportCache, report_cache_key
+from report_jobs import DONE, FAILED, ReportJobQueue
+from rate_limit import RateLimiter, SingleFlight, coalesced
+from circuit_breaker import CLOSED, CircuitBreaker, CircuitOpenError
+from rule_based_report import build_rule_based_report
+from report_library import ReportLibrary, adapt_report
+from report_prompt import (
+    DEFAULT_MAX_PROMPT_TOKENS, REPORT_MODEL, REPORT_TEMPERATURE, build_report_prompt, build_section_prompts
+)
+from report_sections import generate_sectioned_report
+from culture_model import SLIDER_LEVELS, get_score_interpretation
+from benchmark_store import BenchmarkStore
+from pulse_store import GRANULARITIES, PulseStore
+from session_store import SessionStore, new_resume_token
+from question_bank import QuestionBankError, QuestionBankSource, SurveyResponses
 
 # --- Configuration ---
 st.set_page_config(
@@ -18,273 +31,300 @@ st.set_page_config(
 )
 
 # --- Enhanced Styling ---
-st.markdown("""
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-
-        /* Global Styles */
-        body {
-            font-family: 'Inter', sans-serif;
-            background-color: #f8f9fa;
-        }
-
-        .main-container {
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 1rem;
-        }
-
-        /* Header Styles */
-        .main-header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 2.5rem 1.5rem;
-            border-radius: 15px;
-            margin-bottom: 2rem;
-            text-align: center;
-            color: white;
-            box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-        }
-
-        .main-title {
-            font-size: 2.5rem;
-            font-weight: 700;
-            margin: 0;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }
-
-        .main-subtitle {
-            font-size: 1.2rem;
-            font-weight: 400;
-            margin-top: 0.75rem;
-            opacity: 0.9;
-        }
-
-        /* Card Styles */
-        .pillar-card {
-            background: white;
-            border-radius: 12px;
-            padding: 1.5rem;
-            margin: 1rem 0;
-            box-shadow: 0 4px 20px rgba(0,0,0,0.08);
-            border-left: 4px solid;
-            transition: transform 0.3s ease, box-shadow 0.3s ease;
-        }
-
-        .pillar-card:hover {
-            transform: translateY(-3px);
-            box-shadow: 0 6px 25px rgba(0,0,0,0.12);
-        }
-
-        .culture-card { border-left-color: #ff6b6b; }
-        .wellness-card { border-left-color: #4ecdc4; }
-        .growth-card { border-left-color: #45b7d1; }
-
-        .metric-card {
-            background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-            border-radius: 10px;
-            padding: 1.5rem;
-            text-align: center;
-            margin: 1rem 0;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-        }
-
-        .score-excellent { color: #27ae60; font-weight: 600; }
-        .score-good { color: #f39c12; font-weight: 600; }
-        .score-needs-improvement { color: #e74c3c; font-weight: 600; }
-
-        .recommendation-box {
-            background: linear-gradient(135deg, #ffeaa7 0%, #fab1a0 100%);
-            border-radius: 10px;
-            padding: 1.5rem;
-            margin: 1.5rem 0;
-            border-left: 4px solid #e17055;
-            box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-        }
-
-        .progress-indicator {
-            background: linear-gradient(90deg, #00d2ff 0%, #3a47d5 100%);
-            height: 6px;
-            border-radius: 3px;
-            margin: 1.5rem 0;
-        }
-
-        .question-card {
-            background: white;
-            border-radius: 10px;
-            padding: 1.5rem;
-            margin: 1.5rem 0;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-            border: 1px solid #e1e8ed;
-        }
-
-        .brand-footer {
-            text-align: center;
-            margin-top: 3rem;
-            padding: 2rem;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            border-radius: 15px;
-            color: white;
-        }
-
-        .stButton > button {
-            background: linear-gradient(135deg, #27ae60 0%, #2ecc71 100%);
-            color: white;
-            border: none;
-            border-radius: 8px;
-            padding: 0.75rem 2rem;
-            font-weight: 600;
-            transition: all 0.3s ease;
-        }
-
-        .stButton > button:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-        }
+@st.cache_resource
+def load_styles():
+    """Read and minify the app stylesheet once per process"""
+    css = Path(__file__).with_name("styles.css").read_text()
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return f"<style>{css.strip()}</style>"
+
+st.markdown(load_styles(), unsafe_allow_html=True)
+
+# --- Settings ---
+def get_setting(key, default=None):
+    """Read an optional setting from Streamlit secrets"""
+    try:
+        return st.secrets.get(key, default)
+    except FileNotFoundError:
+        return default
+
+SECTION_MAX_TOKENS = 1536
+
+# --- Metrics ---
+@st.cache_resource
+def get_metrics():
+    """Process-wide metrics registry and exporters; None unless metrics_enabled is set"""
+    if not get_setting("metrics_enabled", False):
+        return None
+    from metrics import SIZE_BUCKETS, MetricsRegistry, start_file_exporter, start_http_exporter
+    metrics = MetricsRegistry()
+    metrics.histogram("thrivya_page_render_seconds", "Full script rerun time per survey page", ["page"])
+    metrics.histogram("thrivya_chart_render_seconds", "Time to build (or fetch) and send a chart", ["chart"])
+    metrics.histogram("thrivya_cohere_request_seconds", "Chat API attempt latency by HTTP status or error", ["status"])
+    metrics.histogram("thrivya_rate_limit_wait_seconds", "Time spent waiting for the shared chat API rate limit")
+    metrics.histogram("thrivya_prompt_chars", "Size of submitted report prompts", ["mode"], buckets=SIZE_BUCKETS)
+    metrics.counter("thrivya_report_requests_total", "Results-page report lookups by where the report came from", ["source"])
+
+    port = int(get_setting("metrics_port", 0))
+    if port:
+        try:
+            start_http_exporter(metrics, port, get_setting("metrics_host", "127.0.0.1"))
+        except OSError as e:
+            # Another server process on this host already owns the port
+            metrics.exporter_errors.append(f"port {port}: {e}")
+    if get_setting("metrics_file"):
+        start_file_exporter(metrics, get_setting("metrics_file"), float(get_setting("metrics_file_seconds", 15)))
+    return metrics
+
+def is_admin():
+    """True when the URL carries the configured admin token"""
+    token = get_setting("admin_token")
+    return bool(token) and hmac.compare_digest(
+        st.query_params.get("admin", "").encode(), str(token).encode()
+    )
 
-        .intro-features {
-            display: grid;
-            grid-template-columns: repeat(4, 1fr);
-            gap: 1.5rem;
-            margin: 2rem 0;
-            justify-content: center;
-            text-align: center;
-        }
+# --- Profiling ---
+@st.cache_resource
+def get_profiler():
+    """Per-rerun profiler writing into a size-capped directory"""
+    from profiler import RerunProfiler
+    return RerunProfiler(
+        get_setting("profile_dir", ".thrivya_cache/profiles"),
+        max_bytes=int(float(get_setting("profile_max_mb", 50)) * 1024 * 1024),
+        interval=float(get_setting("profile_interval_ms", 5)) / 1000,
+        root_file=__file__
+    )
 
-        .feature-item {
-            background: rgba(255, 255, 255, 0.9);
-            padding: 2rem;
-            border-radius: 12px;
-            box-shadow: 0 4px 15px rgba(0,0,0,0.08);
-            transition: transform 0.3s ease;
-            height: 100%;
-        }
+def profile_mode():
+    """Profiler to wrap this rerun in: THRIVYA_PROFILE for every session, or ?profile= for admins"""
+    from profiler import MODES
+    mode = os.environ.get("THRIVYA_PROFILE", "")
+    if not mode and "profile" in st.query_params and is_admin():
+        mode = st.query_params["profile"]
+    mode = "sample" if mode.lower() in ("1", "true", "yes") else mode.lower()
+    return mode if mode in MODES else None
 
-        .feature-item:hover {
-            transform: translateY(-3px);
-        }
+# --- Load Questions ---
+@st.cache_resource
+def get_question_source():
+    """Compiled question bank, recompiled when the JSON file changes"""
+    return QuestionBankSource(
+        get_setting("questions_path", "culture_questions.json"),
+        check_interval=float(get_setting("questions_check_seconds", 2))
+    )
 
-        .feature-icon {
-            font-size: 2.5rem;
-            margin-bottom: 1rem;
-        }
+try:
+    question_bank = get_question_source().current()
+except QuestionBankError as e:
+    st.error(f"❌ Could not load the question bank: {e}")
+    st.stop()
+questions = question_bank.questions
+
+@st.cache_resource(max_entries=2)
+def build_scoring_engine(digest, _questions):
+    """Vectorized scoring engine for one version of the question bank"""
+    from scoring import ScoringEngine
+    return ScoringEngine(list(_questions))
+
+def get_scoring_engine():
+    """Scoring engine matching the current question bank"""
+    return build_scoring_engine(question_bank.digest, question_bank.questions)
+
+# --- Report Cache ---
+@st.cache_resource
+def get_report_cache():
+    """Disk-backed report cache shared by every session in this process"""
+    return ReportCache(
+        get_setting("report_cache_path", ".thrivya_cache/reports.sqlite3"),
+        max_bytes=int(get_setting("report_cache_max_mb", 50)) * 1024 * 1024,
+        ttl_seconds=int(get_setting("report_cache_ttl_hours", 168)) * 3600
+    )
 
-        .why-thrivya {
-            background: linear-gradient(135deg, #a29bfe 0%, #8e2de2 100%);
-            border-radius: 12px;
-            padding: 1.5rem;
-            margin: 2rem 0;
-            box-shadow: 0 4px 15px rgba(0,0,0,0.08);
-            text-align: center;
-            color: white;
-        }
+# --- Report Jobs ---
+REPORT_POLL_SECONDS = 1
+
+@st.cache_resource
+def get_report_queue():
+    """Process-wide worker pool that generates reports off the script thread"""
+    queue = ReportJobQueue(max_workers=int(get_setting("report_workers", 8)))
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.gauge("thrivya_report_jobs", "Report jobs in this process by status", ["status"],
+                      lambda: {(status,): count for status, count in queue.stats().items()})
+    return queue
+
+@st.cache_resource
+def get_cohere_client(api_key, url):
+    """Process-wide Cohere client whose session pools and reuses connections"""
+    from cohere_client import CohereClient
+    metrics = get_metrics()
+    on_attempt = None
+    if metrics is not None:
+        on_attempt = lambda attempt: metrics.observe(
+            "thrivya_cohere_request_seconds", attempt.latency, status=attempt.status_code or attempt.error
+        )
+    return CohereClient(
+        api_key,
+        url=url,
+        connect_timeout=float(get_setting("cohere_connect_timeout", 5)),
+        read_timeout=float(get_setting("cohere_read_timeout", 180)),
+        max_retries=int(get_setting("cohere_max_retries", 3)),
+        pool_size=int(get_setting("report_workers", 8)),
+        on_attempt=on_attempt
+    )
 
-        .why-thrivya-features {
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            gap: 1.5rem;
-            margin-top: 1.25rem;
-        }
+@st.cache_resource
+def get_rate_limiter():
+    """Token bucket shared by every server process; None when rate limiting is off"""
+    per_minute = float(get_setting("cohere_requests_per_minute", 100))
+    if per_minute <= 0:
+        return None
+    return RateLimiter(
+        get_setting("rate_limit_path", ".thrivya_cache/ratelimit.sqlite3"),
+        rate=per_minute / 60,
+        burst=float(get_setting("cohere_burst", 10))
+    )
 
-        .why-thrivya-feature {
-            background: white;
-            border-radius: 10px;
-            padding: 1.5rem;
-            box-shadow: 0 4px 15px rgba(0,0,0,0.05);
-            transition: transform 0.3s ease;
-            height: 100%;
-        }
+@st.cache_resource
+def get_single_flight():
+    """Leases that let one process generate a report while others wait for it"""
+    return SingleFlight(
+        get_setting("rate_limit_path", ".thrivya_cache/ratelimit.sqlite3"),
+        lease_seconds=float(get_setting("cohere_read_timeout", 180)) + 60
+    )
 
-        .why-thrivya-feature:hover {
-            transform: translateY(-3px);
-            box-shadow: 0 6px 20px rgba(0,0,0,0.1);
-        }
+@st.cache_resource
+def get_circuit_breaker():
+    """Tracks recent AI call failures and latency for this server process"""
+    return CircuitBreaker(
+        window=int(get_setting("breaker_window", 20)),
+        min_calls=int(get_setting("breaker_min_calls", 4)),
+        failure_rate=float(get_setting("breaker_failure_rate", 0.5)),
+        slow_call_seconds=float(get_setting("breaker_slow_seconds", 60)),
+        open_seconds=float(get_setting("breaker_open_seconds", 30))
+    )
 
-        .continuous-feature { background: linear-gradient(135deg, #ff9f43 0%, #ec6f66 100%); color: white; }
-        .data-driven-feature { background: linear-gradient(135deg, #4facfe 0%, #00d2ff 100%); color: white; }
-        .hr-focused-feature { background: linear-gradient(135deg, #d4a017 0%, #f4d03f 100%); color: white; }
-
-        /* Slider Guide Styles */
-        .slider-guide {
-            display: flex;
-            justify-content: space-between;
-            margin: 1.5rem 0;
-            padding: 1rem;
-            background: #f8f9fa;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-        }
+def get_report_cache_key(prompt):
+    """Cache key for a report, distinguishing single-shot and sectioned generations"""
+    model = REPORT_MODEL if get_setting("report_mode", "single") != "sectioned" else f"{REPORT_MODEL}:sectioned"
+    return report_cache_key(prompt, model, REPORT_TEMPERATURE)
+
+def report_section_prompts(org, avg_scores, overall_score, pillar_scores, answers, max_prompt_tokens):
+    """Per-section prompts in sectioned mode, else None; only built when a job is about to be submitted"""
+    if get_setting("report_mode", "single") != "sectioned":
+        return None
+    return build_section_prompts(org, avg_scores, overall_score, pillar_scores, answers, max_prompt_tokens)
+
+def submit_report_job(cache_key, prompt, api_key, section_prompts=None, on_done=None):
+    """Queue a background generation, reusing any live job for the same report"""
+    from cohere_client import COHERE_CHAT_URL
+    client = get_cohere_client(api_key, get_setting("cohere_api_url", COHERE_CHAT_URL))
+    report_cache = get_report_cache()
+    limiter = get_rate_limiter()
+    single_flight = get_single_flight()
+    breaker = get_circuit_breaker()
+    breaker_wait = float(get_setting("breaker_wait_seconds", 600))
+
+    metrics = get_metrics()
+
+    def wait_for_rate_limit():
+        if limiter is None:
+            return
+        if metrics is None:
+            limiter.acquire(cache_key)
+        else:
+            with metrics.timer("thrivya_rate_limit_wait_seconds"):
+                limiter.acquire(cache_key)
+
+    def chat(message, **kwargs):
+        wait_for_rate_limit()
+        return breaker.call(client.chat, message, REPORT_MODEL, REPORT_TEMPERATURE, **kwargs)
+
+    def stream_chat():
+        wait_for_rate_limit()
+        yield from breaker.stream(client.stream_chat(prompt, REPORT_MODEL, REPORT_TEMPERATURE))
+
+    def generate():
+        # While the circuit is open the job waits here and the page shows the rule-based analysis
+        breaker.wait(breaker_wait)
+        return coalesced(single_flight, report_cache, cache_key, produce)
+
+    sectioned = get_setting("report_mode", "single") == "sectioned" and section_prompts
+    if metrics is not None:
+        if sectioned:
+            for _, section_prompt in section_prompts:
+                metrics.observe("thrivya_prompt_chars", len(section_prompt), mode="section")
+        else:
+            metrics.observe("thrivya_prompt_chars", len(prompt), mode="single")
+
+    if sectioned:
+        produce = lambda: generate_sectioned_report(
+            section_prompts,
+            lambda section_prompt: chat(section_prompt, max_tokens=SECTION_MAX_TOKENS),
+            max_concurrency=int(get_setting("report_section_concurrency", 3)),
+            cache=report_cache,
+            cache_key=lambda section_prompt: report_cache_key(section_prompt, REPORT_MODEL, REPORT_TEMPERATURE)
+        )
+    elif get_setting("report_streaming", True):
+        produce = stream_chat
+    else:
+        produce = lambda: [chat(prompt)]
+    # The queue dedupes within this process; coalesced() does the same across processes
+    # and stores the finished report in the cache before releasing its lease
+    return get_report_queue().submit(cache_key, generate, on_done)
+
+@st.cache_resource
+def get_report_library():
+    """Finished reports indexed for reuse by near-identical organizations; None when disabled"""
+    if not get_setting("report_library_enabled", True):
+        return None
+    return ReportLibrary(
+        get_setting("thrivya_db_path", ".thrivya_cache/thrivya.sqlite3"),
+        max_distance=float(get_setting("report_library_max_distance", 0.1)),
+        max_entries=int(get_setting("report_library_max_entries", 5000))
+    )
 
-        .slider-guide-box {
-            flex: 1;
-            text-align: center;
-            padding: 0.75rem;
-            border-radius: 8px;
-            font-weight: 600;
-            color: white;
-            margin: 0 0.25rem;
-        }
+# --- Benchmarks ---
+DEFAULT_BENCHMARK_SCORES = {"Culture": 3.2, "Wellness": 2.8, "Growth": 3.0}
 
-        .slider-guide-disagree { background-color: #e74c3c; }
-        .slider-guide-neutral { background-color: #f1c40f; }
-        .slider-guide-agree { background-color: #2ecc71; }
-        .slider-guide-strongly-disagree { background-color: #c0392b; }
-        .slider-guide-strongly-agree { background-color: #27ae60; }
-
-        .slider-note {
-            font-size: 0.9rem;
-            color: #7f8c8d;
-            margin-bottom: 1rem;
-            text-align: center;
-        }
+@st.cache_resource
+def get_benchmark_store():
+    """Completed assessments and running benchmark aggregates"""
+    return BenchmarkStore(
+        get_setting("thrivya_db_path", ".thrivya_cache/thrivya.sqlite3"),
+        min_count=int(get_setting("benchmark_min_count", 5))
+    )
 
-        /* Responsive Adjustments */
-        @media (max-width: 1024px) {
-            .intro-features { grid-template-columns: repeat(2, 1fr); }
-            .why-thrivya-features { grid-template-columns: repeat(2, 1fr); }
-            .main-title { font-size: 2rem; }
-            .main-subtitle { font-size: 1rem; }
-        }
+# --- Organization Surveys ---
+@st.cache_resource
+def get_org_store():
+    """Organization surveys pooling many respondents, with running aggregates"""
+    from org_survey import OrgSurveyStore
+    return OrgSurveyStore(
+        get_setting("thrivya_db_path", ".thrivya_cache/thrivya.sqlite3"),
+        min_group_size=int(get_setting("org_min_group_size", 5)),
+        bootstrap_samples=int(get_setting("org_bootstrap_samples", 1000)),
+        confidence=float(get_setting("org_confidence", 0.95))
+    )
 
-        @media (max-width: 768px) {
-            .intro-features { grid-template-columns: 1fr; }
-            .why-thrivya-features { grid-template-columns: 1fr; }
-            .metric-card { margin: 0.75rem 0; }
-            .pillar-card { margin: 0.75rem 0; }
-            .slider-guide { flex-direction: column; gap: 1rem; }
-            .slider-guide-box { margin: 0.5rem 0; }
-            .why-thrivya { margin: 1rem 0; }
-        }
-    </style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def get_pulse_store():
+    """Timestamped pulses per organization survey with day, week and month rollups"""
+    return PulseStore(
+        get_setting("thrivya_db_path", ".thrivya_cache/thrivya.sqlite3"),
+        min_count=int(get_setting("org_min_group_size", 5))
+    )
 
-# --- Load Questions ---
-@st.cache_data
-def load_questions():
-    file_path = Path("culture_questions.json") # Updated file name to "culture_questions.json"
-    if not file_path.exists():
-        st.error("❌ Questions file not found. Please ensure culture_questions.json exists in the project directory.") # Updated file name
-        st.stop()
-    try:
-        with open(file_path) as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        st.error("❌ Invalid JSON format in questions file.")
-        st.stop()
-
-questions = load_questions()
-
-# --- Pillar Mapping ---
-pillar_map = {
-    "Leadership & Vision": "Culture",
-    "Inclusivity & Belonging": "Culture",
-    "Recognition & Motivation": "Culture",
-    "Compensation & Benefits": "Culture", # NEW ADDITION
-    "Well-being & Work-Life": "Wellness",
-    "Feedback & Communication": "Wellness",
-    "Learning & Growth": "Growth",
-    "Team Dynamics & Trust": "Growth",
-    "Autonomy & Empowerment": "Growth"
-}
+def join_org_survey(code):
+    """Attach this session to an organization survey and prefill its profile; False if unknown"""
+    org_info = get_org_store().survey(code)
+    if org_info is None:
+        return False
+    st.session_state.org_code = code
+    st.session_state.org_info = dict(st.session_state.org_info, **org_info)
+    return True
 
 # --- Color Mapping ---
 pillar_colors = {
@@ -293,10 +333,63 @@ pillar_colors = {
     "Growth": "#45b7d1"
 }
 
+# --- Session Persistence ---
+@st.cache_resource
+def get_session_store():
+    """Durable store of survey progress, written in debounced batches"""
+    return SessionStore(
+        get_setting("thrivya_db_path", ".thrivya_cache/thrivya.sqlite3"),
+        retention_days=int(get_setting("session_retention_days", 30))
+    )
+
+# Answers last written to each store, so a rerun records an assessment only once
+RECORDED_MARKERS = ("recorded_responses", "org_recorded_responses")
+
+def persist_session():
+    """Queue a save of the survey progress under this session's resume token"""
+    token = st.session_state.get("session_token")
+    if not token:
+        return
+    start_time = st.session_state.assessment_start_time
+    get_session_store().save(token, {
+        "page": st.session_state.page,
+        "org_info": st.session_state.org_info,
+        "responses": st.session_state.responses.to_dict(),
+        "assessment_start_time": start_time.timestamp() if start_time else None,
+        "current_question": st.session_state.current_question,
+        "org_code": st.session_state.get("org_code"),
+        "assessment_id": st.session_state.get("assessment_id"),
+        "recorded": {
+            key: st.session_state[key].to_dict() for key in RECORDED_MARKERS if key in st.session_state
+        }
+    })
+
+def restore_session(token):
+    """Rebuild session state from a saved survey; False if the token is unknown"""
+    saved = get_session_store().load(token)
+    if not saved:
+        return False
+    st.session_state.page = saved["page"]
+    st.session_state.org_info = saved["org_info"]
+    st.session_state.responses = SurveyResponses.from_dict(question_bank, saved["responses"])
+    start_time = saved.get("assessment_start_time")
+    st.session_state.assessment_start_time = datetime.fromtimestamp(start_time) if start_time else None
+    st.session_state.current_question = saved.get("current_question", 0)
+    st.session_state.session_token = token
+    if saved.get("org_code"):
+        st.session_state.org_code = saved["org_code"]
+    # Without these a resumed or refreshed results page would record the assessment again
+    if saved.get("assessment_id"):
+        st.session_state.assessment_id = saved["assessment_id"]
+    for key, answers in saved.get("recorded", {}).items():
+        st.session_state[key] = SurveyResponses.from_dict(question_bank, answers)
+    st.query_params["resume"] = token
+    return True
+
 # --- Session State Initialization ---
 if "page" not in st.session_state:
     st.session_state.page = "intro"
-    st.session_state.responses = {}
+    st.session_state.responses = SurveyResponses(question_bank)
     st.session_state.org_info = {
         'name': '',
         'industry': '',
@@ -309,21 +402,17 @@ if "page" not in st.session_state:
     }
     st.session_state.assessment_start_time = None
     st.session_state.current_question = 0
+    if "resume" in st.query_params and not restore_session(st.query_params["resume"]):
+        del st.query_params["resume"]
+    if "org" in st.query_params and "org_code" not in st.session_state and not join_org_survey(st.query_params["org"]):
+        del st.query_params["org"]
+
+# Answers are stored by question position, so re-lay them out after a bank reload
+st.session_state.responses = st.session_state.responses.rebase(question_bank)
 
-SLIDER_LEVELS = ["Strongly Disagree", "Disagree", "Neutral", "Agree", "Strongly Agree"]
-LEVEL_SCORE = {lvl: i for i, lvl in enumerate(SLIDER_LEVELS)}
 LEVEL_COLORS = ["#c0392b", "#e74c3c", "#f1c40f", "#27ae60", "#2ecc71"]
 
 # --- Utility Functions ---
-def get_score_interpretation(score):
-    """Enhanced score interpretation with detailed insights"""
-    if score >= 3.5:
-        return "Excellent", "score-excellent", "🌟"
-    elif score >= 2.5:
-        return "Good", "score-good", "👍"
-    else:
-        return "Needs Improvement", "score-needs-improvement", "⚠️"
-
 def calculate_completion_percentage():
     """Calculate assessment completion percentage"""
     total_questions = len(questions)
@@ -344,6 +433,8 @@ def show_progress_bar():
         </div>
     </div>
     """, unsafe_allow_html=True)
+    if st.session_state.get("session_token"):
+        st.caption(f"💾 Progress is saved automatically · Resume code: `{st.session_state.session_token}`")
 
 def show_enhanced_slider(q, idx, total, category):
     """Enhanced question display with immediate response updates"""
@@ -362,9 +453,9 @@ def show_enhanced_slider(q, idx, total, category):
     </div>
     """, unsafe_allow_html=True)
 
-    current_val = 2  # Default to neutral
-    if q['id'] in st.session_state.responses:
-        current_val = LEVEL_SCORE[st.session_state.responses[q['id']]]
+    current_val = st.session_state.responses.code(q['id'])
+    if current_val < 0:
+        current_val = 2  # Default to neutral
 
     val = st.slider(
         f"Response for Question {idx + 1}",
@@ -375,10 +466,290 @@ def show_enhanced_slider(q, idx, total, category):
     )
 
     # Update session state immediately
-    st.session_state.responses[q['id']] = SLIDER_LEVELS[val]
+    st.session_state.responses.set(q['id'], val)
+
+def interval_html(intervals, name):
+    """Confidence interval line for a score card; empty when there is none"""
+    if name not in intervals:
+        return ""
+    low, high = intervals[name]
+    return f'<div style="font-size: 0.8rem; color: #95a5a6;">CI {low}–{high}</div>'
+
+def show_report_header(generated_at, response_count):
+    """Display the banner above an AI-generated report"""
+    st.markdown(f"""
+    <div class="recommendation-box">
+        <h3 style="margin-top: 0; color: #2c3e50;">🤖 AI-Generated Culture Intelligence Report</h3>
+        <p style="margin-bottom: 0; color: #7f8c8d; font-size: 0.9rem;">
+            Generated on {generated_at.strftime('%B %d, %Y at %I:%M %p UTC')}
+            | Based on {response_count} responses
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+def describe_report_error(error):
+    """User-facing message for a failed report generation"""
+    import requests
+    from cohere_client import CohereAPIError
+    if isinstance(error, CircuitOpenError):
+        return "❌ The AI service is unavailable right now. Please try again in a few minutes."
+    if isinstance(error, CohereAPIError):
+        return f"❌ API Error: {error.status_code} - {error.text}"
+    if isinstance(error, requests.exceptions.Timeout):
+        return "❌ Request timeout. Please try again."
+    if isinstance(error, requests.exceptions.RequestException):
+        return f"❌ Network error: {str(error)}"
+    return f"❌ Unexpected error: {str(error)}"
+
+def show_basic_analysis(org, avg_scores, overall_score, pillar_scores):
+    """Rule-based recommendations that need no AI call"""
+    st.markdown("""
+    <div class="recommendation-box">
+        <h3 style="margin-top: 0;">📋 Basic Culture Analysis</h3>
+        <p>Based on your responses, here are some general observations:</p>
+    </div>
+    """, unsafe_allow_html=True)
+    if overall_score >= 3.5:
+        st.success("🌟 Your organization shows excellent cultural health across all dimensions!")
+    elif overall_score >= 2.5:
+        st.info("👍 Your organization has a solid cultural foundation with room for targeted improvements.")
+    else:
+        st.warning("⚠️ Your organization has significant opportunities for cultural enhancement.")
+    st.markdown(build_rule_based_report(org, avg_scores, overall_score, pillar_scores))
+
+def report_is_degraded(job):
+    """True when a running job should be covered by the rule-based analysis"""
+    if job.text:
+        return False
+    slo = float(get_setting("report_slo_seconds", 10))
+    return get_circuit_breaker().state != CLOSED or time.time() - job.created_at > slo
+
+@st.fragment(run_every=REPORT_POLL_SECONDS)
+def show_report_progress(job_id, response_count, degraded=False):
+    """Poll a running report job, showing the text generated so far"""
+    job = get_report_queue().get(job_id)
+    if job is None or job.finished or report_is_degraded(job) != degraded:
+        st.rerun()
+    if degraded:
+        st.caption("🔁 The full AI report will replace this analysis automatically as soon as it is ready.")
+        return
+    limiter = get_rate_limiter()
+    api_position = limiter.queue_position(job.key) if limiter is not None and not job.text else 0
+    if job.queue_position:
+        st.info(f"⏳ Your report is queued behind {job.queue_position - 1} other report(s)—it will start shortly.")
+    elif api_position:
+        st.info(f"⏳ Waiting for an AI request slot—position {api_position} in the queue.")
+    elif not job.text:
+        st.info("🔄 Generating your report—the first lines usually appear within a few seconds.")
+    else:
+        show_report_header(datetime.fromtimestamp(job.started_at), response_count)
+        st.markdown(job.text + " ▌")
+
+def show_bulk_import(uploaded):
+    """Score an uploaded survey export and display the organization-wide averages"""
+    from bulk_import import ImportFormatError, detect_format, import_responses
+    cached = st.session_state.get("bulk_import")
+    if cached and cached[0] == uploaded.file_id:
+        summary = cached[1]
+    else:
+        try:
+            with st.spinner("📥 Scoring uploaded responses..."):
+                report = import_responses(uploaded, detect_format(uploaded.name), get_scoring_engine())
+        except ImportFormatError as e:
+            st.error(f"❌ {e}")
+            return
+        summary = report.summary()
+        st.session_state.bulk_import = (uploaded.file_id, summary)
+
+    if not summary["respondents"]:
+        st.warning(f"⚠️ No valid responses found ({summary['rows_rejected']} row(s) rejected).")
+    else:
+        st.success(f"✅ Scored {summary['respondents']} respondents from {summary['rows_read']} rows.")
+        cols = st.columns(4)
+        cols[0].metric("Overall", f"{summary['overall']:.2f}/4.0")
+        for col, (category, score) in zip(cols[1:], summary["categories"].items()):
+            col.metric(category, f"{score:.2f}/4.0" if score is not None else "—")
+        st.markdown("\n".join(
+            ["| Pillar | Average |", "| --- | --- |"] +
+            [f"| {pillar} | {score:.2f} |" for pillar, score in summary["pillars"].items() if score is not None]
+        ))
+    if summary["rows_rejected"]:
+        st.warning(f"⚠️ {summary['rows_rejected']} row(s) were rejected.")
+        st.caption("\n".join(f"Row {e['row']}: {e['message']}" for e in summary["errors"][:10]))
+
+def show_team_survey(org):
+    """Invite link pooling colleagues' answers into org-wide results"""
+    st.markdown("### 👥 Survey Your Whole Team")
+    code = st.session_state.get("org_code")
+    if code is None:
+        st.markdown("One person's answers are a snapshot. Invite your colleagues to get org-wide scores with "
+                    "confidence intervals; individual answers are never shown.")
+        if st.button("🔗 Create a Team Survey Link"):
+            st.session_state.org_code = get_org_store().create_survey(org)
+            # From now on the creator is a team respondent, counted only through the pooled org row
+            if st.session_state.pop("recorded_responses", None) is not None:
+                get_benchmark_store().remove_assessment(st.session_state.assessment_id)
+            persist_session()
+            st.rerun()
+        return
+    st.markdown("Share this link. Everyone who completes the assessment through it is pooled into the org-wide results.")
+    st.code(f"{(st.context.url or '').split('?')[0]}?org={code}", language=None)
+
+PULSE_LABELS = {"day": "Daily", "week": "Weekly", "month": "Monthly"}
+TREND_SCORES = ["Overall", "Culture", "Wellness", "Growth"]
+
+@st.fragment
+def show_pulse_trends(org_code):
+    """Deltas against the previous pulse and trend lines, read from the precomputed rollups"""
+    st.markdown("### 📈 Pulse Trends")
+    granularity = st.segmented_control(
+        "Pulse period", GRANULARITIES, default="week", format_func=PULSE_LABELS.get, label_visibility="collapsed"
+    ) or "week"
+    pulse_store = get_pulse_store()
+    periods = pulse_store.trend(org_code, granularity, limit=int(get_setting("pulse_trend_periods", 12)))
+    if len(periods) < 2:
+        st.caption(f"📈 Trends appear once two {PULSE_LABELS[granularity].lower()} pulses have at least "
+                   f"{pulse_store.min_count} responses each.")
+        return
+    latest, previous = periods[-1], periods[-2]
+    for col, name in zip(st.columns(len(TREND_SCORES)), TREND_SCORES):
+        col.metric(name, f"{latest.means[name]:.2f}", f"{latest.means[name] - previous.means[name]:+.2f}")
+    st.caption(f"Pulse of {latest.period} ({latest.count} responses) against {previous.period} ({previous.count} responses)")
+    show_chart(
+        "trend", build_trend_figure,
+        tuple(period.period for period in periods),
+        tuple((name, tuple(period.means[name] for period in periods)) for name in TREND_SCORES)
+    )
+
+# --- Charts ---
+FIGURE_CACHE_ENTRIES = 256
+CHART_MARGIN = dict(l=50, r=50, t=50, b=50)
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def build_radar_figure(categories, scores, benchmark_scores, intervals=()):
+    """Radar of category scores against the benchmark, shared by identical reports
+
+    ``intervals`` holds a (low, high) pair per category, drawn as radial error bars.
+    """
+    import plotly.graph_objects as go
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatterpolar(
+        r=list(scores),
+        theta=list(categories),
+        fill='toself',
+        name='Your Organization',
+        fillcolor='rgba(102, 126, 234, 0.3)',
+        line=dict(color='rgba(102, 126, 234, 1)', width=3)
+    ))
+
+    fig.add_trace(go.Scatterpolar(
+        r=list(benchmark_scores),
+        theta=list(categories),
+        fill='toself',
+        name='Industry Benchmark',
+        fillcolor='rgba(255, 107, 107, 0.2)',
+        line=dict(color='rgba(255, 107, 107, 1)', width=2, dash='dash')
+    ))
+
+    if intervals:
+        r, theta = [], []
+        for category, (low, high) in zip(categories, intervals):
+            r += [low, high, None]
+            theta += [category, category, None]
+        fig.add_trace(go.Scatterpolar(
+            r=r,
+            theta=theta,
+            mode='lines+markers',
+            name='Confidence Interval',
+            line=dict(color='rgba(102, 126, 234, 1)', width=2),
+            marker=dict(size=6)
+        ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 4],
+                tickvals=[0, 1, 2, 3, 4],
+                ticktext=['0', '1', '2', '3', '4']
+            )
+        ),
+        showlegend=True,
+        height=500,
+        font=dict(size=12),
+        margin=CHART_MARGIN
+    )
+    return fig
+
+def show_chart(name, build, *args):
+    """Build (usually from cache) and send a figure, timing both when metrics are on"""
+    metrics = get_metrics()
+    if metrics is None:
+        st.plotly_chart(build(*args), use_container_width=True)
+        return
+    with metrics.timer("thrivya_chart_render_seconds", chart=name):
+        st.plotly_chart(build(*args), use_container_width=True)
+
+def _score_bar(labels, values, horizontal=False, show_scale=True):
+    import plotly.graph_objects as go
+    return go.Bar(
+        x=list(values) if horizontal else list(labels),
+        y=list(labels) if horizontal else list(values),
+        orientation='h' if horizontal else 'v',
+        marker=dict(color=list(values), colorscale="RdYlGn", showscale=show_scale),
+        showlegend=False
+    )
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def build_distribution_figure(response_counts):
+    """Bar chart of how often each answer level was chosen"""
+    import plotly.graph_objects as go
+    levels, counts = zip(*response_counts)
+    fig = go.Figure(_score_bar(levels, counts))
+    fig.update_layout(title="Response Distribution", height=400, margin=CHART_MARGIN)
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def build_pillar_figure(pillar_scores):
+    """Horizontal bar chart of per-pillar averages"""
+    import plotly.graph_objects as go
+    pillars, scores = zip(*pillar_scores)
+    fig = go.Figure(_score_bar(pillars, scores, horizontal=True))
+    fig.update_layout(title="Pillar-wise Scores", height=400, margin=CHART_MARGIN)
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def build_insights_figure(response_counts, pillar_scores):
+    """Response distribution and pillar scores side by side in one figure"""
+    from plotly.subplots import make_subplots
+    fig = make_subplots(rows=1, cols=2, subplot_titles=("Response Distribution", "Pillar-wise Scores"), horizontal_spacing=0.25)
+    levels, counts = zip(*response_counts)
+    pillars, scores = zip(*pillar_scores)
+    fig.add_trace(_score_bar(levels, counts, show_scale=False), row=1, col=1)
+    fig.add_trace(_score_bar(pillars, scores, horizontal=True), row=1, col=2)
+    fig.update_layout(height=450, margin=CHART_MARGIN)
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def build_trend_figure(periods, series):
+    """Line chart of pulse averages per period"""
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    for name, values in series:
+        fig.add_trace(go.Scatter(
+            x=list(periods),
+            y=list(values),
+            mode='lines+markers',
+            name=name,
+            line=dict(color=pillar_colors.get(name, '#2c3e50'), width=3 if name == "Overall" else 2)
+        ))
+    fig.update_layout(yaxis=dict(range=[0, 4]), height=400, margin=CHART_MARGIN)
+    return fig
 
 # --- Page Navigation ---
-if st.session_state.page == "intro":
+def render_intro():
+    """Landing page introducing Thrivya"""
     st.markdown('<div class="main-container">', unsafe_allow_html=True)
     st.markdown("""
     <div class="main-header">
@@ -387,6 +758,12 @@ if st.session_state.page == "intro":
     </div>
     """, unsafe_allow_html=True)
 
+    if st.session_state.get("org_code"):
+        st.info(
+            f"👥 You've been invited to the {st.session_state.org_info['name'] or 'team'} culture survey. "
+            f"Answers are only ever shown pooled with at least {get_org_store().min_group_size} respondents."
+        )
+
     st.markdown("""
     <div class="intro-features">
         <div class="feature-item culture-card">
@@ -434,8 +811,27 @@ if st.session_state.page == "intro":
         if st.button("🚀 Start Your Culture Assessment", use_container_width=True):
             st.session_state.page = "details"
             st.session_state.assessment_start_time = datetime.now()
+            if not st.session_state.get("session_token"):
+                st.session_state.session_token = new_resume_token()
+                st.query_params["resume"] = st.session_state.session_token
+            persist_session()
             st.rerun()
 
+    with st.expander("💾 Resume a Saved Assessment"):
+        resume_code = st.text_input("Resume code", placeholder="Paste the resume code shown during your assessment")
+        if st.button("Resume Assessment", disabled=not resume_code):
+            if restore_session(resume_code.strip()):
+                st.rerun()
+            else:
+                st.error("❌ No saved assessment found for that resume code.")
+
+    with st.expander("📥 Bulk Import Survey Responses"):
+        st.markdown("Upload a CSV or JSONL export from your survey tool to score every respondent at once. "
+                    "Use one column (or JSON key) per question ID and answers from the slider scale.")
+        uploaded = st.file_uploader("Survey export", type=["csv", "jsonl", "ndjson"], label_visibility="collapsed")
+        if uploaded is not None:
+            show_bulk_import(uploaded)
+
     st.markdown("""
     <div class="brand-footer">
         <p style="margin: 0; font-size: 0.9rem; opacity: 0.8;">Crafted by Hemaang Patkar</p>
@@ -444,7 +840,9 @@ if st.session_state.page == "intro":
     """, unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
-elif st.session_state.page == "details":
+
+def render_details():
+    """Organization profile form"""
     st.markdown('<div class="main-container">', unsafe_allow_html=True)
     st.markdown("""
     <div class="main-header">
@@ -501,147 +899,150 @@ elif st.session_state.page == "details":
             next_btn = st.form_submit_button("Next: Culture Assessment →", use_container_width=True)
 
         if back_btn:
-            st.session_state.page = "intro"
-            st.rerun()
+            go_to_page("intro")
         if next_btn:
             if st.session_state.org_info['name'] and st.session_state.org_info['industry']:
-                st.session_state.page = "culture"
-                st.rerun()
+                go_to_page("culture")
             else:
                 st.error("Please fill in at least Organization Name and Industry to continue.")
     st.markdown('</div>', unsafe_allow_html=True)
 
-elif st.session_state.page == "culture":
-    st.markdown('<div class="main-container">', unsafe_allow_html=True)
-    st.markdown("""
-    <div class="main-header">
-        <h1 class="main-title">🎯 Culture Assessment</h1>
-        <p class="main-subtitle">Leadership, Inclusion, Recognition & Compensation</p> </div>
-    """, unsafe_allow_html=True)
 
-    show_progress_bar()
-
-    st.markdown('<div class="slider-note">📌 Note: Use the guide below to align your slider responses accurately.</div>', unsafe_allow_html=True)
-    st.markdown("""
-    <div class="slider-guide">
-        <div class="slider-guide-box slider-guide-strongly-disagree">Strongly Disagree</div>
-        <div class="slider-guide-box slider-guide-disagree">Disagree</div>
-        <div class="slider-guide-box slider-guide-neutral">Neutral</div>
-        <div class="slider-guide-box slider-guide-agree">Agree</div>
-        <div class="slider-guide-box slider-guide-strongly-agree">Strongly Agree</div>
-    </div>
-    """, unsafe_allow_html=True)
+SLIDER_GUIDE_HTML = """
+<div class="slider-guide">
+    <div class="slider-guide-box slider-guide-strongly-disagree">Strongly Disagree</div>
+    <div class="slider-guide-box slider-guide-disagree">Disagree</div>
+    <div class="slider-guide-box slider-guide-neutral">Neutral</div>
+    <div class="slider-guide-box slider-guide-agree">Agree</div>
+    <div class="slider-guide-box slider-guide-strongly-agree">Strongly Agree</div>
+</div>
+"""
 
-    questions_culture = [q for q in questions if pillar_map[q['pillar']] == "Culture"]
+def go_to_page(page, question=0):
+    """Switch page with a full rerun; question -1 opens on the last question
+
+    Leaving for the results page with questions unanswered opens the first
+    unanswered question instead.
+    """
+    if page == "results":
+        unanswered = st.session_state.responses.unanswered()
+        if unanswered:
+            first = question_bank[unanswered[0]]
+            category = question_bank.category_of(first['id'])
+            question = question_bank.by_category[category].index(first)
+            page = category.lower()
+            st.session_state.missing_notice = (
+                f"⚠️ Please answer all questions before generating the report. {len(unanswered)} question(s) "
+                f"are still missing, starting with {category} question {question + 1}: “{first['question']}”"
+            )
+    st.session_state.page = page
+    st.session_state.current_question = question
+    persist_session()
+    st.rerun()
+
+def step_question(delta):
+    """Button callback moving to the previous or next question on the same page"""
+    st.session_state.current_question += delta
+    persist_session()
+
+@st.fragment
+def show_question_step(category, back_page, back_label, next_page, next_label):
+    """Progress bar and the active question card; reruns on its own as the user answers"""
+    category_questions = question_bank.by_category[category]
+    total = len(category_questions)
+    index = st.session_state.current_question
+    index = max(0, min(index if index >= 0 else total + index, total - 1))
+    st.session_state.current_question = index
+
+    progress_slot = st.empty()
+    show_enhanced_slider(category_questions[index], index, total, category)
+    with progress_slot.container():
+        show_progress_bar()
+
+    # Moves within the page only rerun this fragment; leaving the page needs a full rerun
+    col1, col2 = st.columns([1, 1], gap="medium")
+    with col1:
+        if index > 0:
+            st.button("← Previous Question", key=f"step_back_{category}", on_click=step_question, args=(-1,))
+        elif st.button(back_label, key=f"leave_back_{category}"):
+            go_to_page(back_page, -1)
+    with col2:
+        if index < total - 1:
+            st.button("Next Question →", key=f"step_next_{category}", on_click=step_question, args=(1,),
+                      use_container_width=True)
+        elif st.button(next_label, key=f"leave_next_{category}", use_container_width=True):
+            go_to_page(next_page)
+
+def show_question_form(category, back_page, back_label, next_page, next_label):
+    """Every question of a category on one form, submitted with a full rerun"""
+    show_progress_bar()
+    category_questions = question_bank.by_category[category]
 
-    with st.form("culture_form"):
-        for i, q in enumerate(questions_culture):
-            show_enhanced_slider(q, i, len(questions_culture), "Culture")
+    with st.form(f"{category.lower()}_form"):
+        for i, q in enumerate(category_questions):
+            show_enhanced_slider(q, i, len(category_questions), category)
 
         col1, col2 = st.columns([1, 1], gap="medium")
         with col1:
-            back_btn = st.form_submit_button("← Back to Details")
+            back_btn = st.form_submit_button(back_label)
         with col2:
-            next_btn = st.form_submit_button("Next: Wellness Assessment →", use_container_width=True)
+            next_btn = st.form_submit_button(next_label, use_container_width=True)
 
         if back_btn:
-            st.session_state.page = "details"
-            st.rerun()
+            go_to_page(back_page)
         if next_btn:
-            st.session_state.page = "wellness"
-            st.rerun()
-    st.markdown('</div>', unsafe_allow_html=True)
+            go_to_page(next_page)
 
-elif st.session_state.page == "wellness":
+def render_assessment_page(category, title, subtitle, back_page, back_label, next_page, next_label):
+    """Static page chrome plus the questions for one category"""
     st.markdown('<div class="main-container">', unsafe_allow_html=True)
-    st.markdown("""
+    st.markdown(f"""
     <div class="main-header">
-        <h1 class="main-title">🧘 Wellness Assessment</h1>
-        <p class="main-subtitle">Mental Health, Feedback & Work-Life Balance</p>
+        <h1 class="main-title">{title}</h1>
+        <p class="main-subtitle">{subtitle}</p>
     </div>
     """, unsafe_allow_html=True)
 
-    show_progress_bar()
-
     st.markdown('<div class="slider-note">📌 Note: Use the guide below to align your slider responses accurately.</div>', unsafe_allow_html=True)
-    st.markdown("""
-    <div class="slider-guide">
-        <div class="slider-guide-box slider-guide-strongly-disagree">Strongly Disagree</div>
-        <div class="slider-guide-box slider-guide-disagree">Disagree</div>
-        <div class="slider-guide-box slider-guide-neutral">Neutral</div>
-        <div class="slider-guide-box slider-guide-agree">Agree</div>
-        <div class="slider-guide-box slider-guide-strongly-agree">Strongly Agree</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-    questions_wellness = [q for q in questions if pillar_map[q['pillar']] == "Wellness"]
-
-    with st.form("wellness_form"):
-        for i, q in enumerate(questions_wellness):
-            show_enhanced_slider(q, i, len(questions_wellness), "Wellness")
-
-        col1, col2 = st.columns([1, 1], gap="medium")
-        with col1:
-            back_btn = st.form_submit_button("← Back to Culture")
-        with col2:
-            next_btn = st.form_submit_button("Next: Growth Assessment →", use_container_width=True)
-
-        if back_btn:
-            st.session_state.page = "culture"
-            st.rerun()
-        if next_btn:
-            st.session_state.page = "growth"
-            st.rerun()
+    st.markdown(SLIDER_GUIDE_HTML, unsafe_allow_html=True)
+    if "missing_notice" in st.session_state:
+        st.warning(st.session_state.pop("missing_notice"))
+
+    # Stepped mode answers inside a fragment, so the header and guide above are
+    # only sent on page changes rather than on every slider move
+    if get_setting("survey_mode", "stepped") == "form":
+        show_question_form(category, back_page, back_label, next_page, next_label)
+    else:
+        show_question_step(category, back_page, back_label, next_page, next_label)
     st.markdown('</div>', unsafe_allow_html=True)
 
-elif st.session_state.page == "growth":
-    st.markdown('<div class="main-container">', unsafe_allow_html=True)
-    st.markdown("""
-    <div class="main-header">
-        <h1 class="main-title">📈 Growth Assessment</h1>
-        <p class="main-subtitle">Learning, Empowerment & Team Dynamics</p>
-    </div>
-    """, unsafe_allow_html=True)
 
-    show_progress_bar()
+def render_culture():
+    """Culture pillar questions"""
+    render_assessment_page(
+        "Culture", "🎯 Culture Assessment", "Leadership, Inclusion, Recognition & Compensation",
+        "details", "← Back to Details", "wellness", "Next: Wellness Assessment →"
+    )
 
-    st.markdown('<div class="slider-note">📌 Note: Use the guide below to align your slider responses accurately.</div>', unsafe_allow_html=True)
-    st.markdown("""
-    <div class="slider-guide">
-        <div class="slider-guide-box slider-guide-strongly-disagree">Strongly Disagree</div>
-        <div class="slider-guide-box slider-guide-disagree">Disagree</div>
-        <div class="slider-guide-box slider-guide-neutral">Neutral</div>
-        <div class="slider-guide-box slider-guide-agree">Agree</div>
-        <div class="slider-guide-box slider-guide-strongly-agree">Strongly Agree</div>
-    </div>
-    """, unsafe_allow_html=True)
 
-    questions_growth = [q for q in questions if pillar_map[q['pillar']] == "Growth"]
+def render_wellness():
+    """Wellness pillar questions"""
+    render_assessment_page(
+        "Wellness", "🧘 Wellness Assessment", "Mental Health, Feedback & Work-Life Balance",
+        "culture", "← Back to Culture", "growth", "Next: Growth Assessment →"
+    )
 
-    with st.form("growth_form"):
-        for i, q in enumerate(questions_growth):
-            show_enhanced_slider(q, i, len(questions_growth), "Growth")
 
-        col1, col2 = st.columns([1, 1], gap="medium")
-        with col1:
-            back_btn = st.form_submit_button("← Back to Wellness")
-        with col2:
-            generate_btn = st.form_submit_button("🎯 Generate Culture Intelligence Report", use_container_width=True)
+def render_growth():
+    """Growth pillar questions"""
+    render_assessment_page(
+        "Growth", "📈 Growth Assessment", "Learning, Empowerment & Team Dynamics",
+        "wellness", "← Back to Wellness", "results", "🎯 Generate Culture Intelligence Report"
+    )
 
-        if back_btn:
-            st.session_state.page = "wellness"
-            st.rerun()
-        if generate_btn:
-            # Validate that all questions have been answered
-            unanswered = [q['id'] for q in questions if q['id'] not in st.session_state.responses]
-            if unanswered:
-                st.warning(f"⚠️ Please answer all questions before generating the report. Missing responses for {len(unanswered)} question(s).")
-            else:
-                st.session_state.page = "results"
-                st.rerun()
-    st.markdown('</div>', unsafe_allow_html=True)
 
-elif st.session_state.page == "results":
+def render_results():
+    """Scores, benchmarks and the AI-generated report"""
     st.markdown('<div class="main-container">', unsafe_allow_html=True)
     st.markdown("""
     <div class="main-header">
@@ -654,26 +1055,61 @@ elif st.session_state.page == "results":
     org = st.session_state.org_info
 
     # Score Calculation
-    scores = {'Culture': 0, 'Wellness': 0, 'Growth': 0}
-    counts = {'Culture': 0, 'Wellness': 0, 'Growth': 0}
-    detailed_scores = {}
-
-    for q in questions:
-        resp = responses.get(q['id'])
-        if resp:
-            pillar = q['pillar']
-            category = pillar_map[pillar]
-            score = LEVEL_SCORE[resp]
-
-            scores[category] += score
-            counts[category] += 1
-
-            if pillar not in detailed_scores:
-                detailed_scores[pillar] = []
-            detailed_scores[pillar].append(score)
+    scoring_engine = get_scoring_engine()
+    avg_scores, overall_score, pillar_scores = scoring_engine.summarize(
+        scoring_engine.score(scoring_engine.encode_codes(responses.codes))
+    )
 
-    avg_scores = {p: round(scores[p] / counts[p], 2) if counts[p] else 0 for p in scores}
-    overall_score = round(sum(avg_scores.values()) / len(avg_scores), 2)
+    # Persist the completed assessment once per distinct set of answers
+    if "assessment_id" not in st.session_state:
+        st.session_state.assessment_id = uuid.uuid4().hex
+    benchmark_store = get_benchmark_store()
+    org_code = st.session_state.get("org_code")
+    if not org_code and st.session_state.get("recorded_responses") != responses:
+        benchmark_store.record_assessment(
+            st.session_state.assessment_id, org, avg_scores, overall_score, pillar_scores, responses.to_dict()
+        )
+        st.session_state.recorded_responses = responses.copy()
+        persist_session()
+
+    # Organization survey: pool with colleagues' answers once the group is large enough
+    org_results = None
+    if org_code:
+        org_store = get_org_store()
+        new_answers = st.session_state.get("org_recorded_responses") != responses
+        if new_answers:
+            org_store.add_response(
+                org_code, st.session_state.assessment_id, question_bank.digest, scoring_engine, responses.codes
+            )
+            get_pulse_store().record(
+                st.session_state.assessment_id, org_code,
+                dict(avg_scores, Overall=overall_score, **pillar_scores), time.time()
+            )
+            st.session_state.org_recorded_responses = responses.copy()
+            persist_session()
+        org_results = org_store.results(org_code, question_bank.digest, scoring_engine)
+        if new_answers and org_results is not None and org_results.visible:
+            # The whole organization counts once in the industry benchmark, with its pooled scores
+            benchmark_store.record_assessment(
+                f"org:{org_code}", org, org_results.avg_scores, org_results.overall_score,
+                org_results.pillar_scores, org_results.question_means
+            )
+    benchmark = benchmark_store.lookup(org)
+    org_view = org_results is not None and org_results.visible
+    intervals = org_results.intervals if org_view else {}
+    if org_view:
+        avg_scores, overall_score, pillar_scores = (
+            org_results.avg_scores, org_results.overall_score, org_results.pillar_scores
+        )
+        st.info(
+            f"👥 Org-wide results from {org_results.respondents} respondents. "
+            f"Ranges are {org_results.confidence:.0%} bootstrap confidence intervals."
+        )
+    elif org_results is not None:
+        st.info(
+            f"👥 Org-wide results appear once {get_org_store().min_group_size} people have responded "
+            f"({org_results.respondents} so far). Until then these are your own answers."
+        )
 
     # Executive Summary Cards
     st.markdown("### 🎯 Executive Summary")
@@ -685,7 +1121,7 @@ elif st.session_state.page == "results":
         <div class="metric-card">
             <div style="font-size: 2.5rem;">{overall_icon}</div>
             <div style="font-size: 1.5rem; font-weight: 700; color: #2c3e50;">{overall_score}/4.0</div>
-            <div style="font-size: 0.9rem; color: #7f8c8d;">Overall Culture Score</div>
+            <div style="font-size: 0.9rem; color: #7f8c8d;">Overall Culture Score</div>{interval_html(intervals, "Overall")}
         </div>
         """, unsafe_allow_html=True)
 
@@ -705,69 +1141,44 @@ elif st.session_state.page == "results":
             <div class="metric-card {card_class}">
                 <div style="font-size: 2.5rem;">{icon}</div>
                 <div style="font-size: 1.5rem; font-weight: 700; color: {pillar_colors[category]};">{score}/4.0</div>
-                <div style="font-size: 0.9rem; color: #7f8c8d;">{category}</div>
+                <div style="font-size: 0.9rem; color: #7f8c8d;">{category}</div>{interval_html(intervals, category)}
             </div>
             """, unsafe_allow_html=True)
 
     # Enhanced Radar Chart
     st.markdown("### 📊 Culture Intelligence Radar")
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatterpolar(
-        r=list(avg_scores.values()),
-        theta=list(avg_scores.keys()),
-        fill='toself',
-        name='Your Organization',
-        fillcolor='rgba(102, 126, 234, 0.3)',
-        line=dict(color='rgba(102, 126, 234, 1)', width=3)
-    ))
-
-    benchmark_scores = [3.2, 2.8, 3.0] # These would ideally come from actual benchmark data
-    fig.add_trace(go.Scatterpolar(
-        r=benchmark_scores,
-        theta=list(avg_scores.keys()),
-        fill='toself',
-        name='Industry Benchmark',
-        fillcolor='rgba(255, 107, 107, 0.2)',
-        line=dict(color='rgba(255, 107, 107, 1)', width=2, dash='dash')
-    ))
-
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 4],
-                tickvals=[0, 1, 2, 3, 4],
-                ticktext=['0', '1', '2', '3', '4']
-            )
-        ),
-        showlegend=True,
-        height=500,
-        font=dict(size=12),
-        margin=dict(l=50, r=50, t=50, b=50)
+    benchmark_means = benchmark.means if benchmark else DEFAULT_BENCHMARK_SCORES
+    show_chart(
+        "radar", build_radar_figure,
+        tuple(avg_scores),
+        tuple(avg_scores.values()),
+        tuple(benchmark_means[category] for category in avg_scores),
+        tuple(intervals[category] for category in avg_scores) if intervals else ()
     )
-
-    st.plotly_chart(fig, use_container_width=True)
+    if benchmark:
+        st.caption(f"📏 Benchmark: {benchmark.label} · average of {benchmark.count} completed assessments")
+    else:
+        st.caption("📏 Benchmark: reference values until enough comparable assessments have been completed")
 
     # Detailed Breakdown
     st.markdown("### 🔍 Detailed Analysis")
-    culture_pillars = [p for p in detailed_scores.keys() if pillar_map[p] == "Culture"]
-    wellness_pillars = [p for p in detailed_scores.keys() if pillar_map[p] == "Wellness"]
-    growth_pillars = [p for p in detailed_scores.keys() if pillar_map[p] == "Growth"]
+    culture_pillars = [p for p in pillar_scores if question_bank.pillar_category[p] == "Culture"]
+    wellness_pillars = [p for p in pillar_scores if question_bank.pillar_category[p] == "Wellness"]
+    growth_pillars = [p for p in pillar_scores if question_bank.pillar_category[p] == "Growth"]
 
     col1, col2, col3 = st.columns([1, 1, 1], gap="medium")
 
     with col1:
         st.markdown("#### 🎯 Culture Pillars")
         for pillar in culture_pillars:
-            pillar_avg = round(np.mean(detailed_scores[pillar]), 2)
+            pillar_avg = pillar_scores[pillar]
             status, class_name, icon = get_score_interpretation(pillar_avg)
             st.markdown(f"""
             <div class="pillar-card culture-card">
                 <div style="display: flex; justify-content: space-between; align-items: center;">
                     <div>
                         <div style="font-weight: 600; color: #2c3e50;">{pillar}</div>
-                        <div style="font-size: 0.9rem; color: #7f8c8d;">{status}</div>
+                        <div style="font-size: 0.9rem; color: #7f8c8d;">{status}</div>{interval_html(intervals, pillar)}
                     </div>
                     <div style="font-size: 1.5rem; font-weight: 700; color: {pillar_colors['Culture']};">{pillar_avg}</div>
                 </div>
@@ -777,14 +1188,14 @@ elif st.session_state.page == "results":
     with col2:
         st.markdown("#### 🧘 Wellness Pillars")
         for pillar in wellness_pillars:
-            pillar_avg = round(np.mean(detailed_scores[pillar]), 2)
+            pillar_avg = pillar_scores[pillar]
             status, class_name, icon = get_score_interpretation(pillar_avg)
             st.markdown(f"""
             <div class="pillar-card wellness-card">
                 <div style="display: flex; justify-content: space-between; align-items: center;">
                     <div>
                         <div style="font-weight: 600; color: #2c3e50;">{pillar}</div>
-                        <div style="font-size: 0.9rem; color: #7f8c8d;">{status}</div>
+                        <div style="font-size: 0.9rem; color: #7f8c8d;">{status}</div>{interval_html(intervals, pillar)}
                     </div>
                     <div style="font-size: 1.5rem; font-weight: 700; color: {pillar_colors['Wellness']};">{pillar_avg}</div>
                 </div>
@@ -794,226 +1205,128 @@ elif st.session_state.page == "results":
     with col3:
         st.markdown("#### 📈 Growth Pillars")
         for pillar in growth_pillars:
-            pillar_avg = round(np.mean(detailed_scores[pillar]), 2)
+            pillar_avg = pillar_scores[pillar]
             status, class_name, icon = get_score_interpretation(pillar_avg)
             st.markdown(f"""
             <div class="pillar-card growth-card">
                 <div style="display: flex; justify-content: space-between; align-items: center;">
                     <div>
                         <div style="font-weight: 600; color: #2c3e50;">{pillar}</div>
-                        <div style="font-size: 0.9rem; color: #7f8c8d;">{status}</div>
+                        <div style="font-size: 0.9rem; color: #7f8c8d;">{status}</div>{interval_html(intervals, pillar)}
                     </div>
                     <div style="font-size: 1.5rem; font-weight: 700; color: {pillar_colors['Growth']};">{pillar_avg}</div>
                 </div>
             </div>
             """, unsafe_allow_html=True)
 
+    if org_code:
+        show_pulse_trends(org_code)
+
     # AI-Generated Recommendations
     st.markdown("### 🤖 AI-Powered Recommendations")
     try:
-        detailed_answers = []
-        for q in questions:
-            if q['id'] in responses:
-                detailed_answers.append(f"• {q['pillar']} - {q['question']}: {responses[q['id']]} ({LEVEL_SCORE[responses[q['id']]]}/4)")
-
-        detailed_answers_str = "\n".join(detailed_answers)
-
-        enhanced_prompt = f"""
-You are a senior Culture & People Analytics Consultant with 15+ years of experience helping organizations transform their workplace culture. You've worked with Fortune 500 companies and startups across various industries.
-
-Based on the comprehensive culture intelligence data below, provide a detailed strategic analysis and action plan:
-
-## ORGANIZATION PROFILE:
-🏢 **Company**: {org.get('name', 'N/A')} | **Industry**: {org.get('industry', 'N/A')} | **Size**: {org.get('size', 'N/A')} | **Location**: {org.get('location', 'N/A')}
-📅 **Years Active**: {org.get('years_active', 'N/A')} | **Work Model**: {org.get('remote_work', 'N/A')}
-🎯 **Cultural Priorities**: {', '.join(org.get('culture_focus', []))}
-⚠️ **Current Challenges**: {', '.join(org.get('current_challenges', []))}
-
-## CULTURE INTELLIGENCE SCORES:
-📊 **Overall Score**: {overall_score}/4.0 ({get_score_interpretation(overall_score)[0]})
-- 🎯 **Culture**: {avg_scores['Culture']}/4.0 ({get_score_interpretation(avg_scores['Culture'])[0]})
-- 🧘 **Wellness**: {avg_scores['Wellness']}/4.0 ({get_score_interpretation(avg_scores['Wellness'])[0]})
-- 📈 **Growth**: {avg_scores['Growth']}/4.0 ({get_score_interpretation(avg_scores['Growth'])[0]})
-
-## DETAILED PILLAR ANALYSIS:
-**Culture Pillar Analysis:**
-- Leadership & Vision effectiveness
-- Inclusivity & Belonging assessment
-- Recognition & Motivation patterns
-- Compensation & Benefits fairness and transparency # NEW ADDITION
-
-**Wellness Pillar Analysis:**
-- Well-being & Work-Life balance status
-- Feedback & Communication effectiveness
-
-**Growth Pillar Analysis:**
-- Learning & Development opportunities
-- Team Dynamics & Trust levels
-- Autonomy & Empowerment culture
-
-## STRATEGIC ACTION PLAN
-**Immediate Actions (0-30 days):**
-- List 3-5 quick wins that can be implemented immediately
-- Focus on high-impact, low-cost initiatives
-- Include specific steps and responsible parties
-
-**Short-term Initiatives (30-90 days):**
-- 3-5 medium-term projects with clear timelines
-- Include resource requirements and success metrics
-- Focus on addressing the lowest scoring pillars
-
-**Long-term Strategy (90-365 days):**
-- 2-3 transformational initiatives
-- Include change management considerations
-- Focus on sustainable culture transformation
-
-## RECOMMENDED TOOLS & RESOURCES
-**HR Tech Stack:**
-- Suggest specific software/platforms for the identified challenges
-- Include employee engagement platforms, feedback tools, learning management systems
-
-**Templates & Frameworks:**
-- Provide specific templates for implementation
-- Include measurement frameworks and KPIs
-- Suggest industry-specific best practices
-
-**Training & Development:**
-- Recommend specific training programs
-- Include leadership development initiatives
-- Suggest both internal and external resources
-
-## SUCCESS METRICS & KPIs
-**Culture Metrics:**
-- Define specific, measurable KPIs for each pillar
-- Include baseline measurements and target improvements
-- Suggest measurement frequency and methods
-
-**ROI Indicators:**
-- Link culture improvements to business outcomes
-- Include engagement, retention, and productivity metrics
-- Suggest cost-benefit analysis frameworks
-
-## INDUSTRY-SPECIFIC CONSIDERATIONS
-Provide {org.get('industry', 'industry')}-specific insights:
-- Common culture challenges in this industry
-- Industry benchmarks and best practices
-- Regulatory/compliance considerations if applicable
-
-## RISK MITIGATION
-**Change Management Risks:**
-- Identify potential resistance points
-- Suggest mitigation strategies
-- Include communication plans
-
-**Implementation Risks:**
-- Highlight resource constraints
-- Suggest phased implementation approaches
-- Include contingency plans
-
-FORMAT: Use clear headings, bullet points, and actionable language. Make recommendations specific, measurable, and time-bound. Include relevant emojis for visual appeal and readability.
-
-TONE: Professional yet accessible, data-driven but human-centered, optimistic but realistic about challenges.
-"""
-
-        with st.spinner("🔄 Processing with advanced AI intelligence using optimized prompts—will take about a minute!"):
-            cohere_api_key = st.secrets.get("cohere_api_key")
-            if cohere_api_key:
-                try:
-                    response = requests.post(
-                        url="https://api.cohere.ai/v1/chat",
-                        headers={
-                            "Authorization": f"Bearer {cohere_api_key}",
-                            "Content-Type": "application/json"
-                        },
-                        json={
-                            "model": "command-r-plus-08-2024",
-                            "message": enhanced_prompt,
-                            "temperature": 0.7,
-                            "max_tokens": 4096
-                        },
-                        timeout=180
+        if org_view:
+            answers = [
+                (q['pillar'], q['question'], org_results.question_means[q['id']])
+                for q in questions if q['id'] in org_results.question_means
+            ]
+        else:
+            answers = [(q['pillar'], q['question'], responses.code(q['id'])) for q in questions if q['id'] in responses]
+        max_prompt_tokens = int(get_setting("report_prompt_max_tokens", DEFAULT_MAX_PROMPT_TOKENS))
+        enhanced_prompt = build_report_prompt(org, avg_scores, overall_score, pillar_scores, answers, max_prompt_tokens)
+
+        cohere_api_key = get_setting("cohere_api_key")
+        if cohere_api_key:
+            report_cache = get_report_cache()
+            cache_key = get_report_cache_key(enhanced_prompt)
+            cached = report_cache.get(cache_key)
+            metrics = get_metrics()
+            library = get_report_library()
+            match = None
+            if not cached and library is not None and st.session_state.get("skip_library_for") != cache_key:
+                match = library.nearest(org, avg_scores, pillar_scores)
+            if cached:
+                if metrics is not None:
+                    metrics.inc("thrivya_report_requests_total", source="cache")
+                show_report_header(datetime.fromtimestamp(cached.created_at), len(responses))
+                st.markdown(cached.text)
+            elif match:
+                if metrics is not None:
+                    metrics.inc("thrivya_report_requests_total", source="library")
+                show_report_header(datetime.fromtimestamp(match.created_at), len(responses))
+                st.markdown(adapt_report(match, org, library.max_distance))
+                if st.button("✨ Generate a report just for us"):
+                    st.session_state.skip_library_for = cache_key
+                    st.rerun()
+            else:
+                on_done = None
+                if library is not None:
+                    library_org = dict(org)
+                    on_done = lambda text: library.add(cache_key, library_org, avg_scores, pillar_scores, text)
+                job = get_report_queue().get(st.session_state.get("report_job_id"))
+                if job is None or job.key != cache_key:
+                    if metrics is not None:
+                        metrics.inc("thrivya_report_requests_total", source="generated")
+                    st.session_state.report_job_id = submit_report_job(
+                        cache_key, enhanced_prompt, cohere_api_key,
+                        report_section_prompts(org, avg_scores, overall_score, pillar_scores, answers, max_prompt_tokens),
+                        on_done
                     )
+                    job = get_report_queue().get(st.session_state.report_job_id)
+                if job.status == DONE:
+                    show_report_header(datetime.fromtimestamp(job.finished_at), len(responses))
+                    st.markdown(job.text)
+                elif job.status == FAILED:
+                    st.error(describe_report_error(job.error))
+                    if st.button("🔄 Retry AI Report"):
+                        st.session_state.report_job_id = submit_report_job(
+                            cache_key, enhanced_prompt, cohere_api_key,
+                            report_section_prompts(org, avg_scores, overall_score, pillar_scores, answers, max_prompt_tokens),
+                            on_done
+                        )
+                        st.rerun()
+                    show_basic_analysis(org, avg_scores, overall_score, pillar_scores)
+                elif report_is_degraded(job):
+                    # Keep users within the latency budget while the provider is slow or down
+                    st.info("⚡ The AI service is slow or unavailable right now, so here is an instant rule-based analysis.")
+                    show_basic_analysis(org, avg_scores, overall_score, pillar_scores)
+                    show_report_progress(job.id, len(responses), degraded=True)
+                else:
+                    show_report_progress(job.id, len(responses))
 
-                    if response.status_code == 200:
-                        result = response.json().get("text", "No AI response returned.")
-                        st.markdown(f"""
-                        <div class="recommendation-box">
-                            <h3 style="margin-top: 0; color: #2c3e50;">🤖 AI-Generated Culture Intelligence Report</h3>
-                            <p style="margin-bottom: 0; color: #7f8c8d; font-size: 0.9rem;">
-                                Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p UTC')}
-                                | Based on {len(responses)} responses
-                            </p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        st.markdown(result)
-                    else:
-                        st.error(f"❌ API Error: {response.status_code} - {response.text}")
-                except requests.exceptions.Timeout:
-                    st.error("❌ Request timeout. Please try again.")
-                except requests.exceptions.RequestException as e:
-                    st.error(f"❌ Network error: {str(e)}")
-                except Exception as e:
-                    st.error(f"❌ Unexpected error: {str(e)}")
+            cache_stats = report_cache.stats()
+            if cached:
+                source = "⚡ Served from report cache"
+            elif match:
+                source = f"📚 Reused from report library (scores within {match.distance:g})"
             else:
-                st.warning("⚠️ Cohere API key not found in secrets. Please configure your API key to generate AI recommendations.")
-                st.markdown("""
-                <div class="recommendation-box">
-                    <h3 style="margin-top: 0;">📋 Basic Culture Analysis</h3>
-                    <p>Based on your responses, here are some general observations:</p>
-                </div>
-                """, unsafe_allow_html=True)
-                if overall_score >= 3.5:
-                    st.success("🌟 Your organization shows excellent cultural health across all dimensions!")
-                elif overall_score >= 2.5:
-                    st.info("👍 Your organization has a solid cultural foundation with room for targeted improvements.")
-                else:
-                    st.warning("⚠️ Your organization has significant opportunities for cultural enhancement.")
-                lowest_score = min(avg_scores.items(), key=lambda x: x[1])
-                st.markdown(f"""
-                **Priority Focus Area:** {lowest_score[0]} (Score: {lowest_score[1]}/4.0)
-
-                **General Recommendations:**
-                - Focus on improving {lowest_score[0].lower()} initiatives
-                - Conduct focus groups to understand specific pain points
-                - Implement regular pulse surveys to track progress
-                - Consider leadership training programs
-                - Review and update policies related to your lowest-scoring areas
-                """)
+                source = "🆕 Freshly generated"
+            st.caption(
+                f"{source} · "
+                f"Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                f"({cache_stats['hit_rate']:.0%} hit rate) · {cache_stats['entries']} reports stored"
+            )
+        else:
+            st.warning("⚠️ Cohere API key not found in secrets. Please configure your API key to generate AI recommendations.")
+            show_basic_analysis(org, avg_scores, overall_score, pillar_scores)
 
         # Additional Analytics
         st.markdown("### 📊 Additional Insights")
-        col1, col2 = st.columns([1, 1], gap="medium")
-
-        with col1:
-            response_counts = {level: 0 for level in SLIDER_LEVELS}
-            for resp in responses.values():
-                response_counts[resp] += 1
-
-            fig_dist = px.bar(
-                x=list(response_counts.keys()),
-                y=list(response_counts.values()),
-                title="Response Distribution",
-                color=list(response_counts.values()),
-                color_continuous_scale="RdYlGn"
-            )
-            fig_dist.update_layout(height=400, margin=dict(l=50, r=50, t=50, b=50))
-            st.plotly_chart(fig_dist, use_container_width=True)
+        if org_view:
+            level_counts = [sum(counts) for counts in zip(*org_results.level_counts.values())] or [0] * len(SLIDER_LEVELS)
+        else:
+            level_counts = responses.level_counts()
+        response_counts = tuple(zip(SLIDER_LEVELS, level_counts))
+        pillar_items = tuple(pillar_scores.items())
 
-        with col2:
-            pillar_scores = {}
-            for pillar, scores_list in detailed_scores.items():
-                pillar_scores[pillar] = round(np.mean(scores_list), 2)
-
-            fig_pillar = px.bar(
-                x=list(pillar_scores.values()),
-                y=list(pillar_scores.keys()),
-                orientation='h',
-                title="Pillar-wise Scores",
-                color=list(pillar_scores.values()),
-                color_continuous_scale="RdYlGn"
-            )
-            fig_pillar.update_layout(height=400, margin=dict(l=50, r=50, t=50, b=50))
-            st.plotly_chart(fig_pillar, use_container_width=True)
+        if get_setting("combine_insight_charts", False):
+            show_chart("insights", build_insights_figure, response_counts, pillar_items)
+        else:
+            col1, col2 = st.columns([1, 1], gap="medium")
+            with col1:
+                show_chart("distribution", build_distribution_figure, response_counts)
+            with col2:
+                show_chart("pillars", build_pillar_figure, pillar_items)
 
         # Assessment Summary
         assessment_time = datetime.now() - st.session_state.assessment_start_time if st.session_state.assessment_start_time else timedelta(minutes=10)
@@ -1033,6 +1346,8 @@ TONE: Professional yet accessible, data-driven but human-centered, optimistic bu
         st.error(f"❌ Error generating recommendations: {str(e)}")
         st.info("Please try refreshing the page or contact support if the issue persists.")
 
+    show_team_survey(org)
+
     # Brand Footer
     st.markdown("""
     <div class="brand-footer">
@@ -1041,3 +1356,83 @@ TONE: Professional yet accessible, data-driven but human-centered, optimistic bu
     </div>
     """, unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
+
+def render_admin():
+    """Operator view of latency metrics and shared-resource health; reached with ?view=admin&admin=<token>"""
+    st.markdown("## 🛠️ Performance")
+    metrics = get_metrics()
+    if metrics is None:
+        st.info("Metrics are off. Set metrics_enabled = true in the app secrets to collect them.")
+    else:
+        uptime = timedelta(seconds=int(time.time() - metrics.started_at))
+        st.caption(f"This server process, up for {uptime}. Times in seconds.")
+        rows = metrics.summary()
+        if rows:
+            fmt = lambda value: "–" if value is None else f"{value:.3f}"
+            table = ["| Metric | Labels | Count | Mean | p50 | p95 | p99 |", "|---|---|---:|---:|---:|---:|---:|"]
+            table.extend(
+                f"| {row['metric']} | {row['labels']} | {row['count']} | {fmt(row['mean'])} "
+                f"| {fmt(row['p50'])} | {fmt(row['p95'])} | {fmt(row['p99'])} |"
+                for row in rows
+            )
+            st.markdown("\n".join(table))
+        else:
+            st.info("No observations yet.")
+        for error in metrics.exporter_errors:
+            st.warning(f"Metrics exporter: {error}")
+
+    breaker = get_circuit_breaker().stats()
+    jobs = get_report_queue().stats()
+    cache = get_report_cache().stats()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("AI circuit", breaker["state"], f"{breaker['failure_rate']:.0%} bad of {breaker['calls']}", delta_color="off")
+    col2.metric("Report jobs running", jobs["running"], f"{jobs['queued']} queued", delta_color="off")
+    col3.metric("Report cache hit rate", f"{cache['hit_rate']:.0%}", f"{cache['entries']} reports", delta_color="off")
+
+    if metrics is not None:
+        with st.expander("Prometheus exposition"):
+            st.code(metrics.render(), language="text")
+
+    st.markdown("### Profiles")
+    st.caption(
+        "Add &profile=sample (or &profile=cprofile) to any page URL together with the admin token to profile "
+        "its reruns, or set THRIVYA_PROFILE on the server to profile every session. "
+        ".folded files open in speedscope or flamegraph.pl; .prof files in snakeviz."
+    )
+    profiles = get_profiler().recent()
+    if profiles:
+        st.markdown("\n".join(f"- `{path.name}` ({size / 1024:.1f} KB)" for path, size in profiles))
+    else:
+        st.info(f"No profiles in {get_profiler().directory} yet.")
+
+PAGES = {
+    "intro": render_intro,
+    "details": render_details,
+    "culture": render_culture,
+    "wellness": render_wellness,
+    "growth": render_growth,
+    "results": render_results
+}
+
+def render_page():
+    """Render the current page, timed when metrics are on"""
+    metrics = get_metrics()
+    if metrics is None:
+        PAGES[st.session_state.page]()
+        return
+    # The timer's __exit__ also runs when a page ends with st.rerun()
+    with metrics.timer("thrivya_page_render_seconds", page=st.session_state.page):
+        PAGES[st.session_state.page]()
+
+if st.query_params.get("view") == "admin" and is_admin():
+    render_admin()
+elif os.environ.get("THRIVYA_PROFILE") or "profile" in st.query_params:
+    mode = profile_mode()
+    if mode is None:
+        render_page()
+    else:
+        session = st.session_state.setdefault("profile_session", uuid.uuid4().hex[:8])
+        with get_profiler().profile(st.session_state.page, session, mode):
+            render_page()
+else:
+    render_page()